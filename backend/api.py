@@ -1,6 +1,7 @@
+from http import HTTPStatus
 import flask
 
-from backend.common import backend_exceptions, connect, database
+from backend.common import backend_exceptions, connect, database, jobs, progress
 from backend.endpoints import (
     assembly_mirror,
     copy_design,
@@ -23,10 +24,16 @@ def api_exception(e: ApiError):
     return e.to_dict(), e.status_code
 
 
+@router.errorhandler(backend_exceptions.BackendException)
+def backend_exception(e: backend_exceptions.BackendException):
+    return e.to_dict(), e.status_code
+
+
 @router.errorhandler(backend_exceptions.ClientException)
 def client_exception(e: backend_exceptions.ClientException):
     return e.to_dict(), e.status_code
 
+
 @router.errorhandler(backend_exceptions.ReportedException)
 def reported_exception(e: backend_exceptions.ReportedException):
     return e.to_dict(), e.status_code
@@ -40,6 +47,60 @@ router.register_blueprint(copy_design.router)
 router.register_blueprint(update_featurescripts.router)
 
 
+@router.get("/jobs/<job_id>")
+def get_job(job_id: str):
+    """Returns the status of a job submitted by the current session.
+
+    Endpoints which support jobs submit one when passed the query parameter job=true.
+
+    Returns:
+        jobId: The id of the job.
+        name: The name of the operation the job is running.
+        status: One of pending, running, succeeded, or failed.
+        events: The progress events reported by the job so far.
+        result: The response of the operation, once it has succeeded.
+        error: The error thrown by the operation, once it has failed.
+    """
+    return get_session_job(job_id).to_dict()
+
+
+@router.get("/jobs/<job_id>/events")
+def get_job_events(job_id: str):
+    """Streams the progress events of a job submitted by the current session as Server-Sent Events.
+
+    Events which were reported before the request are sent first. Once the job finishes, a result event with the
+    response of the operation or an error event is sent and the stream ends.
+    Clients which reconnect with the Last-Event-ID header resume after that event.
+    """
+    get_session_job(job_id)
+    start = get_start_event(flask.request.headers.get("Last-Event-ID"))
+    return progress.stream_events(jobs.job_queue.follow(job_id, start), start)
+
+
+def get_start_event(last_event_id: str | None) -> int:
+    """Returns the index of the first event to stream to a client which last received last_event_id.
+
+    The header is sent by the client, so a malformed id streams every event.
+    """
+    if last_event_id is None:
+        return 0
+    try:
+        return max(int(last_event_id) + 1, 0)
+    except ValueError:
+        return 0
+
+
+def get_session_job(job_id: str) -> jobs.Job:
+    """Returns a job submitted by the current session."""
+    job = jobs.job_queue.get(job_id)
+    # Don't reveal jobs submitted by other sessions
+    if job is None or job.owner != connect.get_session_id():
+        raise backend_exceptions.BackendException(
+            "Job {} does not exist.".format(job_id), HTTPStatus.NOT_FOUND
+        )
+    return job
+
+
 @router.get("/default-name/<element_type>" + connect.instance_route("wv"))
 def default_name(element_type: str, **kwargs):
     """Returns the next default name for a given element type in a document.
@@ -1,16 +1,37 @@
 from __future__ import annotations
+import functools
 from typing import Any, Iterable
 import onshape_api
 from onshape_api.endpoints.assemblies import get_assembly, get_assembly_features
 
+PART_KEYS = ("partId", "configuration", "documentId", "elementId", "documentVersion")
+"""The keys which identify the part an instance refers to."""
+
+
+def get_part_key(instance_or_part: dict) -> tuple:
+    """Returns a hashable key which is equal for a part and every instance of it."""
+    return tuple(instance_or_part.get(key, None) for key in PART_KEYS)
+
 
 class Assembly:
-    """Contains information from Onshape about an assembly."""
+    """Contains information from Onshape about an assembly.
+
+    Parts are indexed on construction, so looking up the part of an instance doesn't need to scan the assembly.
+    """
 
     def __init__(self, assembly_data: dict, path: onshape_api.ElementPath) -> None:
         self.assembly_data = assembly_data
         self.path = path
 
+        # Resolved paths are memoized by the keys they are constructed from
+        self._element_paths: dict[tuple, onshape_api.ElementPath] = {}
+        self._part_paths: dict[tuple, onshape_api.PartPath] = {}
+
+        self._parts_by_key: dict[tuple, dict] = {}
+        for part in self.get_parts():
+            # Keep the first match, as the previous linear search did
+            self._parts_by_key.setdefault(get_part_key(part), part)
+
     def get_parts(self) -> list:
         return self.assembly_data.get("parts", [])
 
@@ -19,19 +40,7 @@ class Assembly:
 
         The instance must be for a part.
         """
-        return next(
-            part
-            for part in self.get_parts()
-            if are_keys_equal(
-                instance,
-                part,
-                "partId",
-                "configuration",
-                "documentId",
-                "elementId",
-                "documentVersion",
-            )
-        )
+        return self._parts_by_key[get_part_key(instance)]
 
     def get_instances(self) -> list[dict]:
         return self.assembly_data["rootAssembly"].get("instances", [])
@@ -45,9 +54,7 @@ class Assembly:
 
         result = {}
         for part in self.get_parts():
-            part_path = onshape_api.PartPath.from_path(
-                self.resolve_path(part), part["partId"]
-            )
+            part_path = self.resolve_part_path(part)
             for mate_connector in part.get("mateConnectors", []):
                 mate_id = mate_connector["featureId"]
                 values = result.get(part_path, [])
@@ -61,9 +68,19 @@ class Assembly:
         Args:
             instance_or_part: An instance or part in an assembly.
         """
-        return onshape_api.PartPath.from_path(
-            self.resolve_path(instance_or_part), instance_or_part["partId"]
+        key = (
+            instance_or_part["documentId"],
+            instance_or_part.get("documentVersion", None),
+            instance_or_part["elementId"],
+            instance_or_part["partId"],
         )
+        part_path = self._part_paths.get(key)
+        if part_path is None:
+            part_path = onshape_api.PartPath.from_path(
+                self.resolve_path(instance_or_part), instance_or_part["partId"]
+            )
+            self._part_paths[key] = part_path
+        return part_path
 
     def resolve_path(self, instance_or_part: dict) -> onshape_api.ElementPath:
         """Constructs an element path from a given instance or a part.
@@ -71,6 +88,18 @@ class Assembly:
         Args:
             instance_or_part: An instance or part in an assembly.
         """
+        key = (
+            instance_or_part["documentId"],
+            instance_or_part.get("documentVersion", None),
+            instance_or_part["elementId"],
+        )
+        element_path = self._element_paths.get(key)
+        if element_path is None:
+            element_path = self._make_path(instance_or_part)
+            self._element_paths[key] = element_path
+        return element_path
+
+    def _make_path(self, instance_or_part: dict) -> onshape_api.ElementPath:
         if "documentVersion" in instance_or_part:
             return onshape_api.ElementPath(
                 instance_or_part["documentId"],
@@ -109,17 +138,25 @@ class AssemblyFeatures:
             if is_fastened_mate(feature):
                 yield feature
 
+    @functools.cached_property
+    def used_mate_connectors(self) -> set[tuple[str, str]]:
+        """A set of (instance id, feature id) pairs of every mate connector used in a fastened mate feature.
+
+        Built in a single pass over the fastened mates the first time it is accessed.
+        """
+        used = set()
+        for feature in self.get_fastened_mates():
+            parameter = get_parameter(feature, "mateConnectorsQuery")
+            for query in parameter.get("queries", []):
+                # Only mate connector queries have both a path and a featureId
+                path = query.get("path")
+                if path and "featureId" in query:
+                    used.add((path[0], query["featureId"]))
+        return used
+
     def is_mate_connector_used(self, instance: dict, mate_id: str) -> bool:
         """Returns true if the mate connector is already used in a fastened mate feature."""
-        # We could remove O(N^2) algo by returning a dict mapping instance ids to used mate connectors
-        for feature in self.get_fastened_mates():
-            queries = get_parameter(feature, "mateConnectorsQuery")
-            if any(
-                query["featureId"] == mate_id and query["path"][0] == instance["id"]
-                for query in queries
-            ):
-                return True
-        return False
+        return (instance["id"], mate_id) in self.used_mate_connectors
 
 
 def is_fastened_mate(feature: dict) -> bool:
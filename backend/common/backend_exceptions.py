@@ -1,9 +1,11 @@
 from abc import ABC
 from http import HTTPStatus
+from typing import Iterable
 
+from backend.common.permission_cache import get_permission_cache
 from onshape_api.api.api_base import Api
 from onshape_api.endpoints.documents import get_document
-from onshape_api.endpoints.permissions import Permission, get_permissions
+from onshape_api.endpoints.permissions import Permission
 from onshape_api.paths.paths import DocumentPath
 
 
@@ -75,7 +77,31 @@ class MissingPermissionException(ReportedException):
 
 def require_permissions(api: Api, path: DocumentPath, *needed_permissions: Permission):
     """Throws an exception if the current user doesn't have given permissions for the given document."""
-    permissions = get_permissions(api, path)
+    permissions = get_permission_cache().get_permissions(api, path)
+    _check_permissions(api, path, permissions, needed_permissions)
+
+
+def require_all_permissions(
+    api: Api, paths: Iterable[DocumentPath], *needed_permissions: Permission
+):
+    """Throws an exception if the current user doesn't have given permissions for every given document.
+
+    The permissions of each document are fetched concurrently.
+    """
+    paths = list(paths)
+    all_permissions = get_permission_cache().get_all_permissions(api, paths)
+    for path in paths:
+        _check_permissions(
+            api, path, all_permissions[path.document_id], needed_permissions
+        )
+
+
+def _check_permissions(
+    api: Api,
+    path: DocumentPath,
+    permissions: list[Permission],
+    needed_permissions: Iterable[Permission],
+):
     if permissions == []:
         raise MissingPermissionException(Permission.READ, path.document_id)
 
@@ -1,7 +1,11 @@
 """Serves as an abstraction layer for connecting with the Onshape API and the current flask request."""
 
+import collections
 import enum
-from typing import Any
+import threading
+import time
+from http import HTTPStatus
+from typing import Any, Callable
 
 from uuid import uuid4
 import flask
@@ -9,7 +13,7 @@ from requests_oauthlib import OAuth2Session
 
 from backend.common.database import Database
 import onshape_api
-from backend.common import backend_exceptions, env
+from backend.common import backend_exceptions, env, jobs, progress
 from onshape_api.paths.instance_type import InstanceType
 
 
@@ -25,23 +29,77 @@ def get_token(db: Database) -> dict | None:
     return get_session_data(db).get("token")
 
 
-def save_token(db: Database, token) -> None:
-    set_session_data(db, {"token": token})
+def save_token(db: Database, token, session_id: str | None = None) -> None:
+    set_session_data(db, {"token": token}, session_id)
+
+
+SESSION_CACHE_SIZE = 1024
+"""The max number of sessions whose data is cached."""
+
+SESSION_EXPIRY_MARGIN = 30
+"""The number of seconds before a session's token expires that its cached data is discarded."""
+
+# Maps session ids to their session data and the time the data expires
+_session_cache: collections.OrderedDict[str, tuple[dict, float | None]] = (
+    collections.OrderedDict()
+)
+_session_cache_lock = threading.Lock()
+
+
+def _get_cached_session_data(session_id: str) -> dict | None:
+    with _session_cache_lock:
+        entry = _session_cache.get(session_id)
+        if entry is None:
+            return None
+        session_data, expires_at = entry
+        # Once the token expires it may have been refreshed by another process, so read it again
+        if expires_at is not None and expires_at - SESSION_EXPIRY_MARGIN < time.time():
+            del _session_cache[session_id]
+            return None
+        _session_cache.move_to_end(session_id)
+        return session_data
+
+
+def _cache_session_data(session_id: str, session_data: dict) -> None:
+    token = session_data.get("token")
+    with _session_cache_lock:
+        if token is None:
+            # The user may be signing in, so don't cache missing tokens
+            _session_cache.pop(session_id, None)
+            return
+        _session_cache[session_id] = (session_data, token.get("expires_at"))
+        _session_cache.move_to_end(session_id)
+        while len(_session_cache) > SESSION_CACHE_SIZE:
+            _session_cache.popitem(last=False)
 
 
 def get_session_data(db: Database) -> dict:
     session_id = get_session_id()
+    session_data = _get_cached_session_data(session_id)
+    if session_data is not None:
+        return session_data
+
     doc_ref = db.sessions.document(document_id=session_id)
     doc = doc_ref.get()
     if not doc.exists or (session_data := doc.to_dict()) is None:
         session_data = {"token": None}
+    _cache_session_data(session_id, session_data)
     return session_data
 
 
-def set_session_data(db: Database, session_data: dict) -> None:
-    session_id = get_session_id()
+def set_session_data(
+    db: Database, session_data: dict, session_id: str | None = None
+) -> None:
+    """Writes session_data to the database and the session cache.
+
+    Args:
+        session_id: The session to write to. Defaults to the session of the current request.
+    """
+    if session_id is None:
+        session_id = get_session_id()
     doc_ref = db.sessions.document(document_id=session_id)
     doc_ref.set(session_data)
+    _cache_session_data(session_id, session_data)
 
 
 base_url = "https://oauth.onshape.com/oauth"
@@ -68,8 +126,11 @@ def get_oauth_session(
         "client_secret": env.client_secret,
     }
 
+    # Tokens may be refreshed after the request ends, e.g. by a job, so the session can't be looked up then
+    session_id = get_session_id()
+
     def _save_token(token) -> None:
-        save_token(db, token)
+        save_token(db, token, session_id)
 
     return OAuth2Session(
         env.client_id,
@@ -88,8 +149,44 @@ def element_route(wvm_param: str = "w"):
     return instance_route(wvm_param) + "/e/<element_id>"
 
 
+shared_api_args = onshape_api.get_shared_api_args()
+"""The connection pool and send policy shared by the Api of every request.
+
+Each request is made on behalf of its own user, so it needs its own Api. Sharing these lets requests reuse
+keep-alive connections, and makes every request back off when Onshape throttles one of them.
+"""
+
+
 def get_api(db: Database) -> onshape_api.OAuthApi:
-    return onshape_api.make_oauth_api(get_oauth_session(db))
+    return onshape_api.make_oauth_api(get_oauth_session(db), **shared_api_args)
+
+
+def get_async_api(db: Database) -> onshape_api.AsyncOAuthApi:
+    """Returns an AsyncApi for use in async routes.
+
+    The api should be closed (e.g. using async with) before the route returns.
+    """
+    return onshape_api.make_async_oauth_api(get_oauth_session(db), **shared_api_args)
+
+
+def run_operation(name: str, run: Callable[[progress.Reporter], dict]) -> Any:
+    """Runs a long running operation in the way the current request asks for.
+
+    If the job query parameter is true, run is submitted as a job and the job is returned with a 202 status.
+    Otherwise, if the request accepts text/event-stream, the progress of run is streamed.
+    Otherwise, run is executed and its result is returned.
+
+    run may be executed outside of the request context, so anything it needs from the request should be read beforehand.
+
+    Args:
+        name: The name of the operation, e.g. push-version.
+    """
+    if (get_optional_query_arg("job") or "").lower() == "true":
+        job = jobs.job_queue.submit(name, run, owner=get_session_id())
+        return job.to_dict(), HTTPStatus.ACCEPTED
+    if progress.is_stream_requested():
+        return progress.stream_progress(run)
+    return run(progress.ignore_progress)
 
 
 def get_route_instance_path(wvm_param: str = "w") -> onshape_api.InstancePath:
@@ -1,9 +1,29 @@
+import threading
 from google.cloud import firestore
 
+_client: firestore.Client | None = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> firestore.Client:
+    """Returns the Firestore client shared by the process, creating it if necessary.
+
+    Clients are expensive to construct and safe to share between threads, so one is reused for every request.
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = firestore.Client()
+        return _client
+
 
 class Database:
-    def __init__(self):
-        self.db = firestore.Client()
+    def __init__(self, client: firestore.Client | None = None):
+        """
+        Args:
+            client: The client to use. Defaults to the client shared by the process.
+        """
+        self.db = client or get_client()
 
     @property
     def sessions(self) -> firestore.CollectionReference:
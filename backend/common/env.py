@@ -8,3 +8,29 @@ client_secret = os.environ["OAUTH_CLIENT_SECRET"]
 session_secret = os.environ["SESSION_SECRET"]
 
 is_production = os.getenv("NODE_ENV", "production") == "production"
+
+# The number of seconds a session's document permissions are cached for. If 0, permissions are only cached for a single request.
+permission_cache_ttl = float(os.getenv("PERMISSION_CACHE_TTL", "0"))
+
+# The max number of linked documents which are looked up concurrently.
+linked_documents_concurrency = int(os.getenv("LINKED_DOCUMENTS_CONCURRENCY", "8"))
+
+# The max number of FeatureScript evaluation results cached in memory.
+evaluation_cache_size = int(os.getenv("EVALUATION_CACHE_SIZE", "512"))
+# If set, evaluation results are also cached on disk in this directory.
+evaluation_cache_dir = os.getenv("EVALUATION_CACHE_DIR")
+# Whether evaluation results are also cached in Firestore, so every instance of the backend shares them.
+evaluation_cache_firestore = (
+    os.getenv("EVALUATION_CACHE_FIRESTORE", "false").lower() == "true"
+)
+
+# The max number of tabs whose references are updated concurrently.
+update_references_concurrency = int(os.getenv("UPDATE_REFERENCES_CONCURRENCY", "4"))
+
+# The max number of jobs which are run at once.
+job_workers = int(os.getenv("JOB_WORKERS", "4"))
+# Whether jobs are kept in Firestore, so any instance of the backend can report on them. Otherwise, jobs are kept in memory.
+jobs_firestore = os.getenv("JOBS_FIRESTORE", str(is_production)).lower() == "true"
+
+# The max number of Feature Studios which are pushed concurrently. If 1, studios are always pushed one at a time.
+feature_studio_push_concurrency = int(os.getenv("FEATURE_STUDIO_PUSH_CONCURRENCY", "8"))
@@ -1,18 +1,43 @@
-""""Utilities for evaluating FeatureScripts against part studios."""
+"""Utilities for evaluating FeatureScripts against part studios."""
 
 from concurrent import futures
 import dataclasses
-import pathlib
+import logging
 from typing import Iterable, TypedDict
 import onshape_api
-from onshape_api.endpoints.part_studios import evaluate_feature_script
+from backend.common.evaluation_cache import EvaluationCache
+from backend.common.scripts import Script, ScriptRegistry
 
-SCRIPT_PATH = pathlib.Path("../scripts")
+AUTO_ASSEMBLY_SCRIPT = "parseBase"
+AUTO_ASSEMBLY_TARGET_SCRIPT = "parseTarget"
+ASSEMBLY_MIRROR_SCRIPT = "parseAssemblyMirror"
 
+REQUIRED_SCRIPTS = [AUTO_ASSEMBLY_SCRIPT, AUTO_ASSEMBLY_TARGET_SCRIPT]
+# Not generated by pull_scripts yet, so assembly mirror fails when it's used instead of on startup
+OPTIONAL_SCRIPTS = [ASSEMBLY_MIRROR_SCRIPT]
 
-def open_script(script_name: str):
-    with (SCRIPT_PATH / pathlib.Path("{}.fs".format(script_name))).open() as file:
-        return file.read()
+script_registry = ScriptRegistry()
+
+evaluation_cache = EvaluationCache()
+"""The cache used to evaluate scripts. Replaced by set_evaluation_cache."""
+
+
+def set_evaluation_cache(cache: EvaluationCache) -> None:
+    """Sets the cache used to evaluate scripts."""
+    global evaluation_cache
+    evaluation_cache = cache
+
+
+def load_scripts() -> None:
+    """Loads every script used by the evaluate functions.
+
+    Throws if a required script is missing or invalid, so it should be called on startup.
+    """
+    script_registry.load(REQUIRED_SCRIPTS, OPTIONAL_SCRIPTS)
+
+
+def open_script(script_name: str) -> Script:
+    return script_registry.get(script_name)
 
 
 class AutoAssemblyBase(TypedDict):
@@ -27,24 +52,24 @@ class AutoAssemblyTarget(TypedDict):
 def evalute_auto_assembly_part(
     api: onshape_api.Api, part_studio_path: onshape_api.ElementPath
 ) -> dict:
-    return evaluate_feature_script(
-        api, part_studio_path, open_script("parseAutoAssembly")
+    return evaluation_cache.evaluate(
+        api, part_studio_path, open_script(AUTO_ASSEMBLY_SCRIPT)
     )
 
 
 def evalute_auto_assembly_target_part(
     api: onshape_api.Api, part_studio_path: onshape_api.ElementPath
 ) -> dict:
-    return evaluate_feature_script(
-        api, part_studio_path, open_script("parseAutoAssemblyTarget")
+    return evaluation_cache.evaluate(
+        api, part_studio_path, open_script(AUTO_ASSEMBLY_TARGET_SCRIPT)
     )
 
 
 def evaluate_assembly_mirror_part(
     api: onshape_api.Api, part_studio_path: onshape_api.ElementPath
 ) -> dict:
-    return evaluate_feature_script(
-        api, part_studio_path, open_script("parseAssemblyMirror")
+    return evaluation_cache.evaluate(
+        api, part_studio_path, open_script(ASSEMBLY_MIRROR_SCRIPT)
     )
 
 
@@ -116,28 +141,66 @@ def evalute_auto_assembly_parts(
         return part_maps
 
 
+@dataclasses.dataclass
+class TargetEvaluation:
+    """The result of evaluate_targets.
+
+    Attributes:
+        mates_to_target_mates: A dict mapping mate ids to the mate id found in their target part studio.
+        evaluations: The number of part studios which were evaluated.
+        saved_evaluations: The number of evaluations avoided by evaluating each unique target part studio once.
+    """
+
+    mates_to_target_mates: dict[str, str]
+    evaluations: int
+    saved_evaluations: int
+
+
+def group_mates_by_target(
+    mates_to_targets: dict[str, onshape_api.ElementPath],
+) -> dict[onshape_api.ElementPath, list[str]]:
+    """Inverts a dict mapping mate ids to target part studios into a dict mapping each unique part studio to its mate ids."""
+    targets_to_mates: dict[onshape_api.ElementPath, list[str]] = {}
+    for mate_id, part_studio_path in mates_to_targets.items():
+        targets_to_mates.setdefault(part_studio_path, []).append(mate_id)
+    return targets_to_mates
+
+
 def evaluate_targets(
     api: onshape_api.Api, mates_to_targets: dict[str, onshape_api.ElementPath]
-) -> dict[str, str]:
-    """Converts a dict mapping mate_ids to target part studios into a dict mapping target part studio mate ids to original mate ids.
+) -> TargetEvaluation:
+    """Evaluates the target part studio of each mate.
+
+    Mates which share a target part studio share a single evaluation.
 
     Args:
         mates_to_targets: A mapping of mate ids to the target part studio to evaluate.
     Returns:
-        A mapping of target mate ids to original mate ids.
-
-    TODO: Deduplicate target part studios and re-associate the data afterwards."""
+        A TargetEvaluation mapping each mate id to the mate id found in its target part studio.
+    """
+    targets_to_mates = group_mates_by_target(mates_to_targets)
     with futures.ThreadPoolExecutor() as executor:
         threads = {
             executor.submit(
                 evalute_auto_assembly_target_part, api, part_studio_path
-            ): target_mate_id
-            for target_mate_id, part_studio_path in mates_to_targets.items()
+            ): part_studio_path
+            for part_studio_path in targets_to_mates
         }
 
-        targets_to_mate_connectors = {}
+        mates_to_target_mates = {}
         for future in futures.as_completed(threads):
-            result = future.result()
-            target_mate_id = threads[future]
-            targets_to_mate_connectors[target_mate_id] = result["targetMateId"]
-        return targets_to_mate_connectors
+            target_mate_id = future.result()["targetMateId"]
+            for mate_id in targets_to_mates[threads[future]]:
+                mates_to_target_mates[mate_id] = target_mate_id
+
+    evaluation = TargetEvaluation(
+        mates_to_target_mates,
+        evaluations=len(targets_to_mates),
+        saved_evaluations=len(mates_to_targets) - len(targets_to_mates),
+    )
+    logging.info(
+        "Evaluated {} target part studios for {} mates, saving {} evaluations".format(
+            evaluation.evaluations, len(mates_to_targets), evaluation.saved_evaluations
+        )
+    )
+    return evaluation
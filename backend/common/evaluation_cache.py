@@ -0,0 +1,155 @@
+"""A cache for the results of evaluating FeatureScripts against part studios.
+
+The output of a script only changes when the part studio does, so results are keyed by the script,
+the part studio, and the microversion (or version) it was evaluated at.
+
+Results are shared between users, so a cached result is only returned once Onshape has confirmed the caller
+can read the part studio.
+"""
+
+import hashlib
+import json
+import logging
+
+import onshape_api
+from backend.common.database import Database
+from backend.common.permission_cache import get_permission_cache
+from backend.common.scripts import Script
+from onshape_api.api.cache import CacheEntry, CacheStore, DiskStore, MemoryStore
+from onshape_api.endpoints.documents import get_workspace_microversion_id
+from onshape_api.endpoints.part_studios import evaluate_feature_script
+from onshape_api.endpoints.permissions import Permission
+from onshape_api.paths.instance_type import InstanceType
+
+
+class FirestoreStore(CacheStore):
+    """A store which keeps entries in a Firestore collection, allowing them to be shared between instances of the backend."""
+
+    def __init__(self, db: Database, collection: str = "evaluation-cache") -> None:
+        self._collection = db.db.collection(collection)
+
+    def _document_id(self, key: str) -> str:
+        # Keys contain slashes, which Firestore treats as paths
+        return hashlib.sha256(key.encode()).hexdigest()
+
+    def get(self, key: str) -> CacheEntry | None:
+        doc = self._collection.document(self._document_id(key)).get()
+        if not doc.exists or (data := doc.to_dict()) is None:
+            return None
+        return CacheEntry(data["content"], {})
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        self._collection.document(self._document_id(key)).set(
+            {"content": entry.content}
+        )
+
+
+class EvaluationCache:
+    """Caches the results of evaluate_feature_script.
+
+    Entries are looked up in each store in order, so faster stores should come first.
+    Entries aren't scoped to a user; the caller's access to the part studio is checked before any is returned.
+    Stores which fail are skipped, so an unavailable store only costs evaluations.
+    """
+
+    def __init__(self, *stores: CacheStore) -> None:
+        """
+        Args:
+            stores: The stores to use. Defaults to a single MemoryStore.
+        """
+        self._stores = list(stores) if stores else [MemoryStore()]
+
+    def make_key(
+        self,
+        api: onshape_api.Api,
+        part_studio_path: onshape_api.ElementPath,
+        script: Script,
+    ) -> str:
+        """Returns the key of the result of evaluating script against part_studio_path.
+
+        Versions and microversions never change, but workspaces require fetching their current microversion.
+        """
+        if part_studio_path.instance_type == InstanceType.WORKSPACE:
+            microversion_id = get_workspace_microversion_id(api, part_studio_path)
+            revision = "m/" + microversion_id
+        else:
+            revision = part_studio_path.wvm + "/" + part_studio_path.instance_id
+        return "{}|{}|{}|{}".format(
+            script.hash,
+            part_studio_path.document_id,
+            part_studio_path.element_id,
+            revision,
+        )
+
+    def _can_read(
+        self, api: onshape_api.Api, part_studio_path: onshape_api.ElementPath
+    ) -> bool:
+        """Returns True if the owner of api can read part_studio_path.
+
+        Fetching the microversion of a workspace in make_key already requires access, so only versions and
+        microversions are checked.
+        """
+        if part_studio_path.instance_type == InstanceType.WORKSPACE:
+            return True
+        return get_permission_cache().has_permissions(
+            api, part_studio_path, Permission.READ
+        )
+
+    def _get(self, store: CacheStore, key: str) -> CacheEntry | None:
+        try:
+            return store.get(key)
+        except Exception as error:
+            logging.warning("Failed to read evaluation cache: {}".format(error))
+            return None
+
+    def _set(self, store: CacheStore, key: str, entry: CacheEntry) -> None:
+        try:
+            store.set(key, entry)
+        except Exception as error:
+            # E.g. results larger than Firestore's max document size
+            logging.warning("Failed to write evaluation cache: {}".format(error))
+
+    def evaluate(
+        self,
+        api: onshape_api.Api,
+        part_studio_path: onshape_api.ElementPath,
+        script: Script,
+    ) -> dict:
+        """Evaluates script against part_studio_path, or returns the cached result of a previous evaluation."""
+        key = self.make_key(api, part_studio_path, script)
+        for i, store in enumerate(self._stores):
+            entry = self._get(store, key)
+            if entry is not None:
+                if not self._can_read(api, part_studio_path):
+                    # Let Onshape report the error by evaluating without the cache
+                    return evaluate_feature_script(api, part_studio_path, script.code)
+                # Promote entries into the faster stores
+                for faster_store in self._stores[:i]:
+                    self._set(faster_store, key, entry)
+                return json.loads(entry.content)
+
+        result = evaluate_feature_script(api, part_studio_path, script.code)
+        entry = CacheEntry(json.dumps(result).encode(), {})
+        for store in self._stores:
+            self._set(store, key, entry)
+        return result
+
+
+def make_evaluation_cache(
+    db: Database,
+    max_entries: int = 512,
+    directory: str | None = None,
+    use_firestore: bool = False,
+) -> EvaluationCache:
+    """Constructs an EvaluationCache with a memory layer and any of the optional layers.
+
+    Args:
+        directory: A directory to also cache results on disk in.
+        use_firestore: Whether to also cache results in Firestore.
+    """
+    stores: list[CacheStore] = [MemoryStore(max_entries)]
+    if directory is not None:
+        stores.append(DiskStore(directory))
+    if use_firestore:
+        stores.append(FirestoreStore(db))
+    return EvaluationCache(*stores)
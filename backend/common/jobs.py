@@ -0,0 +1,389 @@
+"""A queue which runs long running operations in the background.
+
+Operations which may outlive a request are submitted as jobs and run by a pool of workers.
+The state and progress of each job is kept in a JobStore so that clients can poll for it.
+"""
+
+from __future__ import annotations
+from abc import ABC, abstractmethod
+import collections
+from concurrent import futures
+import copy
+import dataclasses
+import enum
+import logging
+import threading
+import time
+from typing import Callable, Iterator
+from uuid import uuid4
+
+from google.cloud import firestore
+
+from backend.common import progress
+from backend.common.database import Database
+
+POLL_INTERVAL = 0.5
+"""The number of seconds between checks for new events when following a job."""
+
+STALE_JOB_TIMEOUT = 600
+"""The number of seconds a job run by another instance may go without an update before it is reported as failed.
+
+Jobs are only run by the instance they were submitted to, so a job which stops being updated was likely lost
+when its instance was shut down.
+"""
+
+
+class JobStatus(enum.StrEnum):
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+@dataclasses.dataclass
+class Job:
+    """The state of a long running operation.
+
+    Attributes:
+        id: A unique id for the job.
+        name: The name of the operation being run, e.g. push-version.
+        owner: The id of the session which submitted the job.
+        status: The status of the job.
+        events: The progress events reported by the job, in the order they were reported.
+            Stores may only return the events after a given index, see JobStore.get.
+        event_count: The total number of events reported by the job.
+        result: The result of the job, once it has succeeded.
+        error: The error thrown by the job, once it has failed.
+        updated_at: The time the job was last updated, in seconds since the epoch.
+    """
+
+    id: str
+    name: str
+    owner: str | None = None
+    status: JobStatus = JobStatus.PENDING
+    events: list[dict] = dataclasses.field(default_factory=list)
+    event_count: int = 0
+    result: dict | None = None
+    error: dict | None = None
+    updated_at: float = dataclasses.field(default_factory=time.time)
+
+    @property
+    def done(self) -> bool:
+        return self.status in (JobStatus.SUCCEEDED, JobStatus.FAILED)
+
+    def to_dict(self) -> dict:
+        """Returns the job as it is sent to the client."""
+        return {
+            "jobId": self.id,
+            "name": self.name,
+            "status": str(self.status),
+            "events": self.events,
+            "result": self.result,
+            "error": self.error,
+        }
+
+    def to_record(self) -> dict:
+        """Returns the job as it is saved in a store."""
+        record = dataclasses.asdict(self)
+        record["status"] = str(self.status)
+        return record
+
+    @staticmethod
+    def from_record(record: dict) -> Job:
+        return Job(**{**record, "status": JobStatus(record["status"])})
+
+
+class JobStore(ABC):
+    """A place to keep the state of jobs.
+
+    Jobs report many events, so events are added individually rather than by rewriting the whole job.
+    """
+
+    @abstractmethod
+    def get(self, job_id: str, start: int = 0) -> Job | None:
+        """Returns a job, with only its events from index start onward."""
+        ...
+
+    @abstractmethod
+    def set(self, job: Job) -> None:
+        """Saves a new job."""
+        ...
+
+    @abstractmethod
+    def add_event(
+        self, job_id: str, index: int, event: dict, updated_at: float
+    ) -> None:
+        """Adds the event at index to a job.
+
+        Events are only added by the instance running the job, one at a time and in order.
+        """
+        ...
+
+    @abstractmethod
+    def update(self, job_id: str, changes: dict) -> None:
+        """Sets fields of a job other than its events."""
+        ...
+
+
+class MemoryJobStore(JobStore):
+    """A store which keeps jobs in memory, discarding the least recently updated jobs once it is full.
+
+    Jobs are only visible to the process which ran them.
+    """
+
+    def __init__(self, max_jobs: int = 1024) -> None:
+        self._max_jobs = max_jobs
+        self._jobs: collections.OrderedDict[str, dict] = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, job_id: str, start: int = 0) -> Job | None:
+        with self._lock:
+            record = self._jobs.get(job_id)
+            if record is None:
+                return None
+            # Copy so callers can't modify the stored job
+            record = copy.deepcopy({**record, "events": record["events"][start:]})
+        return Job.from_record(record)
+
+    def set(self, job: Job) -> None:
+        with self._lock:
+            self._jobs[job.id] = job.to_record()
+            self._touch(job.id)
+
+    def add_event(
+        self, job_id: str, index: int, event: dict, updated_at: float
+    ) -> None:
+        with self._lock:
+            record = self._jobs.get(job_id)
+            if record is None:
+                return
+            record["events"].append(copy.deepcopy(event))
+            record["event_count"] = index + 1
+            record["updated_at"] = updated_at
+            self._touch(job_id)
+
+    def update(self, job_id: str, changes: dict) -> None:
+        with self._lock:
+            record = self._jobs.get(job_id)
+            if record is None:
+                return
+            record.update(copy.deepcopy(changes))
+            self._touch(job_id)
+
+    def _touch(self, job_id: str) -> None:
+        self._jobs.move_to_end(job_id)
+        while len(self._jobs) > self._max_jobs:
+            self._jobs.popitem(last=False)
+
+
+class FirestoreJobStore(JobStore):
+    """A store which keeps jobs in a Firestore collection, allowing any instance of the backend to report on them.
+
+    Each event is kept in its own document in an events subcollection of the job, so adding an event doesn't
+    rewrite the job, and a job's events aren't limited by Firestore's max document size.
+    """
+
+    def __init__(self, db: Database, collection: str = "jobs") -> None:
+        self._db = db.db
+        self._collection = db.db.collection(collection)
+
+    def _events(self, job_id: str) -> firestore.CollectionReference:
+        return self._collection.document(job_id).collection("events")
+
+    def get(self, job_id: str, start: int = 0) -> Job | None:
+        doc = self._collection.document(job_id).get()
+        if not doc.exists or (record := doc.to_dict()) is None:
+            return None
+        query = self._events(job_id).where(
+            filter=firestore.FieldFilter("index", ">=", start)
+        )
+        record["events"] = [
+            event.to_dict()["event"] for event in query.order_by("index").stream()
+        ]
+        return Job.from_record(record)
+
+    def set(self, job: Job) -> None:
+        record = job.to_record()
+        events = record.pop("events")
+        batch = self._db.batch()
+        batch.set(self._collection.document(job.id), record)
+        for index, event in enumerate(events):
+            batch.set(self._events(job.id).document(), {"index": index, "event": event})
+        batch.commit()
+
+    def add_event(
+        self, job_id: str, index: int, event: dict, updated_at: float
+    ) -> None:
+        job_ref = self._collection.document(job_id)
+        batch = self._db.batch()
+        batch.set(self._events(job_id).document(), {"index": index, "event": event})
+        batch.update(job_ref, {"event_count": index + 1, "updated_at": updated_at})
+        batch.commit()
+
+    def update(self, job_id: str, changes: dict) -> None:
+        self._collection.document(job_id).update(changes)
+
+
+class JobQueue:
+    """Runs jobs using a pool of worker threads."""
+
+    def __init__(
+        self,
+        store: JobStore | None = None,
+        max_workers: int = 4,
+        stale_timeout: float = STALE_JOB_TIMEOUT,
+    ) -> None:
+        """
+        Args:
+            store: The store to keep jobs in. Defaults to a MemoryJobStore.
+            max_workers: The max number of jobs which are run at once.
+            stale_timeout: The number of seconds a job run by another instance may go without an update
+                before it is reported as failed.
+        """
+        self.store = store or MemoryJobStore()
+        self._executor = futures.ThreadPoolExecutor(
+            max_workers, thread_name_prefix="job"
+        )
+        self._stale_timeout = stale_timeout
+        self._lock = threading.Lock()
+        # The ids of the jobs this queue is running
+        self._running: set[str] = set()
+
+    def submit(
+        self,
+        name: str,
+        run: Callable[[progress.Reporter], dict | None],
+        owner: str | None = None,
+    ) -> Job:
+        """Submits run to be run by a worker.
+
+        Args:
+            name: The name of the operation, e.g. push-version.
+            run: The operation to run. It is passed a Reporter which adds events to the job.
+            owner: The id of the session submitting the job.
+
+        Returns:
+            The submitted job.
+        """
+        job = Job(uuid4().hex, name, owner)
+        self.store.set(job)
+        self._executor.submit(self._run, job, run)
+        return job
+
+    def get(self, job_id: str, start: int = 0) -> Job | None:
+        """Returns a job, with only its events from index start onward.
+
+        Running jobs which another instance has stopped updating are reported as failed.
+        """
+        job = self.store.get(job_id, start)
+        if job is None or not self._is_stale(job):
+            return job
+        job.status = JobStatus.FAILED
+        job.error = progress.error_to_dict(
+            Exception("Job {} stopped responding.".format(job.id))
+        )
+        return job
+
+    def _is_stale(self, job: Job) -> bool:
+        if job.status != JobStatus.RUNNING:
+            return False
+        with self._lock:
+            if job.id in self._running:
+                return False
+        return time.time() - job.updated_at > self._stale_timeout
+
+    def follow(
+        self, job_id: str, start: int = 0, poll_interval: float = POLL_INTERVAL
+    ) -> Iterator[progress.ProgressEvent]:
+        """Yields the events of a job as they are reported.
+
+        The store is polled since the job may be run by another instance of the backend.
+        Once the job finishes, a final result or error event is yielded, matching progress.run_with_events.
+
+        Args:
+            start: The index of the first event to yield. Used to resume following a job.
+        """
+        while (job := self.get(job_id, start)) is not None:
+            for event in job.events:
+                yield progress.ProgressEvent.from_dict(event)
+            start = max(start, job.event_count)
+            if job.done:
+                # The final event comes after every reported event
+                if start == job.event_count:
+                    if job.status == JobStatus.SUCCEEDED:
+                        yield progress.ProgressEvent("result", job.result or {})
+                    else:
+                        yield progress.ProgressEvent("error", {"error": job.error})
+                return
+            time.sleep(poll_interval)
+
+    def _update(
+        self, job: Job, event: progress.ProgressEvent | None = None, **changes
+    ) -> None:
+        # Operations may report events from several threads at once
+        with self._lock:
+            job.updated_at = time.time()
+            if event is not None:
+                self.store.add_event(
+                    job.id, job.event_count, event.to_dict(), job.updated_at
+                )
+                job.event_count += 1
+            if changes:
+                for key, value in changes.items():
+                    setattr(job, key, value)
+                changes["updated_at"] = job.updated_at
+                if "status" in changes:
+                    changes["status"] = str(changes["status"])
+                self.store.update(job.id, changes)
+
+    def _run(self, job: Job, run: Callable[[progress.Reporter], dict | None]) -> None:
+        with self._lock:
+            self._running.add(job.id)
+        try:
+            self._run_job(job, run)
+        finally:
+            with self._lock:
+                self._running.discard(job.id)
+
+    def _run_job(
+        self, job: Job, run: Callable[[progress.Reporter], dict | None]
+    ) -> None:
+        self._update(job, status=JobStatus.RUNNING)
+
+        def report(event: progress.ProgressEvent) -> None:
+            self._update(job, event)
+
+        try:
+            result = run(report)
+        except Exception as error:
+            logging.exception("Job {} ({}) failed".format(job.id, job.name))
+            self._update(
+                job, status=JobStatus.FAILED, error=progress.error_to_dict(error)
+            )
+        else:
+            self._update(job, status=JobStatus.SUCCEEDED, result=result or {})
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait)
+
+
+job_queue = JobQueue()
+"""The queue used to run jobs. Replaced by set_job_queue."""
+
+
+def set_job_queue(queue: JobQueue) -> None:
+    """Sets the queue used to run jobs."""
+    global job_queue
+    job_queue = queue
+
+
+def make_job_queue(
+    db: Database, max_workers: int = 4, use_firestore: bool = False
+) -> JobQueue:
+    """Constructs a JobQueue.
+
+    Args:
+        use_firestore: Whether to keep jobs in Firestore rather than in memory.
+    """
+    store = FirestoreJobStore(db) if use_firestore else MemoryJobStore()
+    return JobQueue(store, max_workers)
@@ -0,0 +1,48 @@
+"""Provides the PermissionCache used to check the current user's permissions.
+
+By default, permissions are cached for the duration of a single request.
+If PERMISSION_CACHE_TTL is set, permissions are also cached across the requests of a session for that many seconds.
+"""
+
+import collections
+import threading
+import flask
+
+from backend.common import env
+from onshape_api.endpoints.permissions import PermissionCache
+
+MAX_SESSIONS = 1024
+"""The max number of sessions to cache permissions for."""
+
+_session_caches: collections.OrderedDict[str, PermissionCache] = (
+    collections.OrderedDict()
+)
+_lock = threading.Lock()
+
+
+def _get_session_cache(session_id: str) -> PermissionCache:
+    with _lock:
+        cache = _session_caches.get(session_id)
+        if cache is None:
+            cache = PermissionCache(ttl=env.permission_cache_ttl)
+            _session_caches[session_id] = cache
+        _session_caches.move_to_end(session_id)
+        while len(_session_caches) > MAX_SESSIONS:
+            _session_caches.popitem(last=False)
+        return cache
+
+
+def get_permission_cache() -> PermissionCache:
+    """Returns the PermissionCache for the current request."""
+    if not flask.has_request_context():
+        return PermissionCache()
+
+    cache = flask.g.get("permission_cache")
+    if cache is None:
+        session_id = flask.session.get("session_id")
+        if env.permission_cache_ttl > 0 and session_id is not None:
+            cache = _get_session_cache(session_id)
+        else:
+            cache = PermissionCache()
+        flask.g.permission_cache = cache
+    return cache
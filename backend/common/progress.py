@@ -0,0 +1,117 @@
+"""Utilities for reporting the progress of long running operations.
+
+Operations accept a Reporter and call it with a ProgressEvent after each step.
+Endpoints can then stream those events to the client as Server-Sent Events.
+"""
+
+import dataclasses
+import json
+import queue
+import threading
+from typing import Any, Callable, Iterable, Iterator
+
+import flask
+
+EVENT_STREAM_MIMETYPE = "text/event-stream"
+
+
+@dataclasses.dataclass(frozen=True)
+class ProgressEvent:
+    """A single step of a long running operation.
+
+    Attributes:
+        type: The type of the event, e.g. versionCreated.
+        data: Any additional information about the event. Must be serializable to JSON.
+    """
+
+    type: str
+    data: dict = dataclasses.field(default_factory=dict)
+
+    def to_dict(self) -> dict:
+        return {**self.data, "type": self.type}
+
+    @staticmethod
+    def from_dict(event: dict) -> "ProgressEvent":
+        data = dict(event)
+        return ProgressEvent(data.pop("type"), data)
+
+
+Reporter = Callable[[ProgressEvent], None]
+
+
+def ignore_progress(event: ProgressEvent) -> None:
+    """A Reporter which discards every event."""
+    pass
+
+
+def error_to_dict(error: Exception) -> dict:
+    """Converts an exception into the same dict its error handler would return."""
+    to_dict = getattr(error, "to_dict", None)
+    if callable(to_dict):
+        return to_dict()
+    return {"type": "BACKEND_EXCEPTION", "message": str(error)}
+
+
+def to_server_sent_event(event: ProgressEvent, event_id: int | None = None) -> str:
+    message = "event: {}\ndata: {}\n\n".format(event.type, json.dumps(event.data))
+    if event_id is not None:
+        message = "id: {}\n".format(event_id) + message
+    return message
+
+
+def run_with_events(
+    run: Callable[[Reporter], dict | None],
+) -> Iterator[ProgressEvent]:
+    """Runs run in a separate thread, yielding each event it reports as it is reported.
+
+    Once run finishes, its result is yielded as a final result event. If run throws, an error event is yielded instead.
+    """
+    events: queue.Queue[ProgressEvent | None] = queue.Queue()
+
+    def target():
+        try:
+            result = run(events.put)
+            events.put(ProgressEvent("result", result or {}))
+        except Exception as error:
+            events.put(ProgressEvent("error", {"error": error_to_dict(error)}))
+        finally:
+            events.put(None)
+
+    threading.Thread(target=target, daemon=True).start()
+    while (event := events.get()) is not None:
+        yield event
+
+
+def is_stream_requested() -> bool:
+    """Returns True if the current request prefers a stream of Server-Sent Events over a single JSON response."""
+    accept = flask.request.accept_mimetypes
+    return (
+        accept.best_match([EVENT_STREAM_MIMETYPE, "application/json"])
+        == EVENT_STREAM_MIMETYPE
+    )
+
+
+def stream_events(events: Iterable[ProgressEvent], start: int = 0) -> flask.Response:
+    """Returns a response which streams events as Server-Sent Events.
+
+    Args:
+        start: The id of the first event. Following events are numbered consecutively,
+            so clients can resume a stream using the Last-Event-ID header.
+    """
+    return flask.Response(
+        (
+            to_server_sent_event(event, event_id)
+            for event_id, event in enumerate(events, start)
+        ),
+        mimetype=EVENT_STREAM_MIMETYPE,
+        # Prevent proxies from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def stream_progress(run: Callable[[Reporter], Any]) -> flask.Response:
+    """Returns a response which streams the events reported by run as Server-Sent Events.
+
+    run is executed outside of the request context, so anything it needs from the request should be read beforehand.
+    """
+    return stream_events(run_with_events(run))
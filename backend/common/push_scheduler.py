@@ -0,0 +1,190 @@
+"""Pushes code to many Feature Studios concurrently.
+
+Onshape doesn't always handle overlapping pushes to the same document well, so the number of pushes in flight is found
+adaptively: it starts low, grows while pushes succeed, and is halved whenever a push fails or can't be verified.
+Once it falls to one push at a time, the rest of the pushes are made serially.
+"""
+
+import asyncio
+import dataclasses
+import logging
+from typing import Awaitable, Callable, Sequence
+
+import onshape_api
+
+INITIAL_CONCURRENCY = 2
+"""The number of pushes in flight when a scheduler starts."""
+
+
+class PushVerificationError(Exception):
+    """An exception indicating a push's response doesn't match the code that was pushed."""
+
+    def __init__(self, studio_path: onshape_api.ElementPath, reason: str):
+        super().__init__("Failed to verify push to {}: {}".format(studio_path, reason))
+        self.studio_path = studio_path
+
+
+@dataclasses.dataclass(frozen=True)
+class StudioPush:
+    """Code to push to a Feature Studio."""
+
+    studio_path: onshape_api.ElementPath
+    code: str
+
+
+@dataclasses.dataclass
+class PushReport:
+    """The result of AdaptivePushScheduler.run.
+
+    Attributes:
+        pushed: The number of studios which were pushed.
+        max_concurrency: The largest number of pushes which were in flight at once.
+        retries: The number of pushes which failed or conflicted and were made again.
+        serial: True if the scheduler fell back to pushing serially.
+        microversions: The microversion returned by each push, in the order of the pushes.
+    """
+
+    pushed: int = 0
+    max_concurrency: int = 0
+    retries: int = 0
+    serial: bool = False
+    microversions: list[str | None] = dataclasses.field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        return {
+            "pushed": self.pushed,
+            "maxConcurrency": self.max_concurrency,
+            "retries": self.retries,
+            "serial": self.serial,
+        }
+
+
+def get_microversion(response: dict) -> str | None:
+    """Returns the microversion a push created, or None if the response doesn't include it."""
+    return response.get("sourceMicroversion") or response.get("microversionId")
+
+
+def normalize_code(code: str) -> str:
+    """Returns code without the line ending and trailing whitespace differences Onshape may introduce when saving it."""
+    return code.replace("\r\n", "\n").rstrip()
+
+
+def verify_push(push: StudioPush, response: dict) -> str | None:
+    """Throws if response shows push wasn't applied. Returns the microversion it created."""
+    if response.get("microversionSkew"):
+        raise PushVerificationError(push.studio_path, "microversion skew")
+    contents = response.get("contents")
+    if contents is not None and normalize_code(contents) != normalize_code(push.code):
+        raise PushVerificationError(push.studio_path, "contents don't match")
+    return get_microversion(response)
+
+
+class AdaptivePushScheduler:
+    """Pushes code to Feature Studios, adapting the number of pushes in flight to how well Onshape handles them.
+
+    Pushes are made in windows. If every push in a window is verified, the next window is one push larger.
+    Otherwise, the failed pushes are made again in the next window, which is half as large.
+
+    Every push modifies the document, so each must return a new microversion. Pushes which return a microversion
+    that was already returned overlapped with another push and are made again.
+    """
+
+    def __init__(
+        self,
+        push: Callable[[onshape_api.ElementPath, str], Awaitable[dict]],
+        max_concurrency: int = 8,
+        initial_concurrency: int = INITIAL_CONCURRENCY,
+    ) -> None:
+        """
+        Args:
+            push: A function which pushes code to a Feature Studio and returns the response, e.g. push_code_async.
+            max_concurrency: The max number of pushes in flight at once. If 1, every push is made serially.
+        """
+        self._push = push
+        self._max_concurrency = max(1, max_concurrency)
+        self._initial_concurrency = max(1, min(initial_concurrency, max_concurrency))
+
+    async def _try_push(self, push: StudioPush) -> str | None:
+        response = await self._push(push.studio_path, push.code)
+        return verify_push(push, response)
+
+    async def run(
+        self,
+        pushes: Sequence[StudioPush],
+        on_pushed: Callable[[StudioPush], None] | None = None,
+    ) -> PushReport:
+        """Makes every push.
+
+        Args:
+            on_pushed: Called with each push once it has been verified.
+
+        Throws:
+            The error of a push which failed while pushing serially.
+        """
+        report = PushReport(serial=self._max_concurrency == 1)
+        microversions: dict[int, str | None] = {}
+        seen_microversions: set[str] = set()
+        remaining = list(range(len(pushes)))
+        concurrency = self._initial_concurrency
+
+        while remaining:
+            window, remaining = remaining[:concurrency], remaining[concurrency:]
+            report.max_concurrency = max(report.max_concurrency, len(window))
+            results = await asyncio.gather(
+                *(self._try_push(pushes[i]) for i in window), return_exceptions=True
+            )
+
+            failed: list[int] = []
+            errors: list[BaseException] = []
+            window_microversions: dict[str, list[int]] = {}
+            for i, result in zip(window, results):
+                if isinstance(result, BaseException):
+                    failed.append(i)
+                    errors.append(result)
+                elif result is not None:
+                    window_microversions.setdefault(result, []).append(i)
+                microversions[i] = None if isinstance(result, BaseException) else result
+
+            for microversion, indices in window_microversions.items():
+                if len(indices) > 1 or microversion in seen_microversions:
+                    failed.extend(indices)
+                    errors.append(
+                        PushVerificationError(
+                            pushes[indices[0]].studio_path, "conflicting microversion"
+                        )
+                    )
+                else:
+                    seen_microversions.add(microversion)
+
+            for i in window:
+                if i not in failed:
+                    report.pushed += 1
+                    if on_pushed is not None:
+                        on_pushed(pushes[i])
+
+            if not failed:
+                if not report.serial:
+                    concurrency = min(concurrency + 1, self._max_concurrency)
+                continue
+
+            if len(window) == 1:
+                # Pushing serially is the safe fallback, so there's nothing left to try
+                raise errors[0]
+            logging.warning(
+                "{} of {} concurrent pushes failed, retrying: {}".format(
+                    len(failed), len(window), errors[0]
+                )
+            )
+            report.retries += len(failed)
+            concurrency = max(1, concurrency // 2)
+            if concurrency == 1:
+                report.serial = True
+            remaining = sorted(failed) + remaining
+
+        report.microversions = [microversions[i] for i in range(len(pushes))]
+        logging.info(
+            "Pushed {} studios with up to {} concurrent pushes ({} retries)".format(
+                report.pushed, report.max_concurrency, report.retries
+            )
+        )
+        return report
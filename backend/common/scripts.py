@@ -0,0 +1,91 @@
+"""A registry of the FeatureScript scripts used to parse part studios.
+
+The scripts are generated by backend_tools/pull_scripts.py and loaded once when the app starts.
+"""
+
+from __future__ import annotations
+import dataclasses
+import hashlib
+import pathlib
+import threading
+from typing import Iterable
+
+SCRIPT_DIR = pathlib.Path(__file__).parent.parent / "scripts"
+"""The directory scripts are loaded from. Resolved relative to this file so it doesn't depend on the working directory."""
+
+
+@dataclasses.dataclass(frozen=True)
+class Script:
+    """A FeatureScript script which can be evaluated against a part studio.
+
+    Attributes:
+        name: The name of the script.
+        code: The code of the script.
+        hash: A hash of code, used to identify the results of evaluating the script.
+    """
+
+    name: str
+    code: str
+    hash: str
+
+    @staticmethod
+    def from_code(name: str, code: str) -> Script:
+        return Script(name, code, hashlib.sha256(code.encode()).hexdigest())
+
+
+def validate_script(script: Script) -> None:
+    """Throws if script isn't a FeatureScript function which can be evaluated."""
+    if not script.code.lstrip().startswith("function"):
+        raise ValueError(
+            "Script {} is invalid: scripts must be a FeatureScript function.".format(
+                script.name
+            )
+        )
+
+
+class ScriptRegistry:
+    """Loads, validates, and hashes scripts."""
+
+    def __init__(self, directory: pathlib.Path = SCRIPT_DIR) -> None:
+        self._directory = directory
+        self._scripts: dict[str, Script] = {}
+        self._lock = threading.Lock()
+
+    def _load(self, name: str) -> Script:
+        path = self._directory / "{}.fs".format(name)
+        if not path.is_file():
+            raise FileNotFoundError(
+                "Failed to find script {} at {}. Run backend_tools/pull_scripts.py to generate it.".format(
+                    name, path
+                )
+            )
+        script = Script.from_code(name, path.read_text())
+        validate_script(script)
+        with self._lock:
+            self._scripts[name] = script
+        return script
+
+    def load(self, names: Iterable[str], optional_names: Iterable[str] = ()) -> None:
+        """Loads the given scripts.
+
+        Args:
+            names: The names of scripts which must exist.
+            optional_names: The names of scripts which are loaded if they exist.
+
+        Throws:
+            FileNotFoundError: If one of names doesn't exist.
+            ValueError: If one of the scripts is invalid.
+        """
+        for name in names:
+            self._load(name)
+        for name in optional_names:
+            if (self._directory / "{}.fs".format(name)).is_file():
+                self._load(name)
+
+    def get(self, name: str) -> Script:
+        """Returns the script with the given name, loading it if it hasn't been loaded yet."""
+        with self._lock:
+            script = self._scripts.get(name)
+        if script is None:
+            script = self._load(name)
+        return script
@@ -5,7 +5,7 @@ from typing import Iterable
 import flask
 import onshape_api
 
-from backend.common import assembly_data, connect, database, evaluate
+from backend.common import assembly_data, connect, database, evaluate, progress
 from onshape_api.endpoints import assemblies
 
 router = flask.Blueprint("assembly-mirror", __name__)
@@ -13,11 +13,19 @@ router = flask.Blueprint("assembly-mirror", __name__)
 
 @router.post("/assembly-mirror" + connect.element_route())
 def assembly_mirror(**kwargs):
+    """Mirrors the parts of an assembly.
+
+    Supports running as a job and streaming progress, see connect.run_operation.
+    """
     assembly_path = connect.get_route_element_path()
     db = database.Database()
     api = connect.get_api(db)
-    AssemblyMirror(api, assembly_path).execute()
-    return {"message": "Success"}
+
+    def run(report: progress.Reporter) -> dict:
+        AssemblyMirror(api, assembly_path).execute()
+        return {"message": "Success"}
+
+    return connect.run_operation("assembly-mirror", run)
 
 
 class AssemblyMirrorCandidate:
@@ -42,13 +50,14 @@ class AssemblyMirrorCandidate:
     def _init_mate_connectors(
         self, assembly_features: assembly_data.AssemblyFeatures
     ) -> dict[str, bool]:
-        return dict(
-            (
-                mate_connector,
-                assembly_features.is_mate_connector_used(self.instance, mate_connector),
-            )
+        mate_ids = (
+            mate_connector["featureId"]
             for mate_connector in self.part.get("mateConnectors", [])
         )
+        return dict(
+            (mate_id, assembly_features.is_mate_connector_used(self.instance, mate_id))
+            for mate_id in mate_ids
+        )
 
     def all_used(self) -> bool:
         return all(self.mate_connectors.values())
@@ -1,5 +1,6 @@
 import flask
-from backend.common import connect, database
+from backend.common import connect, database, progress
+from onshape_api.api.api_base import Api
 from onshape_api.endpoints.documents import (
     copy_workspace,
     delete_document,
@@ -7,7 +8,7 @@ from onshape_api.endpoints.documents import (
     move_elements,
 )
 from onshape_api.endpoints.part_studios import create_part_studio
-from onshape_api.paths.paths import InstancePath
+from onshape_api.paths.paths import ElementPath, InstancePath
 
 router = flask.Blueprint("copy-design", __name__)
 
@@ -48,6 +49,8 @@ def copy_design(**kwargs):
         versionName: The name of the version to create in the document being copied into.
         elements: A list of tab names to copy.
         elementsToExclude: A list of tab names to exclude.
+
+    Supports running as a job and streaming progress, see connect.run_operation.
     """
     db = database.Database()
     api = connect.get_api(db)
@@ -59,9 +62,38 @@ def copy_design(**kwargs):
     excluded_names: list[str] = connect.get_optional_body_arg("elementsToExclude", [])
     version_name: str = connect.get_body_arg("versionName")
 
+    def run(report: progress.Reporter) -> dict:
+        do_copy_design(
+            api,
+            target_path,
+            design_path,
+            included_names,
+            excluded_names,
+            version_name,
+            report,
+        )
+        return {"message": "Success"}
+
+    return connect.run_operation("copy-design", run)
+
+
+def do_copy_design(
+    api: Api,
+    target_path: ElementPath,
+    design_path: InstancePath,
+    included_names: list[str] | None,
+    excluded_names: list[str],
+    version_name: str,
+    report: progress.Reporter = progress.ignore_progress,
+) -> None:
+    """Copies the tabs of design_path named in included_names and not in excluded_names into target_path.
+
+    Reports a documentCopied event once the design is copied and an elementsMoved event once its tabs are moved.
+    """
     # Copy design document to avoid impacting other users
     copy_data = copy_workspace(api, design_path, "COPY DESIGN TEMP DOCUMENT")
     copy_path = InstancePath(copy_data["newDocumentId"], copy_data["newWorkspaceId"])
+    report(progress.ProgressEvent("documentCopied"))
     elements = get_document_elements(api, copy_path)
 
     elements = list(
@@ -81,7 +113,7 @@ def copy_design(**kwargs):
 
     # Perform the move
     move_elements(api, copy_path, elements_to_move, target_path, version_name)
+    report(progress.ProgressEvent("elementsMoved", {"elements": len(elements_to_move)}))
 
     # Cleanup copy
     delete_document(api, copy_path)
-    return {"message": "Success"}
@@ -1,17 +1,15 @@
+from concurrent import futures
 import enum
-from typing import Callable, cast
+from typing import Callable, Iterable, cast
 
 import flask
 from google.cloud import firestore
 
-from backend.common import backend_exceptions, connect, database
+from backend.common import backend_exceptions, connect, database, env
+from backend.common.permission_cache import get_permission_cache
 from onshape_api.api.api_base import Api
-from onshape_api.endpoints import permissions
 from onshape_api.endpoints.metadata import get_instance_metadata
-from onshape_api.endpoints.permissions import (
-    Permission,
-    has_permissions,
-)
+from onshape_api.endpoints.permissions import Permission, PermissionCache
 from onshape_api.endpoints import documents
 from onshape_api.paths.paths import InstancePath
 
@@ -164,17 +162,42 @@ def get_document_paths(link_type: str, **kwargs):
                 "Cannot retrieve children recursively"
             )
 
-        def parent_function(node: InstancePath) -> list[InstancePath]:
-            return get_linked_document_paths(db, node)
+        def parents_function(
+            nodes: list[InstancePath],
+        ) -> dict[InstancePath, list[InstancePath]]:
+            return get_linked_document_paths_batch(db, nodes)
 
-        linked_document_paths = get_all_linked_parents(parent_function, curr_path)
+        linked_document_paths = get_all_linked_parents(parents_function, curr_path)
     else:
         linked_document_paths = get_linked_document_paths(db, curr_path, link_type)
-    return [make_document(api, path) for path in linked_document_paths]
+    return make_documents(api, linked_document_paths)
 
 
-def make_document(api: Api, path: InstancePath) -> dict:
-    if not has_permissions(api, path, Permission.READ):
+def make_documents(
+    api: Api,
+    paths: list[InstancePath],
+    max_workers: int = env.linked_documents_concurrency,
+) -> list[dict]:
+    """Calls make_document on each path concurrently.
+
+    The returned documents are in the same order as paths.
+    """
+    # Worker threads don't have access to the request, so hand them its cache
+    permission_cache = get_permission_cache()
+    # Fetch every permission set up front so documents which share permissions don't fetch them twice
+    permission_cache.get_all_permissions(api, paths)
+    with futures.ThreadPoolExecutor(max_workers) as executor:
+        return list(
+            executor.map(lambda path: make_document(api, path, permission_cache), paths)
+        )
+
+
+def make_document(
+    api: Api, path: InstancePath, permission_cache: PermissionCache | None = None
+) -> dict:
+    if permission_cache is None:
+        permission_cache = get_permission_cache()
+    if not permission_cache.has_permissions(api, path, Permission.READ):
         return {
             "documentId": path.document_id,
             "instanceId": path.instance_id,
@@ -182,7 +205,7 @@ def make_document(api: Api, path: InstancePath) -> dict:
             "isLinkable": False,
         }
     try:
-        is_linkable = permissions.has_permissions(api, path, Permission.LINK)
+        is_linkable = permission_cache.has_permissions(api, path, Permission.LINK)
         linked_document = documents.get_document(api, path)
         name = linked_document["name"]
 
@@ -228,30 +251,72 @@ def get_linked_document_paths(
     return linked_paths
 
 
+def get_linked_document_paths_batch(
+    db: database.Database,
+    document_paths: Iterable[InstancePath],
+    link_type: LinkType = LinkType.PARENTS,
+) -> dict[InstancePath, list[InstancePath]]:
+    """Returns a dict mapping each of document_paths to the documents linked from it.
+
+    Every document is fetched in a single batched read.
+    """
+    db_ids = dict((path_to_db_id(path), path) for path in document_paths)
+    linked_paths: dict[InstancePath, list[InstancePath]] = dict(
+        (path, []) for path in db_ids.values()
+    )
+    refs = [db.linked_documents.document(db_id) for db_id in db_ids]
+    for doc in db.db.get_all(refs):
+        if doc.exists and (data := doc.to_dict()):
+            linked_paths[db_ids[doc.id]] = [
+                db_id_to_path(linked_db_id) for linked_db_id in data.get(link_type, [])
+            ]
+    return linked_paths
+
+
 def get_all_linked_parents(
-    parent_function: Callable[[InstancePath], list[InstancePath]], root: InstancePath
+    parents_function: Callable[
+        [list[InstancePath]], dict[InstancePath, list[InstancePath]]
+    ],
+    root: InstancePath,
 ):
-    """Returns a topologically sorted list of parents of the given document_path."""
-    visited = set()
-    stack = set()
-    result = []
+    """Returns a topologically sorted list of parents of the given document_path.
 
-    def dfs(curr: InstancePath):
-        if curr in stack:
-            raise backend_exceptions.LinkedCycleException()
-        if curr in visited:
-            return
+    The graph is fetched breadth first, with parents_function called once per level on every node in that level.
+    It is then sorted in memory.
+    """
+    graph: dict[InstancePath, list[InstancePath]] = {}
+    frontier = [root]
+    while frontier:
+        graph.update(parents_function(frontier))
+        # dict.fromkeys dedupes while keeping the order stable
+        frontier = list(
+            dict.fromkeys(
+                node for curr in frontier for node in graph[curr] if node not in graph
+            )
+        )
 
-        stack.add(curr)
-        visited.add(curr)
+    visited = set([root])
+    stack = set([root])
+    result = []
 
-        linked_paths = parent_function(curr)
-        for node in linked_paths:
-            dfs(node)
-        stack.remove(curr)
-        result.append(curr)
+    # An iterative dfs, so deep graphs can't hit the recursion limit
+    dfs_stack = [(root, iter(graph[root]))]
+    while dfs_stack:
+        curr, linked_paths = dfs_stack[-1]
+        node = next(linked_paths, None)
+        if node is None:
+            dfs_stack.pop()
+            stack.remove(curr)
+            result.append(curr)
+            continue
+        if node in stack:
+            raise backend_exceptions.LinkedCycleException()
+        if node in visited:
+            continue
+        stack.add(node)
+        visited.add(node)
+        dfs_stack.append((node, iter(graph[node])))
 
-    dfs(root)
     # Root ends up at the back since it's a dfs
     result.pop()
     return result[::-1]
@@ -1,16 +1,21 @@
+from concurrent import futures
+import dataclasses
+import logging
 from typing import Iterable
 import flask
 
-from backend.common.backend_exceptions import require_permissions
+from backend.common.backend_exceptions import (
+    require_all_permissions,
+    require_permissions,
+)
 
-from backend.common import connect, database
+from backend.common import connect, database, env, progress
 from onshape_api.api.api_base import Api
 from onshape_api.endpoints.permissions import Permission
 
-from flask import current_app
 from onshape_api.endpoints import documents, versions
 from onshape_api.paths.instance_type import InstanceType
-from onshape_api.paths.paths import ElementPath, InstancePath
+from onshape_api.paths.paths import DocumentPath, ElementPath, InstancePath
 
 router = flask.Blueprint("references", __name__)
 
@@ -24,8 +29,11 @@ def update_references(*args, **kwargs):
         If included, only references stemming from the specified documents will be updated.
         Otherwise, all outdated references will be updated.
 
+    Supports running as a job and streaming progress, see connect.run_operation.
+
     Returns:
         updatedElements: The number of tabs which had old references that were updated.
+        elements: The result of updating each tab, see ElementUpdateResult.
     """
     db = database.Database()
     api = connect.get_api(db)
@@ -33,74 +41,196 @@ def update_references(*args, **kwargs):
     require_permissions(api, instance_path, Permission.WRITE)
     child_document_ids = connect.get_optional_body_arg("childDocumentIds")
     if child_document_ids != None:
-        for document_id in child_document_ids:
-            require_permissions(api, document_id, Permission.LINK)
+        require_all_permissions(
+            api,
+            (DocumentPath(document_id) for document_id in child_document_ids),
+            Permission.LINK,
+        )
 
-    updated_elements = do_update_references(api, instance_path, child_document_ids)
-    return {"updatedElements": updated_elements}
+    def run(report: progress.Reporter) -> dict:
+        results = do_update_references(api, instance_path, child_document_ids, report)
+        return {
+            "updatedElements": count_updated_elements(results),
+            "elements": [result.to_dict() for result in results],
+        }
 
+    return connect.run_operation("update-references", run)
 
-def do_update_references(
-    api: Api,
+
+@dataclasses.dataclass
+class ElementUpdateResult:
+    """The result of updating the references of a single tab.
+
+    Attributes:
+        element_path: The tab which was updated.
+        reference_updates: The number of references which were updated.
+        error: A description of why the update failed, or None if it succeeded.
+    """
+
+    element_path: ElementPath
+    reference_updates: int
+    error: str | None = None
+
+    @property
+    def succeeded(self) -> bool:
+        return self.error is None
+
+    def to_dict(self) -> dict:
+        return {
+            "documentId": self.element_path.document_id,
+            "elementId": self.element_path.element_id,
+            "referenceUpdates": self.reference_updates,
+            "succeeded": self.succeeded,
+            "error": self.error,
+        }
+
+
+def count_updated_elements(results: Iterable[ElementUpdateResult]) -> int:
+    return sum(1 for result in results if result.succeeded)
+
+
+def get_latest_versions(
+    external_references: dict, child_document_ids: Iterable[str] | None = None
+) -> dict[str, str]:
+    """Returns a dict mapping the documentIds in external_references to their latest versionId.
+
+    Args:
+        child_document_ids: If included, only these documents are included.
+    """
+    latest_versions = {}
+    for latest_version in external_references["latestVersions"]:
+        document_id = latest_version["documentId"]
+        if child_document_ids != None and document_id not in child_document_ids:
+            continue
+        latest_versions[document_id] = latest_version["id"]
+    return latest_versions
+
+
+def get_referenced_document_ids(external_references: dict) -> set[str]:
+    """Returns the ids of every document referenced in external_references."""
+    return set(
+        path["documentId"]
+        for paths in external_references["elementExternalReferences"].values()
+        for path in paths
+    )
+
+
+def collect_reference_updates(
+    external_references: dict,
     instance_path: InstancePath,
-    child_document_ids: Iterable[str] | None = None,
-):
-    """Updates all references from elements in instance_path to any document with child_document_ids to point to the latest version of that reference."""
-    refs = documents.get_external_references(api, instance_path)
-    external_refs: dict = refs["elementExternalReferences"]
+    latest_versions: dict[str, str],
+) -> dict[ElementPath, list[documents.VersionUpdate]]:
+    """Collects the updates needed to point every reference in instance_path to the latest version of its document.
 
-    # Maps documentIds to their latest versionId
-    latest_versions: list = refs["latestVersions"]
-    latest_version_dict = {}
-    for latest_version in latest_versions:
-        latest_version_dict[latest_version["documentId"]] = latest_version["id"]
+    Args:
+        external_references: The result of get_external_references.
+        latest_versions: A dict mapping documentIds to the versionId to update to.
+            References to other documents are left unchanged.
 
-    # For some reason running this asynchronously causes problems...
-    updated_elements = 0
-    for element_id, paths in external_refs.items():
+    Returns:
+        A dict mapping each tab with outdated references to every update it needs.
+    """
+    updates: dict[ElementPath, list[documents.VersionUpdate]] = {}
+    element_refs: dict = external_references["elementExternalReferences"]
+    for element_id, paths in element_refs.items():
         target_path = ElementPath.from_path(instance_path, element_id)
         for path in paths:
-            if not path["isOutOfDate"]:
-                continue
             document_id = path["documentId"]
-            if child_document_ids != None:
-                if document_id not in child_document_ids:
-                    continue
+            latest_version_id = latest_versions.get(document_id)
+            if latest_version_id == None or path["id"] == latest_version_id:
+                continue
             # References are always to external versions
             current_instance_path = InstancePath(
                 document_id, path["id"], InstanceType.VERSION
             )
 
-            reference_updates = []
             for referenced_element in path["referencedElements"]:
                 # Runs once for each tab and each outdated document reference
                 current_path = ElementPath.from_path(
                     current_instance_path, referenced_element
                 )
-                update = documents.VersionUpdate(
-                    current_path, latest_version_dict[current_path.document_id]
-                )
-                reference_updates.append(update)
-
-            # Sometimes externalReferences returns invalid data/updates?
-            try:
-                documents.update_references(api, target_path, reference_updates)
-                updated_elements += 1
-            except:
-                current_app.logger.warning("Failed to update references")
-                continue
+                update = documents.VersionUpdate(current_path, latest_version_id)
+                updates.setdefault(target_path, []).append(update)
+    return updates
+
+
+def apply_element_updates(
+    api: Api,
+    element_path: ElementPath,
+    updates: list[documents.VersionUpdate],
+    report: progress.Reporter = progress.ignore_progress,
+) -> ElementUpdateResult:
+    """Applies every update to a tab in a single call.
+
+    Reports a referenceUpdated event with the result.
+    """
+    try:
+        documents.update_references(api, element_path, updates)
+        result = ElementUpdateResult(element_path, len(updates))
+    except Exception as error:
+        # Sometimes externalReferences returns invalid data/updates?
+        # Runs in a worker thread, so log without the app context
+        logging.warning(
+            "Failed to update references in {}: {}".format(element_path, error)
+        )
+        result = ElementUpdateResult(element_path, len(updates), str(error))
+    report(progress.ProgressEvent("referenceUpdated", result.to_dict()))
+    return result
+
+
+def apply_reference_updates(
+    api: Api,
+    updates: dict[ElementPath, list[documents.VersionUpdate]],
+    max_workers: int = env.update_references_concurrency,
+    report: progress.Reporter = progress.ignore_progress,
+) -> list[ElementUpdateResult]:
+    """Applies updates to each tab concurrently.
+
+    Each tab receives a single call, so calls are never made concurrently against the same tab.
 
-    return updated_elements
+    Returns:
+        The result of updating each tab, in the same order as updates.
+    """
+    if not updates:
+        return []
+    with futures.ThreadPoolExecutor(max_workers) as executor:
+        return list(
+            executor.map(
+                lambda item: apply_element_updates(api, *item, report), updates.items()
+            )
+        )
+
+
+def do_update_references(
+    api: Api,
+    instance_path: InstancePath,
+    child_document_ids: Iterable[str] | None = None,
+    report: progress.Reporter = progress.ignore_progress,
+) -> list[ElementUpdateResult]:
+    """Updates all references from elements in instance_path to any document with child_document_ids to point to the latest version of that reference.
+
+    Returns:
+        The result of updating each tab with outdated references.
+    """
+    refs = documents.get_external_references(api, instance_path)
+    latest_versions = get_latest_versions(refs, child_document_ids)
+    updates = collect_reference_updates(refs, instance_path, latest_versions)
+    return apply_reference_updates(
+        api, updates, env.update_references_concurrency, report
+    )
 
 
 @router.post("/push-version" + connect.instance_route())
 def push_version(**kwargs):
     """Creates a version, then pushes that new version to all instancesToUpdate.
 
+    Supports running as a job and streaming progress, see connect.run_operation.
+
     Args:
         name: The name of the version to create.
         description: The description to create.
         instancesToUpdate: A list of workspace instance objects {documentId, instanceId} to push the version to.
+            Each instance is updated to reference the new versions of the current instance and the instances before it.
 
     Returns:
         updatedReferences: The number of tabs which had references updated.
@@ -108,23 +238,136 @@ def push_version(**kwargs):
     db = database.Database()
     api = connect.get_api(db)
     curr_instance = connect.get_route_instance_path()
-    require_permissions(api, curr_instance, Permission.WRITE, Permission.LINK)
     name = connect.get_body_arg("name")
     description = connect.get_optional_body_arg("description", "")
     body = connect.get_body_arg("instancesToUpdate")
     instances_to_update = [
         InstancePath(temp["documentId"], temp["instanceId"]) for temp in body
     ]
+    require_all_permissions(
+        api, [curr_instance, *instances_to_update], Permission.WRITE, Permission.LINK
+    )
+
+    def run(report: progress.Reporter) -> dict:
+        return do_push_version(
+            api, curr_instance, instances_to_update, name, description, report
+        )
+
+    return connect.run_operation("push-version", run)
+
+
+def plan_push_stages(
+    curr_instance: InstancePath,
+    instances_to_update: list[InstancePath],
+    referenced_document_ids: dict[InstancePath, set[str]],
+) -> list[list[InstancePath]]:
+    """Groups instances into stages which can be versioned concurrently.
+
+    Each instance only references the new versions of the instances before it, so it must wait for the ones it actually
+    references to be versioned. Every other instance can be versioned at the same time.
+
+    Args:
+        referenced_document_ids: A dict mapping each instance in instances_to_update to the documentIds it references.
+
+    Returns:
+        A list of stages, starting with the stage containing curr_instance.
+    """
+    stage_indices = {curr_instance.document_id: 0}
+    stages = [[curr_instance]]
     for instance in instances_to_update:
-        require_permissions(api, instance, Permission.WRITE, Permission.LINK)
+        index = 1 + max(
+            (
+                stage_indices[document_id]
+                for document_id in referenced_document_ids[instance]
+                if document_id in stage_indices
+            ),
+            default=-1,
+        )
+        # Instances of the same document are versioned in order
+        index = max(index, stage_indices.get(instance.document_id, -1) + 1)
+        stage_indices[instance.document_id] = index
+        if index == len(stages):
+            stages.append([])
+        stages[index].append(instance)
+    return stages
 
-    versions.create_version(api, curr_instance, name, description)
 
-    updated_references = 0
+def do_push_version(
+    api: Api,
+    curr_instance: InstancePath,
+    instances_to_update: list[InstancePath],
+    name: str,
+    description: str,
+    report: progress.Reporter = progress.ignore_progress,
+) -> dict:
+    """Versions curr_instance, then updates each of instances_to_update to reference the new versions before versioning it.
+
+    The external references of every instance are fetched at once, and independent instances are updated and versioned
+    concurrently.
+
+    Reports a referencesFetched event once references are fetched, then a referenceUpdated event for each updated tab
+    and a versionCreated event for each instance.
+    """
+    max_workers = env.update_references_concurrency
+    with futures.ThreadPoolExecutor(max_workers) as executor:
+        external_references = dict(
+            zip(
+                instances_to_update,
+                executor.map(
+                    lambda instance: documents.get_external_references(api, instance),
+                    instances_to_update,
+                ),
+            )
+        )
+    report(
+        progress.ProgressEvent(
+            "referencesFetched", {"instances": len(instances_to_update)}
+        )
+    )
+
+    stages = plan_push_stages(
+        curr_instance,
+        instances_to_update,
+        {
+            instance: get_referenced_document_ids(refs)
+            for instance, refs in external_references.items()
+        },
+    )
+    # Each instance may only be updated to the new versions of the instances before it
+    previous_document_ids = {}
     visited_ids = [curr_instance.document_id]
-    for update_instance in instances_to_update:
-        updated_references += do_update_references(api, update_instance, visited_ids)
-        visited_ids.append(update_instance.document_id)
-        versions.create_version(api, update_instance, name, description)
+    for instance in instances_to_update:
+        previous_document_ids[instance] = list(visited_ids)
+        visited_ids.append(instance.document_id)
 
+    new_versions: dict[str, str] = {}
+
+    def push_instance(instance: InstancePath) -> int:
+        updated_elements = 0
+        if instance != curr_instance:
+            latest_versions = {
+                document_id: new_versions[document_id]
+                for document_id in previous_document_ids[instance]
+                if document_id in new_versions
+            }
+            updates = collect_reference_updates(
+                external_references[instance], instance, latest_versions
+            )
+            results = apply_reference_updates(api, updates, max_workers, report)
+            updated_elements = count_updated_elements(results)
+
+        version = versions.create_version(api, instance, name, description)
+        new_versions[instance.document_id] = version["id"]
+        report(
+            progress.ProgressEvent(
+                "versionCreated",
+                {"documentId": instance.document_id, "versionId": version["id"]},
+            )
+        )
+        return updated_elements
+
+    updated_references = 0
+    with futures.ThreadPoolExecutor(max_workers) as executor:
+        for stage in stages:
+            updated_references += sum(executor.map(push_instance, stage))
     return {"updatedReferences": updated_references}
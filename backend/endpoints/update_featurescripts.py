@@ -4,13 +4,14 @@ from typing import Callable
 import flask
 
 from backend.common.backend_exceptions import require_permissions
-from backend.common import connect, database
-from onshape_api.api.api_base import Api
-from onshape_api.endpoints.documents import ElementType, get_document_elements
-from onshape_api.endpoints.feature_studios import pull_code, push_code
+from backend.common import connect, database, env, progress
+from backend.common.push_scheduler import AdaptivePushScheduler, StudioPush
+from onshape_api.api.async_api import AsyncApi
+from onshape_api.endpoints.documents import ElementType, get_document_elements_async
+from onshape_api.endpoints.feature_studios import pull_code_async, push_code_async
 from onshape_api.endpoints.permissions import Permission
 from onshape_api.endpoints.std_versions import get_latest_std_version
-from onshape_api.paths.paths import ElementPath
+from onshape_api.paths.paths import ElementPath, InstancePath
 
 router = flask.Blueprint("update-featurescripts", __name__)
 
@@ -23,60 +24,103 @@ def latest_std_version(*args, **kwargs):
 
 
 @router.post("/update-featurescript-version" + connect.instance_route("w"))
-async def update_references(*args, **kwargs):
+def update_references(*args, **kwargs):
     """Updates the versions of all standard library imports in a given document to the latest library version.
 
+    Supports running as a job and streaming progress, see connect.run_operation.
+
     Args:
         stdVersion: The std version to update to, e.g. "123".
 
     Returns:
         updatedStudios: The number of Feature Studios which were modified.
+        pushConcurrency: The largest number of Feature Studios which were pushed at once.
     """
     db = database.Database()
     api = connect.get_api(db)
     instance_path = connect.get_route_instance_path("w")
     require_permissions(api, instance_path, Permission.WRITE)
     std_version = connect.get_body_arg("stdVersion")
+    async_api = connect.get_async_api(db)
 
-    elements = get_document_elements(api, instance_path, ElementType.FEATURE_STUDIO)
+    def run(report: progress.Reporter) -> dict:
+        return asyncio.run(
+            update_featurescripts(async_api, instance_path, std_version, report)
+        )
 
-    feature_studio_paths: list[ElementPath] = []
-    tasks: list[asyncio.Task[str]] = []
-    # Pull Feature Studios asynchronously to improve performance
-    async with asyncio.TaskGroup() as task_group:
-        for studio in elements:
-            studio_path = ElementPath.from_path(instance_path, studio["id"])
-            feature_studio_paths.append(studio_path)
-            tasks.append(task_group.create_task(pull_code_async(api, studio_path)))
+    return connect.run_operation("update-featurescript-version", run)
 
-    # We can't push studios asynchronously since Onshape doesn't handle the overlapping calls very well
-    updated_studios = 0
-    for studio_path, task in zip(feature_studio_paths, tasks):
-        if update_feature_studio(api, studio_path, task.result(), std_version):
-            updated_studios += 1
 
-    return {"updatedStudios": updated_studios}
+async def update_featurescripts(
+    async_api: AsyncApi,
+    instance_path: InstancePath,
+    std_version: str,
+    report: progress.Reporter = progress.ignore_progress,
+) -> dict:
+    """Updates the std version of every Feature Studio in instance_path.
 
+    Reports a studiosFound event once the Feature Studios are listed, a studioPulled event as each one is pulled,
+    and a studioPushed event for each one which is updated.
 
-OUTDATED_VERSION_MATCH: re.Pattern[str] = re.compile(
-    r'version : "(\d{2,7})\.0"|FeatureScript (\d{2,7});'
-)
+    async_api is closed once the update finishes.
+    """
+    async with async_api:
+        elements = await get_document_elements_async(
+            async_api, instance_path, ElementType.FEATURE_STUDIO
+        )
 
-VERSION_SUB_MATCH = re.compile(r"\d{2,7}")
+        report(progress.ProgressEvent("studiosFound", {"studios": len(elements)}))
+
+        async def pull_studio(studio_path: ElementPath) -> str:
+            code = await pull_code_async(async_api, studio_path)
+            report(
+                progress.ProgressEvent(
+                    "studioPulled", {"elementId": studio_path.element_id}
+                )
+            )
+            return code
+
+        feature_studio_paths: list[ElementPath] = []
+        tasks: list[asyncio.Task[str]] = []
+        # Pull Feature Studios concurrently to improve performance
+        async with asyncio.TaskGroup() as task_group:
+            for studio in elements:
+                studio_path = ElementPath.from_path(instance_path, studio["id"])
+                feature_studio_paths.append(studio_path)
+                tasks.append(task_group.create_task(pull_studio(studio_path)))
+
+        pushes: list[StudioPush] = []
+        for studio_path, task in zip(feature_studio_paths, tasks):
+            code = task.result()
+            updated_code = update_std_versions(code, std_version)
+            if code != updated_code:
+                pushes.append(StudioPush(studio_path, updated_code))
+
+        # Onshape doesn't always handle overlapping pushes well, so the scheduler backs off to pushing serially
+        scheduler = AdaptivePushScheduler(
+            lambda studio_path, code: push_code_async(async_api, studio_path, code),
+            max_concurrency=env.feature_studio_push_concurrency,
+        )
+        push_report = await scheduler.run(
+            pushes,
+            on_pushed=lambda push: report(
+                progress.ProgressEvent(
+                    "studioPushed", {"elementId": push.studio_path.element_id}
+                )
+            ),
+        )
 
+    return {
+        "updatedStudios": push_report.pushed,
+        "pushConcurrency": push_report.max_concurrency,
+    }
 
-async def pull_code_async(api: Api, feature_studio_path: ElementPath):
-    return pull_code(api, feature_studio_path)
 
+OUTDATED_VERSION_MATCH: re.Pattern[str] = re.compile(
+    r'version : "(\d{2,7})\.0"|FeatureScript (\d{2,7});'
+)
 
-def update_feature_studio(
-    api: Api, studio_path: ElementPath, code: str, std_version: str
-) -> bool:
-    updated_code = update_std_versions(code, std_version)
-    if code == updated_code:
-        return False
-    push_code(api, studio_path, updated_code)
-    return True
+VERSION_SUB_MATCH = re.compile(r"\d{2,7}")
 
 
 def update_std_versions(code: str, std_version: str) -> str:
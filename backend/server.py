@@ -2,7 +2,7 @@ import os
 import flask
 from onshape_api.endpoints import users
 from backend import api
-from backend.common import connect, database, env
+from backend.common import connect, database, env, evaluate, evaluation_cache, jobs
 from backend import oauth
 
 
@@ -16,6 +16,25 @@ def create_app():
         SESSION_COOKIE_SAMESITE="None",
     )
     os.environ["OAUTHLIB_INSECURE_TRANSPORT"] = "1"
+    # Fail on startup if a script is missing rather than on the first request which uses it
+    evaluate.load_scripts()
+    # Create the shared client up front rather than during the first request
+    database.get_client()
+    evaluate.set_evaluation_cache(
+        evaluation_cache.make_evaluation_cache(
+            database.Database(),
+            max_entries=env.evaluation_cache_size,
+            directory=env.evaluation_cache_dir,
+            use_firestore=env.evaluation_cache_firestore,
+        )
+    )
+    jobs.set_job_queue(
+        jobs.make_job_queue(
+            database.Database(),
+            max_workers=env.job_workers,
+            use_firestore=env.jobs_firestore,
+        )
+    )
 
     app.register_blueprint(api.router)
     app.register_blueprint(oauth.router)
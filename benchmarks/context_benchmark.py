@@ -0,0 +1,112 @@
+"""Benchmarks saving and restoring Context, which Node.run_build does for every node.
+
+Compares the undo log Context uses against copying every stack field on each save, as the previous implementation
+did, both on a synthetic tree of nodes and on building the studios under robot_code/code/gen.
+
+Usage:
+    python -m benchmarks.context_benchmark
+"""
+
+import copy
+import dataclasses
+import pathlib
+import time
+from typing import Any, Callable
+
+from featurescript.base import ctxt, studio
+from featurescript.manager import load_module
+
+_STACK_FIELDS = ["enum", "ui", "test_predicate", "indent", "scope"]
+
+GEN_PATH = pathlib.Path("robot_code/code/gen")
+
+
+@dataclasses.dataclass
+class CopyingContext(ctxt.Context):
+    """The previous implementation, which copies every stack field on each save."""
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        object.__setattr__(self, name, value)
+
+    def as_dict(self) -> dict[str, Any]:
+        return dict(
+            (field.name, copy.copy(getattr(self, field.name)))
+            for field in dataclasses.fields(self)
+            if field.name in _STACK_FIELDS
+        )
+
+    def save(self) -> None:
+        self.stack.append(self.as_dict())
+
+    def restore(self) -> None:
+        for key, value in self.stack.pop().items():
+            setattr(self, key, value)
+
+
+def walk(context: ctxt.Context, depth: int, width: int) -> int:
+    """Saves and restores context once per node of a tree, setting a field in every fourth node.
+
+    Returns the number of nodes visited.
+    """
+    context.save()
+    if depth % 4 == 0:
+        context.indent += 1
+    count = 1
+    if depth > 0:
+        for _ in range(width):
+            count += walk(context, depth - 1, width)
+    context.restore()
+    return count
+
+
+def time_runs(run: Callable[[], Any], repeat: int) -> tuple[float, Any]:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = run()
+    return (time.perf_counter() - start) / repeat, result
+
+
+def run_tree(depth: int, width: int, repeat: int = 5) -> None:
+    copy_time, nodes = time_runs(
+        lambda: walk(CopyingContext("2000"), depth, width), repeat
+    )
+    undo_time, _ = time_runs(lambda: walk(ctxt.Context("2000"), depth, width), repeat)
+    print(
+        "nodes={:<7} copy: {:.4f}s | undo log: {:.4f}s | {:.1f}x".format(
+            nodes, copy_time, undo_time, copy_time / undo_time
+        )
+    )
+
+
+def run_studios(repeat: int = 20) -> None:
+    for path in sorted(GEN_PATH.glob("*.py")):
+        try:
+            module = load_module(path)
+        except Exception:
+            # Some generator modules are out of date with the library
+            continue
+        for value in vars(module).values():
+            if not isinstance(value, studio.Studio):
+                continue
+            copy_time, expected = time_runs(
+                lambda: value.build(CopyingContext("2000")), repeat
+            )
+            undo_time, result = time_runs(
+                lambda: value.build(ctxt.Context("2000")), repeat
+            )
+            assert result == expected, "Contexts built different code"
+            print(
+                "{:<20} copy: {:.4f}s | undo log: {:.4f}s | {:.1f}x".format(
+                    value.studio_name, copy_time, undo_time, copy_time / undo_time
+                )
+            )
+
+
+def main():
+    for depth, width in [(4, 4), (6, 5), (8, 4)]:
+        run_tree(depth, width)
+    run_studios()
+
+
+if __name__ == "__main__":
+    main()
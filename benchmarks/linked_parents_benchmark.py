@@ -0,0 +1,185 @@
+"""Benchmarks get_all_linked_parents on synthetic graphs using an in-memory stand-in for Firestore.
+
+Each Firestore round trip is delayed by LATENCY seconds. The breadth-first traversal, which reads each level in a single batch,
+is compared against fetching every node individually, as the previous depth-first traversal did.
+
+Importing the backend requires the backend env variables (see README).
+
+Usage:
+    python -m benchmarks.linked_parents_benchmark
+"""
+
+import random
+import time
+from typing import cast
+
+from backend.common import backend_exceptions, database
+from backend.endpoints.linked_documents import (
+    get_all_linked_parents,
+    get_linked_document_paths,
+    get_linked_document_paths_batch,
+    make_db_id,
+)
+from onshape_api.paths.paths import InstancePath
+
+LATENCY = 0.005
+"""The simulated latency of a Firestore round trip, in seconds."""
+
+
+class FakeSnapshot:
+    def __init__(self, id: str, data: dict | None):
+        self.id = id
+        self.exists = data is not None
+        self._data = data
+
+    def to_dict(self) -> dict | None:
+        return self._data
+
+
+class FakeDocumentReference:
+    def __init__(self, client: "FakeClient", id: str):
+        self._client = client
+        self.id = id
+
+    def get(self) -> FakeSnapshot:
+        self._client.round_trips += 1
+        time.sleep(LATENCY)
+        return FakeSnapshot(self.id, self._client.data.get(self.id))
+
+
+class FakeCollection:
+    def __init__(self, client: "FakeClient"):
+        self._client = client
+
+    def document(self, id: str) -> FakeDocumentReference:
+        return FakeDocumentReference(self._client, id)
+
+
+class FakeClient:
+    def __init__(self, data: dict[str, dict]):
+        self.data = data
+        self.round_trips = 0
+
+    def get_all(self, refs: list[FakeDocumentReference]):
+        self.round_trips += 1
+        time.sleep(LATENCY)
+        # Firestore doesn't return documents in the order they were requested
+        refs = list(refs)
+        random.shuffle(refs)
+        return [FakeSnapshot(ref.id, self.data.get(ref.id)) for ref in refs]
+
+
+class FakeDatabase:
+    def __init__(self, data: dict[str, dict]):
+        self.db = FakeClient(data)
+        self.linked_documents = FakeCollection(self.db)
+
+
+def make_path(i: int) -> InstancePath:
+    return InstancePath("{:024x}".format(i), "{:024x}".format(i))
+
+
+def make_graph(
+    depth: int, width: int, links: int, seed: int = 0
+) -> tuple[dict[str, dict], InstancePath]:
+    """Builds a layered graph where each document links to random documents in the next level."""
+    rng = random.Random(seed)
+    levels = [[make_path(0)]] + [
+        [make_path(1 + level * width + i) for i in range(width)]
+        for level in range(depth)
+    ]
+    data = {}
+    for level, nodes in enumerate(levels[:-1]):
+        for node in nodes:
+            parents = rng.sample(levels[level + 1], min(links, width))
+            data[make_db_id(node.document_id, node.instance_id)] = {
+                "parents": [
+                    make_db_id(parent.document_id, parent.instance_id)
+                    for parent in parents
+                ]
+            }
+    return data, levels[0][0]
+
+
+def reference_dfs(db: FakeDatabase, root: InstancePath) -> list[InstancePath]:
+    """The previous depth-first traversal, which reads one document per round trip."""
+    visited = set()
+    stack = set()
+    result = []
+
+    def dfs(curr: InstancePath):
+        if curr in stack:
+            raise backend_exceptions.LinkedCycleException()
+        if curr in visited:
+            return
+        stack.add(curr)
+        visited.add(curr)
+        for node in get_linked_document_paths(cast(database.Database, db), curr):
+            dfs(node)
+        stack.remove(curr)
+        result.append(curr)
+
+    dfs(root)
+    result.pop()
+    return result[::-1]
+
+
+def run(depth: int, width: int, links: int) -> None:
+    data, root = make_graph(depth, width, links)
+
+    db = FakeDatabase(data)
+    start = time.perf_counter()
+    expected = reference_dfs(db, root)
+    dfs_time = time.perf_counter() - start
+    dfs_round_trips = db.db.round_trips
+
+    db = FakeDatabase(data)
+    start = time.perf_counter()
+    result = get_all_linked_parents(
+        lambda nodes: get_linked_document_paths_batch(
+            cast(database.Database, db), nodes
+        ),
+        root,
+    )
+    bfs_time = time.perf_counter() - start
+
+    assert result == expected, "Traversals returned different orders"
+    print(
+        "depth={:<3} width={:<3} links={:<2} documents={:<4} dfs: {:>4} reads {:.3f}s | batched: {:>2} reads {:.3f}s".format(
+            depth,
+            width,
+            links,
+            len(result),
+            dfs_round_trips,
+            dfs_time,
+            db.db.round_trips,
+            bfs_time,
+        )
+    )
+
+
+def main():
+    for depth, width, links in [(3, 4, 2), (5, 10, 3), (10, 10, 3), (20, 20, 4)]:
+        run(depth, width, links)
+
+    # Cycles are still detected
+    data, root = make_graph(3, 3, 2)
+    root_id = make_db_id(root.document_id, root.instance_id)
+    for value in data.values():
+        value["parents"].append(root_id)
+    db = FakeDatabase(data)
+    try:
+        get_all_linked_parents(
+            lambda nodes: get_linked_document_paths_batch(
+                cast(database.Database, db), nodes
+            ),
+            root,
+        )
+    except backend_exceptions.LinkedCycleException:
+        print("cycle detected")
+    else:
+        raise AssertionError("Failed to detect cycle")
+
+
+if __name__ == "__main__":
+    main()
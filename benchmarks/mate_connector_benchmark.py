@@ -0,0 +1,96 @@
+"""Benchmarks AssemblyFeatures.is_mate_connector_used on a synthetic assembly with thousands of fastened mates.
+
+Checks every mate connector of every instance, as assembly mirror does, and compares the indexed lookup
+against scanning every fastened mate for each check, as the previous implementation did.
+
+Usage:
+    python -m benchmarks.mate_connector_benchmark
+"""
+
+import random
+import time
+
+from backend.common.assembly_data import (
+    AssemblyFeatures,
+    get_parameter,
+)
+from onshape_api.model.assembly_features import (
+    fasten_mate,
+    part_studio_mate_connector_query,
+)
+
+
+def make_features(
+    instances: int, mate_connectors: int, mates: int, seed: int = 0
+) -> tuple[AssemblyFeatures, list[tuple[dict, str]]]:
+    """Builds an assembly where each mate fastens two random mate connectors together.
+
+    Returns the features and a list of every (instance, mate id) pair in the assembly.
+    """
+    rng = random.Random(seed)
+    pairs = [
+        ({"id": "I{}".format(i)}, "M{}".format(j))
+        for i in range(instances)
+        for j in range(mate_connectors)
+    ]
+    features = []
+    for i in range(mates):
+        first, second = rng.sample(pairs, 2)
+        queries = [
+            part_studio_mate_connector_query(instance["id"], mate_id)
+            for instance, mate_id in (first, second)
+        ]
+        features.append(fasten_mate("Fasten {}".format(i), queries))
+    return AssemblyFeatures({"features": features}), pairs
+
+
+def scan_is_mate_connector_used(
+    assembly_features: AssemblyFeatures, instance: dict, mate_id: str
+) -> bool:
+    """The previous implementation, which scans every fastened mate."""
+    for feature in assembly_features.get_fastened_mates():
+        queries = get_parameter(feature, "mateConnectorsQuery")["queries"]
+        if any(
+            query["featureId"] == mate_id and query["path"][0] == instance["id"]
+            for query in queries
+        ):
+            return True
+    return False
+
+
+def run(instances: int, mate_connectors: int, mates: int) -> None:
+    assembly_features, pairs = make_features(instances, mate_connectors, mates)
+
+    start = time.perf_counter()
+    expected = [
+        scan_is_mate_connector_used(assembly_features, instance, mate_id)
+        for instance, mate_id in pairs
+    ]
+    scan_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = [
+        assembly_features.is_mate_connector_used(instance, mate_id)
+        for instance, mate_id in pairs
+    ]
+    index_time = time.perf_counter() - start
+
+    assert result == expected, "Index returned different results"
+    print(
+        "checks={:<6} mates={:<5} used={:<5} scan: {:.3f}s | index: {:.4f}s".format(
+            len(pairs), mates, sum(result), scan_time, index_time
+        )
+    )
+
+
+def main():
+    for instances, mate_connectors, mates in [
+        (100, 4, 200),
+        (500, 4, 1000),
+        (1000, 4, 3000),
+    ]:
+        run(instances, mate_connectors, mates)
+
+
+if __name__ == "__main__":
+    main()
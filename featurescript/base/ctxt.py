@@ -1,6 +1,4 @@
 from __future__ import annotations
-import collections
-import copy
 import dataclasses
 import enum as std_enum
 from typing import TYPE_CHECKING, Any
@@ -8,8 +6,8 @@ from typing import TYPE_CHECKING, Any
 if TYPE_CHECKING:  # prevent circular import
     from featurescript.base import imp
 
-_STACK_FIELDS = ["enum", "ui", "test_predicate", "indent", "scope"]
-"""A list of fields which use the stack (meaning they automatically revert once the setting node exits)."""
+_STACK_FIELDS = frozenset(["enum", "ui", "test_predicate", "indent", "scope"])
+"""A set of fields which use the stack (meaning they automatically revert once the setting node exits)."""
 
 
 class Scope(std_enum.StrEnum):
@@ -33,6 +31,9 @@ class Context:
 
     ui and test_predicate are used together to trigger automatic inlining of predicates,
       which circumvents nested predicate restrictions.
+
+    The stack is an undo log: each frame records the previous value of the stack fields set since it was saved.
+    Most nodes don't set any, so saving and restoring is cheap.
     """
 
     std_version: str
@@ -45,20 +46,24 @@ class Context:
     scope: Scope = Scope.TOP
     indent: int = 0
 
-    stack: collections.deque[dict] = dataclasses.field(
-        default_factory=collections.deque
-    )
+    stack: list[dict[str, Any]] = dataclasses.field(default_factory=list)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name in _STACK_FIELDS:
+            # stack doesn't exist yet while fields are initialized
+            stack = self.__dict__.get("stack")
+            if stack:
+                frame = stack[-1]
+                if name not in frame:
+                    frame[name] = getattr(self, name)
+        object.__setattr__(self, name, value)
 
     def as_dict(self) -> dict[str, Any]:
-        return dict(
-            (field.name, copy.copy(getattr(self, field.name)))
-            for field in dataclasses.fields(self)
-            if field.name in _STACK_FIELDS
-        )
+        return dict((name, getattr(self, name)) for name in _STACK_FIELDS)
 
     def save(self) -> None:
-        self.stack.append(self.as_dict())
+        self.stack.append({})
 
     def restore(self) -> None:
         for key, value in self.stack.pop().items():
-            setattr(self, key, value)
+            object.__setattr__(self, key, value)
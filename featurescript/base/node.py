@@ -1,13 +1,61 @@
 from __future__ import annotations
-from abc import ABC, abstractmethod
+from abc import ABC
 from typing import Generic, Iterable, Self, TypeVar
 from onshape_api.utils import str_utils
 
 from featurescript.base import ctxt
 
 
+class Writer:
+    """Accumulates the code built by nodes, indenting it as it is written.
+
+    Each call to indent() begins a block which is indented exactly as if its contents were passed to
+    str_utils.indent, so nested blocks are indented once as they're written rather than copied once per level.
+    """
+
+    def __init__(self) -> None:
+        self._parts: list[str] = []
+        # Whether each open block is at the start of a line
+        self._line_starts: list[bool] = []
+
+    def indent(self) -> None:
+        """Begins an indented block. Must be followed by a call to dedent()."""
+        self._line_starts.append(True)
+
+    def dedent(self) -> None:
+        """Ends the current indented block."""
+        self._line_starts.pop()
+
+    def write(self, string: str) -> None:
+        if not string:
+            return
+        if not self._line_starts:
+            self._parts.append(string)
+            return
+
+        lines = string.splitlines(keepends=True)
+        # A block which begins mid line still indents its first line
+        self._parts.append(str_utils.INDENT * self._line_starts.count(True))
+        self._parts.append(lines[0])
+        if len(lines) > 1:
+            prefix = str_utils.INDENT * len(self._line_starts)
+            self._parts.append(prefix + prefix.join(lines[1:]))
+        at_line_start = lines[-1].splitlines()[0] != lines[-1]
+        self._line_starts = [at_line_start] * len(self._line_starts)
+
+    def getvalue(self) -> str:
+        """Returns everything which has been written."""
+        return "".join(self._parts)
+
+
 # should be ABC, but ABC breaks enum useage?
 class Node:
+    """A node which can be built into code.
+
+    Subclasses override either build, which returns the code of the node, or write, which writes the code of the node
+    to a Writer. Nodes with many descendants should override write so their code isn't copied by each ancestor.
+    """
+
     def run_build(self, context: ctxt.Context, scope: ctxt.Scope | None = None) -> str:
         """Saves the context state onto the stack, executes build, and then pops the context back.
 
@@ -23,13 +71,34 @@ class Node:
         context.restore()
         return string
 
-    @abstractmethod
+    def run_write(
+        self, writer: Writer, context: ctxt.Context, scope: ctxt.Scope | None = None
+    ) -> None:
+        """The equivalent of run_build which writes to writer instead of returning a string.
+
+        Note this method should not be invoked in a super() call to prevent infinite recursion; invoke write() instead.
+        """
+        context.save()
+        if scope:
+            context.scope = scope
+        self.write(writer, context=context)
+        context.restore()
+
     def build(self, context: ctxt.Context) -> str:
-        """An abstract method which should build the node into a string and return it.
+        """Builds the node into a string and returns it. Must be overridden if write isn't.
 
         Note this method should not be invoked directly except via a super() call; call run_build instead.
         """
-        ...
+        writer = Writer()
+        self.write(writer, context=context)
+        return writer.getvalue()
+
+    def write(self, writer: Writer, context: ctxt.Context) -> None:
+        """Writes the node to writer. Must be overridden if build isn't.
+
+        Note this method should not be invoked directly except via a super() call; call run_write instead.
+        """
+        writer.write(self.build(context=context))
 
     def add_to_parent(self, parent: ParentNode) -> Self:
         """A method which is invoked to add the current node to a parent."""
@@ -66,6 +135,14 @@ class ParentNode(Node, Generic[N], ABC):
         """
         return build_nodes(self.children, context, **kwargs)
 
+    def write_children(self, writer: Writer, context: ctxt.Context, **kwargs) -> None:
+        """Writes the children added to the class to writer.
+
+        Args:
+            **kwargs: kwargs to pass to write_nodes.
+        """
+        write_nodes(writer, self.children, context, **kwargs)
+
 
 def build_nodes(
     nodes: Iterable[Node],
@@ -82,8 +159,28 @@ def build_nodes(
         end: A separator placed between each node and at the end.
         indent: Whether to indent each node.
     """
+    writer = Writer()
+    write_nodes(writer, nodes, context, sep=sep, end=end, indent=indent, scope=scope)
+    return writer.getvalue()
+
+
+def write_nodes(
+    writer: Writer,
+    nodes: Iterable[Node],
+    context: ctxt.Context,
+    sep: str = "",
+    end: str = "",
+    indent: bool = False,
+    scope: ctxt.Scope | None = None,
+) -> None:
+    """Writes an iterable of nodes to writer. Takes the same arguments as build_nodes."""
     if indent:
         context.indent += 1
-    strings = [node.run_build(context, scope=scope) for node in nodes]
-    combined = (sep + end).join(strings) + end
-    return str_utils.indent(combined) if indent else combined
+        writer.indent()
+    for i, node in enumerate(nodes):
+        if i > 0:
+            writer.write(sep + end)
+        node.run_write(writer, context, scope=scope)
+    writer.write(end)
+    if indent:
+        writer.dedent()
@@ -58,10 +58,10 @@ class Studio(node.ParentNode):
         return header
 
     @override
-    def build(self, context: ctxt.Context) -> str:
+    def write(self, writer: node.Writer, context: ctxt.Context) -> None:
         """The top-level build function for the studio."""
-        header = self._build_header(context) + _GENERATED_STUDIO_HEADER
-        return header + self.build_children(context, sep="\n")
+        writer.write(self._build_header(context) + _GENERATED_STUDIO_HEADER)
+        self.write_children(writer, context, sep="\n")
 
 
 # _BEGIN_GENERATION = "// Begin generated section\n"
@@ -0,0 +1,238 @@
+"""Tracks which generator modules have changed since they were last built.
+
+Each module under code_gen_path is fingerprinted using its source, the source of every local module it imports
+(transitively), and the std version. Modules whose fingerprint matches the previous build don't need to be run again,
+as long as the studios they built haven't been modified since.
+"""
+
+import ast
+import hashlib
+import json
+import pathlib
+import sys
+from typing import Iterable
+
+CACHE_VERSION = 2
+"""Incremented whenever the build output changes in a way fingerprints don't capture, invalidating every entry."""
+
+
+def hash_code(code: str) -> str:
+    """Returns the digest of the code of a built studio."""
+    return hashlib.sha256(code.encode()).hexdigest()
+
+
+def get_module_name(path: pathlib.Path, root: pathlib.Path) -> str | None:
+    """Returns the name path would be imported as from root, or None if path isn't under root."""
+    try:
+        parts = list(path.resolve().relative_to(root.resolve()).with_suffix("").parts)
+    except ValueError:
+        return None
+    if parts[-1] == "__init__":
+        parts.pop()
+    return ".".join(parts)
+
+
+def find_imports(path: pathlib.Path, module_name: str | None = None) -> set[str]:
+    """Returns the names of the modules imported by the module at path.
+
+    Both `from package import module` and `from package import name` add package.module and package.name,
+    since a name may be a submodule. Names which aren't modules are discarded when they're resolved.
+
+    Args:
+        module_name: The name of the module at path. Used to resolve relative imports.
+    """
+    is_package = path.name == "__init__.py"
+    imports = set()
+    for node in ast.walk(ast.parse(path.read_text(), str(path))):
+        if isinstance(node, ast.Import):
+            imports.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            if node.level > 0:
+                if module_name is None:
+                    continue
+                package = module_name if is_package else module_name.rpartition(".")[0]
+                parts = package.split(".") if package else []
+                if node.level - 1 > len(parts):
+                    continue
+                base = ".".join(parts[: len(parts) - (node.level - 1)])
+                module = ".".join(name for name in (base, node.module) if name)
+            else:
+                module = node.module or ""
+            if not module:
+                continue
+            imports.add(module)
+            imports.update(
+                module + "." + alias.name for alias in node.names if alias.name != "*"
+            )
+    return imports
+
+
+def resolve_module(
+    name: str, search_paths: Iterable[pathlib.Path]
+) -> pathlib.Path | None:
+    """Returns the source file of the module with the given name, or None if it can't be found in search_paths."""
+    relative = pathlib.Path(*name.split("."))
+    for search_path in search_paths:
+        for candidate in (
+            search_path / relative.with_suffix(".py"),
+            search_path / relative / "__init__.py",
+        ):
+            if candidate.is_file():
+                return candidate
+    return None
+
+
+class Fingerprinter:
+    """Fingerprints generator modules.
+
+    Only modules under root are tracked, so changes to the standard library and installed packages are ignored.
+    """
+
+    def __init__(
+        self, root: pathlib.Path | None = None, files: dict[str, dict] | None = None
+    ) -> None:
+        """
+        Args:
+            files: Information about each module from a previous run, see BuildCache.files.
+                Modules whose size and modification time haven't changed aren't read again. Updated in place.
+        """
+        self.root = (root or pathlib.Path.cwd()).resolve()
+        self._search_paths = [self.root] + [
+            path
+            for entry in sys.path
+            if entry
+            and (path := pathlib.Path(entry).resolve()) != self.root
+            and path.is_relative_to(self.root)
+        ]
+        self.files = files if files is not None else {}
+        # Generator modules share most of their dependencies, so each file is only checked once per run
+        self._checked: set[pathlib.Path] = set()
+
+    def _get_file(self, path: pathlib.Path) -> dict:
+        """Returns the digest and direct dependencies of the module at path."""
+        key = path.as_posix()
+        entry = self.files.get(key)
+        if path in self._checked and entry is not None:
+            return entry
+
+        stat = path.stat()
+        if (
+            entry is None
+            or entry["mtime"] != stat.st_mtime_ns
+            or entry["size"] != stat.st_size
+        ):
+            entry = {
+                "mtime": stat.st_mtime_ns,
+                "size": stat.st_size,
+                "digest": hashlib.sha256(path.read_bytes()).hexdigest(),
+                "dependencies": sorted(
+                    dependency.as_posix()
+                    for dependency in self._find_dependencies(path)
+                ),
+            }
+            self.files[key] = entry
+        self._checked.add(path)
+        return entry
+
+    def _find_dependencies(self, path: pathlib.Path) -> set[pathlib.Path]:
+        dependencies = set()
+        for name in find_imports(path, get_module_name(path, self.root)):
+            # Importing a submodule runs the __init__.py of each parent package
+            parts = name.split(".")
+            for i in range(1, len(parts) + 1):
+                resolved = resolve_module(".".join(parts[:i]), self._search_paths)
+                if resolved is not None and resolved.resolve() != path:
+                    dependencies.add(resolved.resolve())
+        return dependencies
+
+    def _direct_dependencies(self, path: pathlib.Path) -> list[pathlib.Path]:
+        return [
+            pathlib.Path(dependency)
+            for dependency in self._get_file(path)["dependencies"]
+        ]
+
+    def get_dependencies(self, path: pathlib.Path) -> list[pathlib.Path]:
+        """Returns every local module path imports, directly or indirectly, in sorted order."""
+        path = path.resolve()
+        visited = {path}
+        stack = [path]
+        while stack:
+            for dependency in self._direct_dependencies(stack.pop()):
+                if dependency not in visited:
+                    visited.add(dependency)
+                    stack.append(dependency)
+        visited.remove(path)
+        return sorted(visited)
+
+    def fingerprint(self, path: pathlib.Path, std_version: str) -> str:
+        """Returns a fingerprint which changes whenever building path could produce different studios."""
+        path = path.resolve()
+        hasher = hashlib.sha256()
+        hasher.update("{}\n{}\n".format(CACHE_VERSION, std_version).encode())
+        for file in [path, *self.get_dependencies(path)]:
+            name = (
+                file.relative_to(self.root) if file.is_relative_to(self.root) else file
+            )
+            hasher.update(
+                "{}:{}\n".format(name, self._get_file(file)["digest"]).encode()
+            )
+        return hasher.hexdigest()
+
+
+class BuildCache:
+    """Stores the fingerprint of each generator module and the studios it built when it was last built.
+
+    The digest of each studio is stored as well, so studios which were overwritten (e.g. by pull) or edited
+    since they were built are detected.
+
+    Attributes:
+        files: The digest and dependencies of every module which was fingerprinted, for use by Fingerprinter.
+    """
+
+    def __init__(self, path: pathlib.Path) -> None:
+        self.path = path
+        self._entries: dict[str, dict] = {}
+        self.files: dict[str, dict] = {}
+        if path.is_file():
+            try:
+                data = json.loads(path.read_text())
+            except ValueError:
+                data = {}
+            if data.get("version") == CACHE_VERSION:
+                self._entries = data.get("modules", {})
+                self.files = data.get("files", {})
+
+    def get_studios(self, module: str, fingerprint: str) -> dict[str, str] | None:
+        """Returns a dict mapping the name of each studio module built to the digest of its code.
+
+        Returns None if module has changed since it was built.
+        """
+        entry = self._entries.get(module)
+        if entry is None or entry["fingerprint"] != fingerprint:
+            return None
+        return entry["studios"]
+
+    def set(
+        self, module: str, fingerprint: str, studios: list[tuple[str, str]]
+    ) -> None:
+        """Records the name and code of each studio module built."""
+        self._entries[module] = {
+            "fingerprint": fingerprint,
+            "studios": dict((name, hash_code(code)) for name, code in studios),
+        }
+
+    def remove(self, module: str) -> None:
+        self._entries.pop(module, None)
+
+    def save(self) -> None:
+        self.path.write_text(
+            json.dumps(
+                {
+                    "version": CACHE_VERSION,
+                    "modules": self._entries,
+                    "files": self.files,
+                },
+                indent=4,
+                sort_keys=True,
+            )
+        )
@@ -6,6 +6,9 @@ from featurescript import feature_studio
 from onshape_api.paths import paths
 
 STORAGE_FILE: str = "studio_data.pickle"
+STD_VERSIONS_FILE: str = "std_versions.json"
+BUILD_CACHE_FILE: str = "build_cache.json"
+DEFAULT_BUILD_DOCUMENT: str = "backend"
 
 FileData = dict[str, feature_studio.LocalFeatureStudio]
 
@@ -15,11 +18,13 @@ class ConfigData(Protocol):
     Attributes:
         storage_path: A path to a file to store data under.
         code_path: A dict of data.
+        build_document: The name of the document in documents which built studios are created in.
     """
 
     storage_path: dict | None
     code_path: dict | None
     code_gen_path: dict | None
+    build_document: str | None
 
 
 class Config:
@@ -48,17 +53,20 @@ class Config:
         self.storage_path = self._get_dir(
             self._get_config_key(config, "storage_path")
         ) / pathlib.Path(STORAGE_FILE)
+        self.std_versions_path = self.storage_path.parent / STD_VERSIONS_FILE
+        self.build_cache_path = self.storage_path.parent / BUILD_CACHE_FILE
         self.code_path = self._get_dir(self._get_config_key(config, "code_path"))
         self.code_gen_path = self._get_dir(
             self._get_config_key(config, "code_gen_path")
         )
 
         self._parse_document_paths(config)
+        self.build_document: str = config.get("build_document", DEFAULT_BUILD_DOCUMENT)
 
     def _parse_document_paths(self, config: dict) -> None:
         documents: dict[str, str] = self._get_config_key(config, "documents")
         self.documents: dict[str, paths.InstancePath] = dict(
-            (document_name, paths.url_to_element_path(url))
+            (document_name, paths.url_to_instance_path(url))
             for document_name, url in documents.items()
         )
 
@@ -80,6 +88,10 @@ class Config:
         with (self.code_path / name).open("w") as file:
             file.write(code)
 
+    def has_file(self, name: str) -> bool:
+        """Returns True if the specified file exists."""
+        return (self.code_path / name).is_file()
+
     def read_file(self, name: str) -> str | None:
         """Reads code from the specified file.
 
@@ -16,25 +16,26 @@ class _If(node.ParentNode):
         self.else_if = else_if
 
     @override
-    def build(self, context: ctxt.Context) -> str:
+    def write(self, writer: node.Writer, context: ctxt.Context) -> None:
         string = "else " if self.else_if else ""
         string += "if ({})\n{{\n".format(
             self.test.run_build(context, scope=ctxt.Scope.EXPRESSION)
         )
-        string += self.build_children(
-            context, indent=True, sep="\n" if context.ui else ""
+        writer.write(string)
+        self.write_children(
+            writer, context, indent=True, sep="\n" if context.ui else ""
         )
-        return string + "}\n"
+        writer.write("}\n")
 
 
 class _Else(node.ParentNode):
     @override
-    def build(self, context: ctxt.Context) -> str:
-        string = "else\n{\n"
-        string += self.build_children(
-            context, indent=True, sep="\n" if context.ui else ""
+    def write(self, writer: node.Writer, context: ctxt.Context) -> None:
+        writer.write("else\n{\n")
+        self.write_children(
+            writer, context, indent=True, sep="\n" if context.ui else ""
         )
-        return string + "}\n"
+        writer.write("}\n")
 
 
 class IfBlock(node.ParentNode):
@@ -72,10 +73,11 @@ class IfBlock(node.ParentNode):
         return self
 
     @override
-    def build(self, context: ctxt.Context) -> str:
+    def write(self, writer: node.Writer, context: ctxt.Context) -> None:
         if context.scope == ctxt.Scope.STATEMENT:
-            return self.build_children(context)
-        return user_error.expected_scope(ctxt.Scope.STATEMENT)
+            self.write_children(writer, context)
+        else:
+            writer.write(user_error.expected_scope(ctxt.Scope.STATEMENT))
 
 
 def make_if_block(
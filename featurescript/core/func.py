@@ -3,7 +3,6 @@ from __future__ import annotations
 from typing import Iterable, Self, override
 import warnings
 import enum as std_enum
-from onshape_api.utils import str_utils
 from featurescript.base.expr import cast_to_expr, expr_or_stmt
 from featurescript.core import param, utils, func
 from featurescript.base import ctxt, expr, node, user_error
@@ -83,19 +82,19 @@ class _Callable(node.ParentNode, expr.Expression):
         return func.Call(self.name, *self._get_arguments(arg_overrides))
 
     @override
-    def build(self, context: ctxt.Context) -> str:
+    def write(self, writer: node.Writer, context: ctxt.Context) -> None:
         if context.scope == ctxt.Scope.TOP:
-            return self._build_callable(context)
-        return self.__call__().run_build(context)
+            self._write_callable(writer, context)
+        else:
+            self.__call__().run_write(writer, context)
 
-    def _build_callable(self, context: ctxt.Context) -> str:
-        string = self._build_header(context)
+    def _write_callable(self, writer: node.Writer, context: ctxt.Context) -> None:
+        writer.write(self._build_header(context))
         sep = "\n" if context.ui else ""
-        string += self.build_children(
-            context, indent=True, sep=sep, scope=ctxt.Scope.STATEMENT
+        self.write_children(
+            writer, context, indent=True, sep=sep, scope=ctxt.Scope.STATEMENT
         )
-        string += self._build_footer()
-        return string
+        writer.write(self._build_footer())
 
     def _build_header(self, context: ctxt.Context) -> str:
         string = self._get_start()
@@ -209,10 +208,10 @@ class UiPredicate(Predicate):
         return super().add(group)
 
     @override
-    def build(self, context: ctxt.Context) -> str:
+    def write(self, writer: node.Writer, context: ctxt.Context) -> None:
         if context.scope == context.scope.TOP:
             context.ui = True
-        return super().build(context)
+        super().write(writer, context)
 
 
 class _UiTestPredicateCall(func.Call):
@@ -262,14 +261,17 @@ class UiTestPredicate(Predicate, expr.Expression):
         return _UiTestPredicateCall(self, *self._get_arguments(arg_overrides))
 
     @override
-    def build(self, context: ctxt.Context) -> str:
+    def write(self, writer: node.Writer, context: ctxt.Context) -> None:
         if context.scope == ctxt.Scope.TOP:
-            return self._build_ui_test_predicate(context)
-        return self.__call__().run_build(context)
+            self._write_ui_test_predicate(writer, context)
+        else:
+            self.__call__().run_write(writer, context)
 
-    def _build_ui_test_predicate(self, context: ctxt.Context) -> str:
-        """Builds the predicate, adding the non-inlined version of each call before each expression as appropriate."""
-        string = self._build_header(context)
+    def _write_ui_test_predicate(
+        self, writer: node.Writer, context: ctxt.Context
+    ) -> None:
+        """Writes the predicate, adding the non-inlined version of each call before each expression as appropriate."""
+        writer.write(self._build_header(context))
 
         context.scope = ctxt.Scope.STATEMENT
         context.test_predicate = True
@@ -277,18 +279,16 @@ class UiTestPredicate(Predicate, expr.Expression):
         context.test_predicate = False
         standard_expr = self.build_children(context)
 
+        writer.indent()
         if standard_expr == inlined_expr:
-            string += str_utils.indent(standard_expr)
+            writer.write(standard_expr)
         else:
-            string += str_utils.indent(
-                "/* "
-                # Build standard_expr again as expression (can't be expr first time due to comparison)
-                + self.build_children(context, scope=ctxt.Scope.EXPRESSION)
-                + " */\n"
-                + inlined_expr
-            )
-        string += self._build_footer()
-        return string
+            writer.write("/* ")
+            # Build standard_expr again as expression (can't be expr first time due to comparison)
+            self.write_children(writer, context, scope=ctxt.Scope.EXPRESSION)
+            writer.write(" */\n" + inlined_expr)
+        writer.dedent()
+        writer.write(self._build_footer())
 
 
 def ui_predicate_call(name: str, suffix: str = "Predicate") -> Call:
@@ -1,5 +1,4 @@
-"""Defines a command line parser for the `fs` command.
-"""
+"""Defines a command line parser for the `fs` command."""
 
 import argparse
 
@@ -41,6 +40,18 @@ def parse_args() -> argparse.Namespace:
     build_parser.add_argument(
         "-p", "--push", action="store_true", help="push code to Onshape after building"
     )
+    build_parser.add_argument(
+        "--full",
+        action="store_true",
+        help="rebuild every module, including modules which haven't changed since the last build",
+    )
+    build_parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="the number of processes to build modules in, or 0 to use one per CPU",
+    )
 
     push_parser = subparsers.add_parser(
         "push",
@@ -66,21 +77,21 @@ def main():
         manager.clean(config)
         return
 
-    api = key_api.make_key_api()
-    command_line_manager = manager.CommandLineManager(config, api)
-
-    if args.action == "update-versions":
-        command_line_manager.update_versions()
-        if args.push:
-            command_line_manager.push()
-    elif args.action == "build":
-        command_line_manager.build()
-        if args.push:
-            command_line_manager.push()
-    elif args.action == "pull":
-        command_line_manager.pull(args.force)
-    elif args.action == "push":
-        command_line_manager.push(args.force)
+    with key_api.make_key_api() as api:
+        command_line_manager = manager.CommandLineManager(config, api)
+
+        if args.action == "update-versions":
+            command_line_manager.update_versions()
+            if args.push:
+                command_line_manager.push()
+        elif args.action == "build":
+            command_line_manager.build(args.full, args.jobs)
+            if args.push:
+                command_line_manager.push()
+        elif args.action == "pull":
+            command_line_manager.pull(args.force)
+        elif args.action == "push":
+            command_line_manager.push(args.force)
 
 
 if __name__ == "__main__":
@@ -1,20 +1,25 @@
-from typing import Callable
+from typing import Callable, Iterator
+import dataclasses
 import functools
 import importlib
 import importlib.util
+import itertools
+import os
+import pathlib
 import re
 import shutil
+import traceback
+import types
 from concurrent import futures
 
 from featurescript.base import ctxt, studio
-from featurescript import conf
+from featurescript import build_cache, conf
 from featurescript.feature_studio import LocalFeatureStudio, get_feature_studios
 from onshape_api import api_base
 from onshape_api.endpoints import feature_studios
 from onshape_api.endpoints.feature_studios import create_feature_studio
-from onshape_api.endpoints.std_versions import get_latest_std_version
-from onshape_api.paths.paths import ElementPath
-from robot_code.documents import BACKEND
+from onshape_api.endpoints.std_versions import StdVersionCache
+from onshape_api.paths.paths import ElementPath, InstancePath
 
 OUTDATED_VERSION_MATCH: re.Pattern[str] = re.compile(
     r'version : "(\d{2,7})\.0"|FeatureScript (\d{2,7});'
@@ -37,6 +42,10 @@ class CommandLineManager:
         # A dict mapping elementIds to feature studios
         self.curr_data: conf.FileData = self.config.read()
         self.conflict = False
+        # Runs are short, so refresh a stale list up front rather than in the background
+        self.std_versions = StdVersionCache(
+            storage_path=self.config.std_versions_path, refresh_in_background=False
+        )
 
     def _finish(self) -> None:
         self.config.write(self.curr_data)
@@ -201,7 +210,7 @@ class CommandLineManager:
         return studio_to_push
 
     def update_versions(self) -> None:
-        std_version = get_latest_std_version(self.api)
+        std_version = self.std_versions.get_latest_std_version(self.api)
         modified = 0
         for id, studio in self.curr_data.items():
             contents = self.config.read_file(studio.name)
@@ -235,61 +244,206 @@ class CommandLineManager:
 
         return replace_number
 
-    def build(self) -> None:
-        std_version = get_latest_std_version(self.api)
-        paths = self.config.code_gen_path.rglob("**/*.py")
+    def build(self, full: bool = False, jobs: int = 1) -> None:
+        """Builds every studio under code_gen_path.
+
+        Modules which haven't changed since they were last built are skipped, see build_cache.
+        The remaining modules are built in parallel, but their output is always saved and reported in path order.
+
+        Args:
+            full: True to build every module, even if it hasn't changed.
+            jobs: The max number of processes to build modules in. If 0, one process is used per CPU.
+
+        Throws:
+            ValueError: If any module failed to build. The output of every other module is still saved.
+        """
+        std_version = self.std_versions.get_latest_std_version(self.api)
+        paths = sorted(self.config.code_gen_path.rglob("**/*.py"))
+        cache = build_cache.BuildCache(self.config.build_cache_path)
+        fingerprinter = build_cache.Fingerprinter(files=cache.files)
         count = 0
+        skipped = 0
+        fingerprints: dict[pathlib.Path, str] = {}
         for path in paths:
-            spec = importlib.util.spec_from_file_location(path.stem, path)
-            if spec is None or spec.loader is None:
-                raise ValueError("Failed to open {}. Aborting.".format(path.stem))
-            module = importlib.util.__loader__.create_module(spec)
-            if module is None:
-                raise ValueError("Failed to initialize {}. Aborting.".format(path.stem))
-            spec.loader.exec_module(module)
-
-            for cls in vars(module).values():
-                if isinstance(cls, studio.Studio):
-                    if self._send_code(cls, std_version):
-                        count += 1
+            fingerprint = fingerprinter.fingerprint(path, std_version)
+            studios = None if full else cache.get_studios(path.as_posix(), fingerprint)
+            # Output may have been deleted, pulled over, or edited since the last build
+            if studios is not None and all(
+                self._is_built(name, digest) for name, digest in studios.items()
+            ):
+                count += len(studios)
+                skipped += 1
+                continue
+            fingerprints[path] = fingerprint
+
+        failures: list[ModuleBuild] = []
+        # Studios whose code changed, as (module key, studio name, code)
+        changed: list[tuple[str, str, str]] = []
+        built: dict[pathlib.Path, ModuleBuild] = {}
+        for module_build in build_modules(list(fingerprints), std_version, jobs):
+            key = module_build.path.as_posix()
+            if module_build.error is not None:
+                failures.append(module_build)
+                cache.remove(key)
+                continue
+
+            built[module_build.path] = module_build
+            for studio_name, code in module_build.studios:
+                if self.config.read_file(studio_name) == code:
+                    print("{}: Build resulted in no changes.".format(studio_name))
+                    count += 1
+                else:
+                    changed.append((key, studio_name, code))
+
+        # The build document is only listed once, however many studios changed
+        failed_modules = set()
+        if changed:
+            studios = self._get_build_studios(
+                [studio_name for _, studio_name, _ in changed]
+            )
+            if studios is None:
+                failed_modules.update(key for key, _, _ in changed)
+            else:
+                for _, studio_name, code in changed:
+                    self._save_studio(studios[studio_name], code)
+                    count += 1
+
+        for path, module_build in built.items():
+            key = path.as_posix()
+            if key in failed_modules:
+                cache.remove(key)
+            else:
+                cache.set(key, fingerprints[path], module_build.studios)
 
         print("Built {} feature studios.".format(count))
+        if skipped > 0:
+            print("Skipped {} unchanged modules.".format(skipped))
         self._finish()
+        # Saved last so the cache never refers to output which wasn't recorded
+        cache.save()
 
-    def _send_code(self, studio: studio.Studio, std_version: str) -> bool:
-        code = studio.build(ctxt.Context(std_version))
-
-        curr = self.config.read_file(studio.studio_name)
-        if curr == code:
-            print("{}: Build resulted in no changes.".format(studio.studio_name))
-            return True
+        for failure in failures:
+            print("Failed to build {}:\n{}".format(failure.path, failure.error))
+        if failures:
+            raise ValueError("Failed to build {} modules.".format(len(failures)))
 
-        print("{}: Successfully built.".format(studio.studio_name))
-        document = BACKEND
+    def _get_build_document(self) -> InstancePath | None:
+        document = self.config.documents.get(self.config.build_document, None)
         if document is None:
             print(
-                "{}: Failed to find document in config.json named {}. Valid names are: {}".format(
-                    studio.studio_name,
+                "Failed to find document in config.json named {}. Valid names are: {}".format(
+                    self.config.build_document,
                     ", ".join(self.config.documents.keys()),
                 )
             )
-            return False
+        return document
+
+    def _is_built(self, studio_name: str, digest: str) -> bool:
+        """Returns True if studio_name still contains the code it was last built with."""
+        code = self.config.read_file(studio_name)
+        return code is not None and build_cache.hash_code(code) == digest
+
+    def _get_build_studios(
+        self, studio_names: list[str]
+    ) -> dict[str, LocalFeatureStudio] | None:
+        """Returns a dict mapping the names of the studios in the build document to feature studios.
+
+        The document is listed once, and any of studio_names which don't exist yet are created concurrently.
+
+        Returns None if the build document isn't in config.json.
+        """
+        document = self._get_build_document()
+        if document is None:
+            return None
+
         studios = get_feature_studios(self.api, document)
-        feature_studio = studios.get(studio.studio_name, None)
-
-        if feature_studio is None:
-            result = create_feature_studio(self.api, document, studio.studio_name)
-            feature_studio = LocalFeatureStudio(
-                result["name"],
-                ElementPath.from_path(document, result["id"]),
-                result["microversionId"],
-                True,
-            )
+        missing = [name for name in dict.fromkeys(studio_names) if name not in studios]
+        with futures.ThreadPoolExecutor() as executor:
+            for result in executor.map(
+                functools.partial(create_feature_studio, self.api, document), missing
+            ):
+                print("{}: Created feature studio.".format(result["name"]))
+                studios[result["name"]] = LocalFeatureStudio(
+                    result["name"],
+                    ElementPath.from_path(document, result["id"]),
+                    result["microversionId"],
+                    True,
+                )
+        return studios
+
+    def _save_studio(self, feature_studio: LocalFeatureStudio, code: str) -> None:
+        print("{}: Successfully built.".format(feature_studio.name))
         feature_studio.generated = True
         feature_studio.modified = True
         self.curr_data[feature_studio.path.element_id] = feature_studio
         self.config.write_file(feature_studio.name, code)
-        return True
+
+
+@dataclasses.dataclass
+class ModuleBuild:
+    """The result of building a generator module.
+
+    Attributes:
+        path: The path to the module.
+        studios: The name and code of each studio the module defines, in the order they are defined.
+        error: The traceback of the exception the module threw, or None if it was built successfully.
+    """
+
+    path: pathlib.Path
+    studios: list[tuple[str, str]] = dataclasses.field(default_factory=list)
+    error: str | None = None
+
+    @property
+    def studio_names(self) -> list[str]:
+        return [studio_name for studio_name, _ in self.studios]
+
+
+def load_module(path: pathlib.Path) -> types.ModuleType:
+    """Imports and runs the generator module at path."""
+    spec = importlib.util.spec_from_file_location(path.stem, path)
+    if spec is None or spec.loader is None:
+        raise ValueError("Failed to open {}. Aborting.".format(path.stem))
+    module = importlib.util.__loader__.create_module(spec)
+    if module is None:
+        raise ValueError("Failed to initialize {}. Aborting.".format(path.stem))
+    spec.loader.exec_module(module)
+    return module
+
+
+def build_module(path: pathlib.Path, std_version: str) -> ModuleBuild:
+    """Builds every studio defined by the generator module at path.
+
+    Studios can't be sent between processes, so their code is returned instead.
+    """
+    try:
+        module = load_module(path)
+        studios = [
+            (value.studio_name, value.build(ctxt.Context(std_version)))
+            for value in vars(module).values()
+            if isinstance(value, studio.Studio)
+        ]
+    except Exception:
+        return ModuleBuild(path, error=traceback.format_exc())
+    return ModuleBuild(path, studios)
+
+
+def build_modules(
+    paths: list[pathlib.Path], std_version: str, jobs: int = 1
+) -> Iterator[ModuleBuild]:
+    """Builds each module in paths, yielding the results in the same order as paths.
+
+    Args:
+        jobs: The max number of processes to build modules in. If 0, one process is used per CPU.
+            If 1, modules are built in the current process.
+    """
+    workers = min(jobs or os.cpu_count() or 1, len(paths))
+    if workers <= 1:
+        yield from (build_module(path, std_version) for path in paths)
+        return
+    with futures.ProcessPoolExecutor(workers) as executor:
+        yield from executor.map(
+            build_module, paths, itertools.repeat(std_version, len(paths))
+        )
 
 
 def clean(config: conf.Config) -> None:
@@ -170,16 +170,19 @@ class Enum(node.ParentNode, expr.Expression, dict[str, V], Generic[V]):
         return super().add(value)
 
     @override
-    def build(self, context: ctxt.Context) -> str:
+    def write(self, writer: node.Writer, context: ctxt.Context) -> None:
         if context.scope == ctxt.Scope.TOP:
             context.enum = True
             context.scope = ctxt.Scope.EXPRESSION
-            string = utils.export(self.export) + "enum {} \n{{\n".format(self.name)
-            string += self.build_children(context, sep=",\n", indent=True)
-            return string + "\n}\n"
+            writer.write(utils.export(self.export) + "enum {} \n{{\n".format(self.name))
+            self.write_children(writer, context, sep=",\n", indent=True)
+            writer.write("\n}\n")
         elif context.scope == ctxt.Scope.EXPRESSION:
-            return utils.definition(self.default_parameter_name).run_build(context)
-        return user_error.expected_scope(ctxt.Scope.TOP, ctxt.Scope.EXPRESSION)
+            utils.definition(self.default_parameter_name).run_write(writer, context)
+        else:
+            writer.write(
+                user_error.expected_scope(ctxt.Scope.TOP, ctxt.Scope.EXPRESSION)
+            )
 
 
 class EnumBuilder:
@@ -254,21 +254,17 @@ class ParameterGroup(node.ParentNode):
         )
 
     @override
-    def build(self, context: ctxt.Context) -> str:
+    def write(self, writer: node.Writer, context: ctxt.Context) -> None:
         if not context.ui:
             warnings.warn("UI parameter added to non-UI predicate")
         if len(self.children) == 0:
             warnings.warn("Empty parameter group not permitted")
-        return "".join(
-            [
-                self.map.run_build(context, ctxt.Scope.EXPRESSION),
-                "{\n",
-                self.build_children(
-                    context, sep="\n", indent=True, scope=ctxt.Scope.STATEMENT
-                ),
-                "}\n",
-            ]
+        self.map.run_write(writer, context, ctxt.Scope.EXPRESSION)
+        writer.write("{\n")
+        self.write_children(
+            writer, context, sep="\n", indent=True, scope=ctxt.Scope.STATEMENT
         )
+        writer.write("}\n")
 
 
 class DrivenParameterGroup(node.ParentNode):
@@ -315,18 +311,16 @@ class DrivenParameterGroup(node.ParentNode):
         return self
 
     @override
-    def build(self, context: ctxt.Context) -> str:
+    def write(self, writer: node.Writer, context: ctxt.Context) -> None:
         if self.drive_group_test is None:
-            string = self.boolean.run_build(context) + "\n"
+            self.boolean.run_write(writer, context)
+            writer.write("\n")
             test = utils.definition(self.parameter_name)
         else:
-            string = (
-                control.IfBlock(self.drive_group_test)
-                .add(self.boolean)
-                .run_build(context)
+            control.IfBlock(self.drive_group_test).add(self.boolean).run_write(
+                writer, context
             )
             test = ~expr.add_parens(self.drive_group_test) | utils.definition(
                 self.parameter_name
             )
-        string += control.IfBlock(test).add(self.group).run_build(context)
-        return string
+        control.IfBlock(test).add(self.group).run_write(writer, context)
@@ -1,3 +1,7 @@
 from .api_base import *
 from .key_api import *
 from .oauth_api import *
+from .retry import *
+from .cache import *
+from .async_api import *
+from .connection_pool import *
@@ -1,23 +1,40 @@
 from abc import ABC, abstractmethod
 import logging
-from typing import Any, NotRequired, TypedDict, Unpack
+import time
+from typing import Any, NotRequired, Self, TypedDict, Unpack
 import os
 import http
 
+import requests
+
+from onshape_api.api.cache import DiskStore, MemoryStore, ResponseCache, make_response
+from onshape_api.api.connection_pool import ConnectionPool
+from onshape_api.api.retry import RetryPolicy
+from onshape_api.api.send_policy import Action, SendPolicy
+
 logging.basicConfig(level=logging.INFO)
 
-__all__ = ["Api"]
+__all__ = ["Api", "get_shared_api_args"]
 
 
 class ApiArgs(TypedDict):
     base_url: NotRequired[str]
     logging: NotRequired[bool]
     version: NotRequired[int | None]
+    pool_connections: NotRequired[int]
+    pool_maxsize: NotRequired[int]
+    idle_timeout: NotRequired[float | None]
+    retry_policy: NotRequired[RetryPolicy]
+    rate_limit: NotRequired[float | None]
+    cache: NotRequired[ResponseCache | None]
+    pool: NotRequired[ConnectionPool | None]
+    send_policy: NotRequired[SendPolicy | None]
 
 
 class ApiQueryArgs(TypedDict):
     query: NotRequired[str | dict]
     headers: NotRequired[dict[str, str]]
+    idempotent: NotRequired[bool]
 
 
 def get_api_base_args() -> ApiArgs:
@@ -35,19 +52,85 @@ def get_api_base_args() -> ApiArgs:
         kwargs["version"] = int(temp)
     if base_url := os.getenv("API_BASE_URL"):
         kwargs["base_url"] = base_url
+
+    if temp := os.getenv("API_POOL_CONNECTIONS"):
+        kwargs["pool_connections"] = int(temp)
+    if temp := os.getenv("API_POOL_MAXSIZE"):
+        kwargs["pool_maxsize"] = int(temp)
+    if temp := os.getenv("API_IDLE_TIMEOUT"):
+        kwargs["idle_timeout"] = float(temp)
+
+    if temp := os.getenv("API_MAX_RETRIES"):
+        kwargs["retry_policy"] = RetryPolicy(max_retries=int(temp))
+    if temp := os.getenv("API_RATE_LIMIT"):
+        kwargs["rate_limit"] = float(temp)
     return kwargs
 
 
+def get_shared_api_args() -> ApiArgs:
+    """Constructs ApiArgs from environment variables, with a pool and send policy shared by every Api using them.
+
+    Used by servers which construct an Api for each request (e.g. for each user), so that every request reuses
+    the same connections and backs off together when Onshape throttles one of them.
+    """
+    kwargs = get_api_base_args()
+    enable_logging = kwargs.get("logging", False)
+    pool_args = dict(
+        (name, kwargs.pop(name))
+        for name in ["pool_connections", "pool_maxsize", "idle_timeout"]
+        if name in kwargs
+    )
+    kwargs["pool"] = ConnectionPool(**pool_args, logging=enable_logging)
+    kwargs["send_policy"] = SendPolicy(
+        kwargs.pop("retry_policy", None),
+        kwargs.pop("rate_limit", None),
+        logging=enable_logging,
+    )
+    return kwargs
+
+
+def get_api_cache() -> ResponseCache | None:
+    """Constructs a ResponseCache from environment variables, or returns None if caching isn't enabled.
+
+    Cached responses are served without checking permissions, so the cache should only be used by Apis
+    authenticated with a single set of credentials (e.g. API keys), never by Apis acting on behalf of many users.
+    """
+    cache_size = os.getenv("API_CACHE_SIZE")
+    cache_dir = os.getenv("API_CACHE_DIR")
+    if not cache_size and not cache_dir:
+        return None
+    stores = [MemoryStore(int(cache_size)) if cache_size else MemoryStore()]
+    if cache_dir:
+        stores.append(DiskStore(cache_dir))
+    return ResponseCache(*stores)
+
+
 class Api(ABC):
     """
     Provides generic access to the Onshape REST API.
 
     An instance of this class may be used with any of the endpoints in the endpoints folder.
+    Every request made through an instance shares a single pool of keep-alive connections,
+    so an instance should be reused (and shared between threads) rather than recreated for each call.
+    Apis which can't be reused, e.g. one per user, should share a ConnectionPool and SendPolicy instead.
+
+    Requests which are throttled or hit a temporary outage are retried according to a RetryPolicy.
+    Every thread using an instance draws from the same TokenBucket, so when Onshape throttles one request
+    the others back off as well rather than stampeding.
+
+    Temporary redirects are followed, and the host each document is redirected to is remembered
+    so later requests for that document are sent there directly.
+
+    If a ResponseCache is given, GET requests for versions and microversions are served from it,
+    and other GET requests are revalidated using their ETag.
 
     Attributes:
         _base_url: The base url to use.
         _logging: Whether to log or not.
         _path_base: The /api/v portion of the url.
+        _pool: The pool of connections used to send requests.
+        cache: The cache used for GET requests, or None.
+        metrics: Counts of the retries made and the time spent throttled.
     """
 
     def __init__(
@@ -55,6 +138,14 @@ class Api(ABC):
         base_url: str = "https://cad.onshape.com",
         logging: bool = False,
         version: int | None = 8,
+        pool_connections: int = 10,
+        pool_maxsize: int = 32,
+        idle_timeout: float | None = 60,
+        retry_policy: RetryPolicy | None = None,
+        rate_limit: float | None = None,
+        cache: ResponseCache | None = None,
+        pool: ConnectionPool | None = None,
+        send_policy: SendPolicy | None = None,
     ):
         """
         Args:
@@ -63,12 +154,122 @@ class Api(ABC):
             version: The version to use.
                 If the version is None, no version is specified in the url of API calls.
                 Note this does not result in using the latest version of the API automatically.
+            pool_connections: The number of hosts to keep a connection pool for.
+            pool_maxsize: The max number of connections to keep open to a single host.
+                Should be at least the number of threads making calls concurrently.
+            idle_timeout: The number of seconds the pool may sit unused before its connections are discarded.
+                Avoids reusing connections which Onshape has already dropped. If None, connections are kept indefinitely.
+            retry_policy: The policy used to retry failed requests. Defaults to RetryPolicy().
+            rate_limit: The max number of requests to send per second. If None, requests are only delayed after Onshape throttles a request.
+            cache: The cache to use for GET requests. If None, responses aren't cached.
+                Should only be shared with Apis authenticated as the same user.
+            pool: A pool shared with other Apis. If given, pool_connections, pool_maxsize, and idle_timeout are ignored,
+                and closing the Api leaves the pool open.
+            send_policy: A send policy shared with other Apis, so they are throttled together.
+                If given, retry_policy, rate_limit, and cache are ignored.
         """
         self._logging = logging
         self._base_url = base_url + "/api"
         if version:
             self._base_url += "/v{}".format(version)
 
+        self._owns_pool = pool is None
+        self._pool = pool or ConnectionPool(
+            pool_connections, pool_maxsize, idle_timeout, logging
+        )
+
+        self._send_policy = send_policy or SendPolicy(
+            retry_policy, rate_limit, cache, logging
+        )
+        self.cache = self._send_policy.cache
+        self.metrics = self._send_policy.metrics
+
+    @property
+    @abstractmethod
+    def session(self) -> requests.Session:
+        """The session used to issue requests.
+
+        Implementations should pass the session to _mount once so it uses the shared connection pool.
+        """
+        ...
+
+    def _mount(self, session: requests.Session) -> requests.Session:
+        """Mounts the connection pool onto session."""
+        return self._pool.mount(session)
+
+    def _prepare_headers(
+        self, method: http.HTTPMethod, url: str, headers: dict[str, str]
+    ) -> dict[str, str]:
+        """Returns the headers to send with a request to url.
+
+        Called before every attempt, so implementations may sign each attempt separately.
+        """
+        return headers
+
+    def _send(
+        self,
+        method: http.HTTPMethod,
+        url: str,
+        headers: dict[str, str],
+        idempotent: bool | None = None,
+        **kwargs: Any,
+    ) -> requests.Response:
+        """Sends a request using the pooled session, retrying it according to the retry policy.
+
+        Args:
+            idempotent: Whether the request is safe to retry. If None, the method is used to decide.
+            **kwargs: Extra arguments to pass to requests.Session.request.
+
+        Returns:
+            The final response, which may still be unsuccessful.
+        """
+        state = self._send_policy.start(method, url, headers, idempotent)
+        if state.entry is not None and state.fresh:
+            return make_response(state.url, state.entry)
+        while True:
+            wait = state.reserve()
+            if wait > 0:
+                time.sleep(wait)
+            self._pool.expire_idle_connections()
+
+            try:
+                res = self.session.request(
+                    method,
+                    state.url,
+                    # Sign against the current url since redirects change the host
+                    headers=self._prepare_headers(method, state.url, state.headers),
+                    allow_redirects=False,
+                    **kwargs,
+                )
+            except requests.ConnectionError as error:
+                state.on_connection_error(error)
+            else:
+                action = state.on_response(res.status_code, res.headers, res.content)
+                if action == Action.RETURN:
+                    return res
+                # Release the connection back to the pool
+                res.close()
+                if action == Action.USE_CACHED:
+                    assert state.entry is not None
+                    return make_response(state.url, state.entry)
+                if action == Action.REDIRECT:
+                    continue
+            time.sleep(state.delay)
+
+    def close(self) -> None:
+        """Closes every connection in the pool, unless the pool is shared with other Apis.
+
+        The instance may still be used afterwards; new connections are opened as needed.
+        """
+        if self._owns_pool:
+            self.session.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
     @abstractmethod
     def _request(
         self,
@@ -77,6 +278,7 @@ class Api(ABC):
         query: dict | str = "",
         body: dict | str = "",
         headers: dict[str, str] = {},
+        idempotent: bool | None = None,
     ) -> Any:
         """
         Issues a request to Onshape.
@@ -86,6 +288,7 @@ class Api(ABC):
             query: Query parameters for the request.
             body: A body for the POST request.
             headers: Extra headers to add to the request.
+            idempotent: Whether the request may be retried. If None, only idempotent methods (e.g. GET) are retried.
 
         Returns:
             The response from Onshape parsed as json, or the Response itself.
@@ -0,0 +1,349 @@
+"""An asyncio based client for the Onshape API.
+
+Unlike Api, requests made through an AsyncApi don't block, so a single thread can have many calls in flight at once.
+The async variants of endpoints (e.g. pull_code_async) accept an AsyncApi.
+"""
+
+from __future__ import annotations
+from abc import ABC, abstractmethod
+import asyncio
+import http
+import json
+import logging
+import os
+import time
+from typing import Any, Self, Unpack, override
+from urllib import parse
+
+import aiohttp
+from requests_oauthlib import OAuth2Session
+
+from onshape_api import exceptions
+from onshape_api.api.api_base import (
+    ApiArgs,
+    ApiQueryArgs,
+    get_api_base_args,
+    get_api_cache,
+)
+from onshape_api.api.cache import ResponseCache
+from onshape_api.api.connection_pool import ConnectionPool
+from onshape_api.api.key_api import make_headers
+from onshape_api.api.retry import RetryPolicy
+from onshape_api.api.send_policy import Action, SendPolicy
+from onshape_api.utils import env_utils
+
+__all__ = [
+    "AsyncApi",
+    "AsyncKeyApi",
+    "AsyncOAuthApi",
+    "make_async_key_api",
+    "make_async_oauth_api",
+]
+
+
+class AsyncApi(ABC):
+    """
+    Provides generic asynchronous access to the Onshape REST API.
+
+    Mirrors Api; an instance may be used with any of the async endpoints in the endpoints folder.
+    The underlying aiohttp session is bound to the event loop it is first used in,
+    so an instance should be used with a single event loop and closed before that loop exits.
+
+    Requests are retried, rate limited, redirected, and cached in the same way as Api.
+
+    Attributes:
+        _base_url: The base url to use.
+        _logging: Whether to log or not.
+        cache: The cache used for GET requests, or None.
+        metrics: Counts of the retries made and the time spent throttled.
+    """
+
+    def __init__(
+        self,
+        base_url: str = "https://cad.onshape.com",
+        logging: bool = False,
+        version: int | None = 8,
+        pool_connections: int = 10,
+        pool_maxsize: int = 32,
+        idle_timeout: float | None = 60,
+        retry_policy: RetryPolicy | None = None,
+        rate_limit: float | None = None,
+        cache: ResponseCache | None = None,
+        pool: ConnectionPool | None = None,
+        send_policy: SendPolicy | None = None,
+    ):
+        """
+        Args:
+            base_url: The base url to use.
+            logging: Whether to enable logging.
+            version: The version to use. If None, no version is specified in the url of API calls.
+            pool_connections: The number of hosts to keep connections open to.
+            pool_maxsize: The max number of concurrent connections to a single host.
+                Additional requests wait for a free connection.
+            idle_timeout: The number of seconds an unused connection is kept open for.
+            retry_policy: The policy used to retry failed requests. Defaults to RetryPolicy().
+            rate_limit: The max number of requests to send per second.
+            cache: The cache to use for GET requests. If None, responses aren't cached.
+            pool: Ignored, since aiohttp connections are bound to an event loop and can't be shared with an Api.
+            send_policy: A send policy shared with other Apis, so they are throttled together.
+                If given, retry_policy, rate_limit, and cache are ignored.
+        """
+        self._logging = logging
+        self._base_url = base_url + "/api"
+        if version:
+            self._base_url += "/v{}".format(version)
+
+        self._pool_connections = pool_connections
+        self._pool_maxsize = pool_maxsize
+        self._idle_timeout = idle_timeout
+        self._session: aiohttp.ClientSession | None = None
+
+        self._send_policy = send_policy or SendPolicy(
+            retry_policy, rate_limit, cache, logging
+        )
+        self.cache = self._send_policy.cache
+        self.metrics = self._send_policy.metrics
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """The session used to issue requests. Created on first use since it requires a running event loop."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self._pool_connections * self._pool_maxsize,
+                limit_per_host=self._pool_maxsize,
+                keepalive_timeout=self._idle_timeout,
+            )
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+
+    @abstractmethod
+    async def _make_headers(
+        self, method: http.HTTPMethod, url: str, headers: dict[str, str]
+    ) -> dict[str, str]:
+        """Returns the headers needed to authenticate a request to url.
+
+        Args:
+            headers: Extra headers to add to the request.
+        """
+        ...
+
+    async def _request(
+        self,
+        method: http.HTTPMethod,
+        path: str,
+        query: dict | str = "",
+        body: dict | str = "",
+        headers: dict[str, str] = {},
+        idempotent: bool | None = None,
+    ) -> Any:
+        """
+        Issues a request to Onshape.
+        Args:
+            method: An HTTP method.
+            path: A path for the request, e.g. "documents/...".
+            query: Query parameters for the request.
+            body: A body for the POST request.
+            headers: Extra headers to add to the request.
+            idempotent: Whether the request may be retried. If None, only idempotent methods (e.g. GET) are retried.
+
+        Returns:
+            The response from Onshape parsed as json, or the text of the response if it isn't json.
+
+        Throws:
+            ApiException: If Onshape returns an invalid response.
+        """
+        query_str = query if isinstance(query, str) else parse.urlencode(query)
+        body_str = body if isinstance(body, str) else json.dumps(body)
+
+        url = self._base_url + path + "?" + query_str
+
+        if self._logging:
+            logging.info("request url: " + url)
+            if len(body) > 0:
+                logging.info(body)
+
+        status, text = await self._send(method, url, headers, body_str, idempotent)
+
+        if status.is_success:
+            if self._logging:
+                logging.info("request succeeded, details: " + text)
+        else:
+            if self._logging:
+                logging.error("request failed, details: " + text)
+            raise exceptions.ApiError(text, status)
+
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError:
+            return text
+
+    async def _send(
+        self,
+        method: http.HTTPMethod,
+        url: str,
+        headers: dict[str, str],
+        body: str,
+        idempotent: bool | None,
+    ) -> tuple[http.HTTPStatus, str]:
+        """Sends a request, retrying it according to the retry policy.
+
+        Returns the status and text of the final response.
+        """
+        state = self._send_policy.start(method, url, headers, idempotent)
+        if state.entry is not None and state.fresh:
+            return http.HTTPStatus.OK, state.entry.content.decode()
+        while True:
+            wait = state.reserve()
+            if wait > 0:
+                await asyncio.sleep(wait)
+
+            try:
+                async with self.session.request(
+                    method,
+                    state.url,
+                    headers=await self._make_headers(method, state.url, state.headers),
+                    data=body,
+                    allow_redirects=False,
+                ) as res:
+                    content = await res.read()
+                    text = await res.text()
+                    status = http.HTTPStatus(res.status)
+                    response_headers = res.headers
+            except aiohttp.ClientConnectionError as error:
+                state.on_connection_error(error)
+            else:
+                action = state.on_response(status, response_headers, content)
+                if action == Action.RETURN:
+                    return status, text
+                if action == Action.USE_CACHED:
+                    assert state.entry is not None
+                    return http.HTTPStatus.OK, state.entry.content.decode()
+                if action == Action.REDIRECT:
+                    continue
+            await asyncio.sleep(state.delay)
+
+    async def get(self, path: str, **kwargs: Unpack[ApiQueryArgs]) -> Any:
+        return await self._request(http.HTTPMethod.GET, path=path, **kwargs)
+
+    async def post(
+        self, path: str, body: dict | str = "", **kwargs: Unpack[ApiQueryArgs]
+    ) -> Any:
+        return await self._request(http.HTTPMethod.POST, path, body=body, **kwargs)
+
+    async def delete(self, path: str, **kwargs: Unpack[ApiQueryArgs]) -> Any:
+        return await self._request(http.HTTPMethod.DELETE, path=path, **kwargs)
+
+    async def close(self) -> None:
+        """Closes every open connection."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
+
+
+def make_async_key_api(load_dotenv: bool = True) -> AsyncKeyApi:
+    """Constructs an AsyncKeyApi using credentials read from a .env file.
+
+    Uses the same variables as make_key_api.
+    """
+    if load_dotenv:
+        env_utils.load_env()
+    kwargs = get_api_base_args()
+    kwargs["cache"] = get_api_cache()
+    access_key = os.getenv("API_ACCESS_KEY")
+    secret_key = os.getenv("API_SECRET_KEY")
+
+    if access_key is None:
+        raise KeyError("API_ACCESS_KEY is a required env variable")
+    if secret_key is None:
+        raise KeyError("API_SECRET_KEY is a required env variable")
+
+    return AsyncKeyApi(access_key, secret_key, **kwargs)
+
+
+class AsyncKeyApi(AsyncApi):
+    """Provides asynchronous access to the Onshape API using API keys."""
+
+    def __init__(
+        self, access_key: str, secret_key: str, **kwargs: Unpack[ApiArgs]
+    ) -> None:
+        super().__init__(**kwargs)
+        self._access_key = access_key
+        self._secret_key = secret_key
+
+    @override
+    async def _make_headers(
+        self, method: http.HTTPMethod, url: str, headers: dict[str, str]
+    ) -> dict[str, str]:
+        return make_headers(method, headers, url, self._access_key, self._secret_key)
+
+
+def make_async_oauth_api(
+    oauth: OAuth2Session, load_dotenv: bool = False, **overrides: Unpack[ApiArgs]
+) -> AsyncOAuthApi:
+    """Constructs an AsyncOAuthApi using settings read from environment variables.
+
+    Args:
+        overrides: Arguments which take precedence over the environment, e.g. the result of get_shared_api_args.
+    """
+    if load_dotenv:
+        env_utils.load_env()
+    # Responses aren't cached since they may be served to other users, see get_api_cache
+    kwargs = get_api_base_args()
+    kwargs.update(overrides)
+    return AsyncOAuthApi(oauth, **kwargs)
+
+
+TOKEN_EXPIRY_MARGIN = 30
+"""The number of seconds before an OAuth token expires that it is refreshed."""
+
+
+class AsyncOAuthApi(AsyncApi):
+    """Provides asynchronous access to the Onshape API via OAuth.
+
+    The token, and the configuration used to refresh it, are read from oauth.
+    """
+
+    def __init__(self, oauth: OAuth2Session, **kwargs: Unpack[ApiArgs]):
+        super().__init__(**kwargs)
+        self.oauth = oauth
+        self._refresh_lock = asyncio.Lock()
+
+    async def _refresh_token(self) -> None:
+        """Refreshes the OAuth token if it is about to expire.
+
+        Concurrent requests wait on the same refresh rather than each refreshing the token.
+        """
+        async with self._refresh_lock:
+            expires_at = self.oauth.token.get("expires_at")
+            if (
+                expires_at is None
+                or expires_at > time.time() + TOKEN_EXPIRY_MARGIN
+                or not self.oauth.auto_refresh_url
+            ):
+                return
+            if self._logging:
+                logging.info("refreshing oauth token")
+            # refresh_token is blocking, so run it off of the event loop
+            token = await asyncio.to_thread(
+                self.oauth.refresh_token,
+                self.oauth.auto_refresh_url,
+                **self.oauth.auto_refresh_kwargs,
+            )
+            if self.oauth.token_updater:
+                self.oauth.token_updater(token)
+
+    @override
+    async def _make_headers(
+        self, method: http.HTTPMethod, url: str, headers: dict[str, str]
+    ) -> dict[str, str]:
+        await self._refresh_token()
+        req_headers = headers.copy()
+        req_headers["Content-Type"] = headers.get("Content-Type", "application/json")
+        req_headers["Authorization"] = "Bearer " + self.oauth.access_token
+        return req_headers
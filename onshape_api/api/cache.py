@@ -0,0 +1,191 @@
+"""A response cache for GET requests made to the Onshape API.
+
+Resources addressed by a version or microversion can never change, so they are served straight from the cache.
+Other resources are revalidated using their ETag, which lets Onshape reply with an empty 304 Not Modified
+instead of resending the whole response.
+
+A cache should only be shared between Apis authenticated as the same user, since permissions aren't taken into account.
+"""
+
+from __future__ import annotations
+from abc import ABC, abstractmethod
+import base64
+import collections
+import dataclasses
+import hashlib
+import json
+import pathlib
+import re
+import threading
+from typing import Mapping
+from urllib import parse
+
+import requests
+from requests import structures, utils
+
+__all__ = ["ResponseCache", "CacheStore", "MemoryStore", "DiskStore"]
+
+_IMMUTABLE_MATCH = re.compile(r"/d/[0-9a-fA-F]{24}/[vm]/[0-9a-fA-F]{24}(?=/|$)")
+
+_STORED_HEADERS = ["Content-Type", "ETag"]
+
+
+def is_immutable(url: str) -> bool:
+    """Returns True if url refers to a resource in a version or microversion."""
+    return _IMMUTABLE_MATCH.search(parse.urlparse(url).path) is not None
+
+
+@dataclasses.dataclass
+class CacheEntry:
+    """A cached response.
+
+    Attributes:
+        content: The body of the response.
+        headers: The headers of the response needed to reconstruct it.
+    """
+
+    content: bytes
+    headers: dict[str, str]
+
+    @property
+    def etag(self) -> str | None:
+        return self.headers.get("ETag")
+
+    def to_dict(self) -> dict:
+        return {
+            "content": base64.b64encode(self.content).decode(),
+            "headers": self.headers,
+        }
+
+    @staticmethod
+    def from_dict(data: dict) -> CacheEntry:
+        return CacheEntry(base64.b64decode(data["content"]), data["headers"])
+
+
+class CacheStore(ABC):
+    """A place to keep cache entries."""
+
+    @abstractmethod
+    def get(self, key: str) -> CacheEntry | None: ...
+
+    @abstractmethod
+    def set(self, key: str, entry: CacheEntry) -> None: ...
+
+
+class MemoryStore(CacheStore):
+    """A thread-safe in-memory store which evicts the least recently used entries."""
+
+    def __init__(self, max_entries: int = 512) -> None:
+        self._max_entries = max_entries
+        self._entries: collections.OrderedDict[str, CacheEntry] = (
+            collections.OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> CacheEntry | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+
+class DiskStore(CacheStore):
+    """A store which keeps each entry in a json file in a directory, allowing entries to persist between runs."""
+
+    def __init__(self, directory: pathlib.Path | str) -> None:
+        self._directory = pathlib.Path(directory)
+        self._directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str) -> pathlib.Path:
+        return self._directory / (hashlib.sha256(key.encode()).hexdigest() + ".json")
+
+    def get(self, key: str) -> CacheEntry | None:
+        path = self._path(key)
+        try:
+            return CacheEntry.from_dict(json.loads(path.read_text()))
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        path = self._path(key)
+        # Write then rename so concurrent readers never see a partial file
+        temp_path = path.with_suffix(".{}.tmp".format(threading.get_ident()))
+        temp_path.write_text(json.dumps(entry.to_dict()))
+        temp_path.replace(path)
+
+
+class ResponseCache:
+    """Caches the responses of GET requests.
+
+    Entries are looked up in each store in order, so faster stores should come first.
+    """
+
+    def __init__(self, *stores: CacheStore) -> None:
+        """
+        Args:
+            stores: The stores to use. Defaults to a single MemoryStore.
+        """
+        self._stores = list(stores) if stores else [MemoryStore()]
+
+    @staticmethod
+    def make_key(method: str, url: str) -> str:
+        """Keys an entry by the method, path, and query of a request.
+
+        The host is omitted so redirected requests share entries.
+        """
+        parsed = parse.urlparse(url)
+        return "{} {}?{}".format(method, parsed.path, parsed.query)
+
+    def lookup(self, method: str, url: str) -> tuple[CacheEntry | None, bool]:
+        """Returns a tuple containing the cached entry for a request (or None),
+        and whether the entry can be used without revalidating it."""
+        if method != "GET":
+            return None, False
+        key = self.make_key(method, url)
+        for i, store in enumerate(self._stores):
+            entry = store.get(key)
+            if entry is not None:
+                # Promote entries into the faster stores
+                for faster_store in self._stores[:i]:
+                    faster_store.set(key, entry)
+                return entry, is_immutable(url)
+        return None, False
+
+    def store(
+        self, method: str, url: str, headers: Mapping[str, str], content: bytes
+    ) -> None:
+        """Caches a successful response.
+
+        Mutable resources are only cached if they have an ETag, since they can't be revalidated otherwise.
+        """
+        if method != "GET":
+            return
+        entry = CacheEntry(
+            content,
+            dict((name, headers[name]) for name in _STORED_HEADERS if name in headers),
+        )
+        if entry.etag is None and not is_immutable(url):
+            return
+        key = self.make_key(method, url)
+        for store in self._stores:
+            store.set(key, entry)
+
+
+def make_response(url: str, entry: CacheEntry) -> requests.Response:
+    """Constructs a response to a request for url from a cache entry."""
+    response = requests.Response()
+    response.status_code = 200
+    response.reason = "OK"
+    response.headers = structures.CaseInsensitiveDict(entry.headers)
+    response.encoding = utils.get_encoding_from_headers(response.headers)
+    response._content = entry.content
+    response.url = url
+    return response
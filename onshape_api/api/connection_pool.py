@@ -0,0 +1,64 @@
+"""A pool of keep-alive connections which may be shared by many Apis."""
+
+import logging
+import threading
+import time
+
+import requests
+from requests import adapters
+
+__all__ = ["ConnectionPool"]
+
+
+class ConnectionPool:
+    """Owns the keep-alive connections used to send requests.
+
+    A pool may be shared between Apis, e.g. by a server which creates an Api for each request,
+    so that every request reuses the same connections.
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = 10,
+        pool_maxsize: int = 32,
+        idle_timeout: float | None = 60,
+        logging: bool = False,
+    ) -> None:
+        """
+        Args:
+            pool_connections: The number of hosts to keep a connection pool for.
+            pool_maxsize: The max number of connections to keep open to a single host.
+                Should be at least the number of threads making calls concurrently.
+            idle_timeout: The number of seconds the pool may sit unused before its connections are discarded.
+                Avoids reusing connections which Onshape has already dropped. If None, connections are kept indefinitely.
+        """
+        self.adapter = adapters.HTTPAdapter(
+            pool_connections=pool_connections, pool_maxsize=pool_maxsize
+        )
+        self._idle_timeout = idle_timeout
+        self._logging = logging
+        self._last_used = time.monotonic()
+        self._lock = threading.Lock()
+
+    def mount(self, session: requests.Session) -> requests.Session:
+        """Mounts the pool onto session."""
+        session.mount("https://", self.adapter)
+        session.mount("http://", self.adapter)
+        return session
+
+    def expire_idle_connections(self) -> None:
+        """Drops pooled connections if the pool has been idle for longer than idle_timeout."""
+        with self._lock:
+            now = time.monotonic()
+            if (
+                self._idle_timeout is not None
+                and now - self._last_used > self._idle_timeout
+            ):
+                if self._logging:
+                    logging.info("connection pool idle, discarding connections")
+                self.adapter.poolmanager.clear()
+            self._last_used = now
+
+    def close(self) -> None:
+        """Closes every connection in the pool. The pool may still be used afterwards."""
+        self.adapter.close()
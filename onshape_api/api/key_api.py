@@ -15,7 +15,7 @@ from urllib import parse
 import requests
 
 from onshape_api import exceptions
-from onshape_api.api.api_base import Api, ApiArgs, get_api_base_args
+from onshape_api.api.api_base import Api, ApiArgs, get_api_base_args, get_api_cache
 from onshape_api.utils import env_utils
 
 
@@ -24,11 +24,13 @@ def make_key_api(load_dotenv: bool = True) -> KeyApi:
     Constructs an instance of an ApiKey API using credentials read from a .env file.
 
     The variables API_ACCESS_KEY and API_SECRET_KEY are required.
-    The variables API_BASE_URL, API_VERSION, and API_LOGGING may also be set.
+    The variables API_BASE_URL, API_VERSION, API_LOGGING, API_POOL_CONNECTIONS, API_POOL_MAXSIZE,
+    API_IDLE_TIMEOUT, API_MAX_RETRIES, API_RATE_LIMIT, API_CACHE_SIZE, and API_CACHE_DIR may also be set.
     """
     if load_dotenv:
         env_utils.load_env()
     kwargs = get_api_base_args()
+    kwargs["cache"] = get_api_cache()
     access_key = os.getenv("API_ACCESS_KEY")
     secret_key = os.getenv("API_SECRET_KEY")
 
@@ -49,12 +51,28 @@ class KeyApi(Api):
         super().__init__(**kwargs)
         self._access_key = access_key
         self._secret_key = secret_key
+        self._session = self._mount(requests.Session())
 
         if self._logging:
             logging.info(
                 "Onshape instance created: access key = {}".format(self._access_key)
             )
 
+    @property
+    @override
+    def session(self) -> requests.Session:
+        return self._session
+
+    @override
+    def _prepare_headers(
+        self, method: http.HTTPMethod, url: str, headers: dict[str, str]
+    ) -> dict[str, str]:
+        # Each attempt needs a fresh date and nonce
+        headers = make_headers(method, headers, url, self._access_key, self._secret_key)
+        if self._logging:
+            logging.info("request headers: " + str(headers))
+        return headers
+
     @override
     def _request(
         self,
@@ -63,6 +81,7 @@ class KeyApi(Api):
         query: dict | str = "",
         body: dict | str = "",
         headers: dict[str, str] = {},
+        idempotent: bool | None = None,
     ):
         query_str = query if isinstance(query, str) else parse.urlencode(query)
 
@@ -70,20 +89,17 @@ class KeyApi(Api):
 
         url = self._base_url + path + "?" + query_str
 
-        headers = make_headers(method, headers, url, self._access_key, self._secret_key)
-
         if self._logging:
             logging.info("request url: " + url)
-            logging.info("request headers: " + str(headers))
             if len(body) > 0:
                 logging.info(body)
 
-        res = requests.request(
+        res = self._send(
             method,
             url,
             headers=headers,
+            idempotent=idempotent,
             data=body_str,
-            allow_redirects=False,
             stream=True,
         )
         status = http.HTTPStatus(res.status_code)
@@ -94,29 +110,6 @@ class KeyApi(Api):
                     logging.info("request succeeded")
                 else:
                     logging.info("request succeeded, details: " + res.text)
-        elif status is http.HTTPStatus.TEMPORARY_REDIRECT:
-            # The official Onshape app has redirect handling here, we skip because lazy
-            if self._logging:
-                logging.error("unhandled redirect, details: " + res.text)
-            raise exceptions.ApiError(res.text, status)
-
-            # location = parse.urlparse(res.headers["Location"])
-            # if self._logging:
-            #     logging.info("request redirected to: " + location.geturl())
-            # return self._request(
-            #     method, location.path, query=location.query, headers=headers
-            # )
-
-            # Official handling:
-            # location = urlparse(res.headers["Location"])
-            # querystring = parse_qs(location.query)
-            # if self._logging:
-            #     utils.log('request redirected to: ' + location.geturl())
-            # new_query = {}
-            # new_base_url = location.scheme + '://' + location.netloc
-            # for key in querystring:
-            #     new_query[key] = querystring[key][0]  # won't work for repeated query params
-            # return self.request(method, location.path, query=new_query, headers=headers, base_url=new_base_url)
         else:
             if self._logging:
                 logging.error("request failed, details: " + res.text)
@@ -12,10 +12,19 @@ from onshape_api.utils import env_utils
 from onshape_api.api.api_base import Api, ApiArgs, get_api_base_args
 
 
-def make_oauth_api(oauth: OAuth2Session, load_dotenv: bool = False) -> OAuthApi:
+def make_oauth_api(
+    oauth: OAuth2Session, load_dotenv: bool = False, **overrides: Unpack[ApiArgs]
+) -> OAuthApi:
+    """Constructs an OAuthApi using settings read from environment variables.
+
+    Args:
+        overrides: Arguments which take precedence over the environment, e.g. the result of get_shared_api_args.
+    """
     if load_dotenv:
         env_utils.load_env()
+    # Responses aren't cached since they may be served to other users, see get_api_cache
     kwargs = get_api_base_args()
+    kwargs.update(overrides)
     return OAuthApi(oauth, **kwargs)
 
 
@@ -25,6 +34,12 @@ class OAuthApi(Api):
     def __init__(self, oauth: OAuth2Session, **kwargs: Unpack[ApiArgs]):
         super().__init__(**kwargs)
         self.oauth = oauth
+        self._mount(oauth)
+
+    @property
+    @override
+    def session(self) -> OAuth2Session:
+        return self.oauth
 
     @override
     def _request(
@@ -34,6 +49,7 @@ class OAuthApi(Api):
         query: dict | str = {},
         body: dict | str = {},
         headers: dict[str, str] = {},
+        idempotent: bool | None = None,
     ):
         query_str = query if isinstance(query, str) else parse.urlencode(query)
         body_str = body if isinstance(body, str) else json.dumps(body)
@@ -48,10 +64,11 @@ class OAuthApi(Api):
         req_headers = headers.copy()
         req_headers["Content-Type"] = headers.get("Content-Type", "application/json")
 
-        res = self.oauth.request(
+        res = self._send(
             method,
             url,
             headers=req_headers,
+            idempotent=idempotent,
             data=body_str,
         )
         status = http.HTTPStatus(res.status_code)
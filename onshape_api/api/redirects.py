@@ -0,0 +1,56 @@
+"""Utilities for following the redirects Onshape uses to send requests to the stack hosting a document."""
+
+import re
+import threading
+from urllib import parse
+
+__all__ = ["RedirectMap"]
+
+MAX_REDIRECTS = 5
+"""The max number of redirects followed for a single request."""
+
+_DOCUMENT_ID_MATCH = re.compile(r"/(?:d|documents)/([0-9a-fA-F]{24})(?=/|$)")
+
+
+def get_document_id(url: str) -> str | None:
+    """Returns the id of the document a url refers to, or None if it doesn't refer to one."""
+    match = _DOCUMENT_ID_MATCH.search(parse.urlparse(url).path)
+    return match.group(1) if match else None
+
+
+class RedirectMap:
+    """Remembers the host each document has been redirected to.
+
+    Enterprise stacks redirect requests for their documents to a regional host.
+    Later requests for the same document are sent straight to that host to avoid paying for the redirect again.
+    """
+
+    def __init__(self) -> None:
+        self._hosts: dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def resolve(self, url: str) -> str:
+        """Returns url with its host replaced by the host its document was last redirected to."""
+        document_id = get_document_id(url)
+        if document_id is None:
+            return url
+        with self._lock:
+            host = self._hosts.get(document_id)
+        if host is None:
+            return url
+        parsed = parse.urlparse(url)
+        return parsed._replace(netloc=host).geturl()
+
+    def record(self, url: str, location: str) -> str:
+        """Records a redirect from url to location.
+
+        Returns:
+            The absolute url to redirect to.
+        """
+        redirect_url = parse.urljoin(url, location)
+        parsed = parse.urlparse(redirect_url)
+        document_id = get_document_id(url)
+        if document_id is not None and parsed.netloc != parse.urlparse(url).netloc:
+            with self._lock:
+                self._hosts[document_id] = parsed.netloc
+        return redirect_url
@@ -0,0 +1,176 @@
+"""Utilities for retrying requests which Onshape rejects due to rate limiting or temporary outages."""
+
+from __future__ import annotations
+import collections
+import dataclasses
+import email.utils
+import http
+import random
+import threading
+import time
+
+__all__ = ["RetryPolicy", "TokenBucket", "RetryMetrics"]
+
+IDEMPOTENT_METHODS = frozenset(
+    [
+        http.HTTPMethod.GET,
+        http.HTTPMethod.HEAD,
+        http.HTTPMethod.OPTIONS,
+        http.HTTPMethod.PUT,
+        http.HTTPMethod.DELETE,
+    ]
+)
+"""Methods which are safe to send more than once."""
+
+THROTTLE_STATUSES = frozenset(
+    [http.HTTPStatus.TOO_MANY_REQUESTS, http.HTTPStatus.SERVICE_UNAVAILABLE]
+)
+"""Statuses which indicate Onshape wants every client to slow down."""
+
+
+@dataclasses.dataclass
+class RetryPolicy:
+    """Decides whether and when a failed request should be retried.
+
+    Attributes:
+        max_retries: The max number of times a single request is retried.
+        backoff_base: The delay, in seconds, before the first retry. Doubles for each subsequent retry.
+        backoff_max: The max delay, in seconds, between retries. Also caps Retry-After.
+        statuses: The response statuses which are retried.
+        methods: The methods which are retried. Requests using other methods are only retried if they are explicitly marked idempotent.
+    """
+
+    max_retries: int = 5
+    backoff_base: float = 0.5
+    backoff_max: float = 30
+    statuses: frozenset[int] = frozenset(
+        [
+            *THROTTLE_STATUSES,
+            http.HTTPStatus.BAD_GATEWAY,
+            http.HTTPStatus.GATEWAY_TIMEOUT,
+        ]
+    )
+    methods: frozenset[http.HTTPMethod] = IDEMPOTENT_METHODS
+
+    def is_retryable(
+        self, method: http.HTTPMethod, attempt: int, idempotent: bool | None = None
+    ) -> bool:
+        """Returns True if a request which has already been retried attempt times may be retried again.
+
+        Args:
+            idempotent: Overrides whether the request is idempotent. If None, the method is used to decide.
+        """
+        if attempt >= self.max_retries:
+            return False
+        return method in self.methods if idempotent is None else idempotent
+
+    def get_delay(self, attempt: int, retry_after: str | None = None) -> float:
+        """Returns the number of seconds to wait before the next retry.
+
+        Uses the Retry-After header if it is given, and jittered exponential backoff otherwise.
+        """
+        if (
+            retry_after is not None
+            and (delay := parse_retry_after(retry_after)) is not None
+        ):
+            return min(delay, self.backoff_max)
+        # "Full jitter" spreads concurrent retries out instead of retrying in lockstep
+        backoff = min(self.backoff_max, self.backoff_base * 2**attempt)
+        return random.uniform(0, backoff)
+
+
+def parse_retry_after(retry_after: str) -> float | None:
+    """Parses the value of a Retry-After header into a number of seconds.
+
+    Returns None if the value is invalid.
+    """
+    try:
+        return max(0, float(retry_after))
+    except ValueError:
+        pass
+    try:
+        date = email.utils.parsedate_to_datetime(retry_after)
+    except (TypeError, ValueError):
+        return None
+    return max(0, date.timestamp() - time.time())
+
+
+class TokenBucket:
+    """A thread-safe token bucket which paces the requests made by every thread sharing an Api.
+
+    When Onshape throttles any one request, the bucket is paused so every other request waits too.
+    """
+
+    def __init__(self, rate: float | None = None, capacity: float | None = None):
+        """
+        Args:
+            rate: The number of requests allowed per second. If None, requests are only delayed while the bucket is paused.
+            capacity: The max number of requests which can be made at once. Defaults to rate.
+        """
+        self._rate = rate
+        self._capacity = capacity if capacity is not None else (rate or 1)
+        self._tokens = self._capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Takes a token from the bucket.
+
+        Returns the number of seconds the caller must wait before making its request.
+        """
+        with self._lock:
+            now = time.monotonic()
+            wait = max(0.0, self._paused_until - now)
+            if self._rate is None:
+                return wait
+
+            self._tokens = min(
+                self._capacity, self._tokens + (now - self._updated) * self._rate
+            )
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens < 0:
+                wait = max(wait, -self._tokens / self._rate)
+            return wait
+
+    def pause(self, seconds: float) -> None:
+        """Stops handing out tokens for the given number of seconds."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+
+class RetryMetrics:
+    """Thread-safe counters describing how often requests were retried or throttled."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.requests = 0
+        """The number of requests sent, including retries."""
+        self.retries: collections.Counter[int] = collections.Counter()
+        """The number of retries made for each response status. Connection errors are counted under 0."""
+        self.throttled_seconds = 0.0
+        """The total time spent waiting on backoff or the token bucket."""
+
+    def record_request(self, wait: float) -> None:
+        with self._lock:
+            self.requests += 1
+            self.throttled_seconds += wait
+
+    def record_retry(self, status: int, delay: float) -> None:
+        with self._lock:
+            self.retries[int(status)] += 1
+            self.throttled_seconds += delay
+
+    def total_retries(self) -> int:
+        with self._lock:
+            return self.retries.total()
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "retries": self.retries.total(),
+                "retriesByStatus": dict(self.retries),
+                "throttledSeconds": self.throttled_seconds,
+            }
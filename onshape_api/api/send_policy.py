@@ -0,0 +1,171 @@
+"""The decisions made while sending a request to the Onshape API, shared by Api and AsyncApi.
+
+A SendPolicy decides where each request is sent, whether it is served from the cache, and whether a response is
+followed, retried, or returned. Api and AsyncApi only perform the I/O, so both transports behave identically.
+"""
+
+from __future__ import annotations
+import enum
+import http
+import logging
+from typing import Mapping
+
+from onshape_api.api.cache import CacheEntry, ResponseCache
+from onshape_api.api.redirects import MAX_REDIRECTS, RedirectMap
+from onshape_api.api.retry import (
+    THROTTLE_STATUSES,
+    RetryMetrics,
+    RetryPolicy,
+    TokenBucket,
+)
+
+__all__ = ["SendPolicy", "RequestState", "Action"]
+
+
+class Action(enum.Enum):
+    """What a transport should do after receiving a response."""
+
+    RETURN = enum.auto()
+    """Return the response."""
+    USE_CACHED = enum.auto()
+    """Return RequestState.entry instead of the response."""
+    REDIRECT = enum.auto()
+    """Send the request again to RequestState.url immediately."""
+    RETRY = enum.auto()
+    """Wait RequestState.delay seconds, then send the request again."""
+
+
+class SendPolicy:
+    """The state shared by every request sent through an Api.
+
+    Attributes:
+        retry_policy: The policy used to retry failed requests.
+        token_bucket: Paces the requests made by every thread or task sharing the Api.
+        metrics: Counts of the retries made and the time spent throttled.
+        redirects: The host each document has been redirected to.
+        cache: The cache used for GET requests, or None.
+    """
+
+    def __init__(
+        self,
+        retry_policy: RetryPolicy | None = None,
+        rate_limit: float | None = None,
+        cache: ResponseCache | None = None,
+        logging: bool = False,
+    ) -> None:
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.token_bucket = TokenBucket(rate_limit)
+        self.metrics = RetryMetrics()
+        self.redirects = RedirectMap()
+        self.cache = cache
+        self.logging = logging
+
+    def start(
+        self,
+        method: http.HTTPMethod,
+        url: str,
+        headers: dict[str, str],
+        idempotent: bool | None = None,
+    ) -> RequestState:
+        """Begins sending a request."""
+        return RequestState(self, method, url, headers, idempotent)
+
+
+class RequestState:
+    """Tracks a single request as it is sent, redirected, and retried.
+
+    Transports should return entry if it is fresh. Otherwise they should repeatedly call reserve, wait for the
+    returned number of seconds, send the request to url with headers, and act on the result of on_response
+    (or on_connection_error).
+
+    Attributes:
+        url: The url to send the next attempt to.
+        headers: The headers to send, including If-None-Match when a cached entry can be revalidated.
+        entry: The cached entry for the request, or None.
+        fresh: True if entry can be returned without sending the request.
+        delay: The number of seconds to wait before retrying, set when a retry is needed.
+    """
+
+    def __init__(
+        self,
+        policy: SendPolicy,
+        method: http.HTTPMethod,
+        url: str,
+        headers: dict[str, str],
+        idempotent: bool | None,
+    ) -> None:
+        self._policy = policy
+        self._method = method
+        self._idempotent = idempotent
+        self._attempt = 0
+        self._redirects = 0
+        self.url = policy.redirects.resolve(url)
+        self.headers = headers
+        self.delay = 0.0
+
+        self.entry: CacheEntry | None = None
+        self.fresh = False
+        if policy.cache is not None:
+            self.entry, self.fresh = policy.cache.lookup(method, self.url)
+            if self.entry is not None and self.entry.etag is not None:
+                self.headers = {**headers, "If-None-Match": self.entry.etag}
+
+    def reserve(self) -> float:
+        """Reserves a slot to send the next attempt in. Returns the number of seconds to wait first."""
+        wait = self._policy.token_bucket.reserve()
+        self._policy.metrics.record_request(wait)
+        return wait
+
+    def on_connection_error(self, error: Exception) -> None:
+        """Prepares to retry an attempt which failed to connect.
+
+        Throws:
+            error: If the request can't be retried.
+        """
+        if not self._is_retryable():
+            raise error
+        self._retry(0, None)
+
+    def on_response(
+        self, status: int, headers: Mapping[str, str], content: bytes
+    ) -> Action:
+        """Decides what to do with the response to an attempt.
+
+        Successful responses are stored in the cache.
+        """
+        if (
+            status == http.HTTPStatus.TEMPORARY_REDIRECT
+            and "Location" in headers
+            and self._redirects < MAX_REDIRECTS
+        ):
+            self.url = self._policy.redirects.record(self.url, headers["Location"])
+            if self._policy.logging:
+                logging.info("request redirected to: " + self.url)
+            self._redirects += 1
+            return Action.REDIRECT
+        if status == http.HTTPStatus.NOT_MODIFIED and self.entry is not None:
+            return Action.USE_CACHED
+        if status == http.HTTPStatus.OK and self._policy.cache is not None:
+            self._policy.cache.store(self._method, self.url, headers, content)
+        if status not in self._policy.retry_policy.statuses or not self._is_retryable():
+            return Action.RETURN
+        self._retry(status, headers.get("Retry-After"))
+        return Action.RETRY
+
+    def _is_retryable(self) -> bool:
+        return self._policy.retry_policy.is_retryable(
+            self._method, self._attempt, self._idempotent
+        )
+
+    def _retry(self, status: int, retry_after: str | None) -> None:
+        self.delay = self._policy.retry_policy.get_delay(self._attempt, retry_after)
+        if status in THROTTLE_STATUSES:
+            self._policy.token_bucket.pause(self.delay)
+        self._policy.metrics.record_retry(status, self.delay)
+        if self._policy.logging:
+            logging.warning(
+                "request failed with status {}, retrying in {:.2f}s".format(
+                    status, self.delay
+                )
+            )
+        self._attempt += 1
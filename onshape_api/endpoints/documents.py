@@ -8,6 +8,7 @@ from onshape_api.assertions import (
 )
 from onshape_api.endpoints.versions import get_latest_version
 from onshape_api.api.api_base import Api
+from onshape_api.api.async_api import AsyncApi
 from onshape_api.paths.api_path import api_path
 from onshape_api.paths.instance_type import (
     InstanceType,
@@ -99,16 +100,31 @@ def get_document_elements(
     Args:
         element_type: The type of element (tab) to get. If None, all elements are returned.
     """
-    query: dict = {"withThumbnails": False}
-    if element_type != None:
-        query["elementType"] = element_type
-
     return api.get(
         api_path("documents", instance_path, InstancePath, "elements"),
-        query=query,
+        query=_elements_query(element_type),
     )
 
 
+async def get_document_elements_async(
+    api: AsyncApi,
+    instance_path: InstancePath,
+    element_type: ElementType | None = None,
+) -> list[dict]:
+    """An async version of get_document_elements."""
+    return await api.get(
+        api_path("documents", instance_path, InstancePath, "elements"),
+        query=_elements_query(element_type),
+    )
+
+
+def _elements_query(element_type: ElementType | None) -> dict:
+    query: dict = {"withThumbnails": False}
+    if element_type != None:
+        query["elementType"] = element_type
+    return query
+
+
 def get_document_element(api: Api, element_path: ElementPath) -> dict | None:
     """Fetches an element in a document, or None if it doesn't exist."""
     query = {"withThumbnails": False, "elementId": element_path.element_id}
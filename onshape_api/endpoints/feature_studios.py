@@ -1,6 +1,7 @@
 from typing import Any
 
 from onshape_api.api.api_base import Api
+from onshape_api.api.async_api import AsyncApi
 from onshape_api.paths.api_path import api_path
 from onshape_api.assertions import assert_instance_type, assert_workspace
 from onshape_api.paths.instance_type import InstanceType
@@ -19,6 +20,16 @@ def pull_code(
     return response if raw_response else response["contents"]
 
 
+async def pull_code_async(
+    api: AsyncApi, feature_studio_path: ElementPath, raw_response: bool = False
+) -> Any:
+    """An async version of pull_code."""
+    response = await api.get(
+        api_path("featurestudios", feature_studio_path, ElementPath)
+    )
+    return response if raw_response else response["contents"]
+
+
 def push_code(api: Api, feature_studio_path: ElementPath, code: str) -> dict:
     """Sends code to the given feature studio specified by path."""
     assert_workspace(feature_studio_path)
@@ -28,6 +39,17 @@ def push_code(api: Api, feature_studio_path: ElementPath, code: str) -> dict:
     )
 
 
+async def push_code_async(
+    api: AsyncApi, feature_studio_path: ElementPath, code: str
+) -> dict:
+    """An async version of push_code."""
+    assert_workspace(feature_studio_path)
+    return await api.post(
+        api_path("featurestudios", feature_studio_path, ElementPath),
+        body={"contents": code},
+    )
+
+
 def create_feature_studio(
     api: Api, instance_path: InstancePath, studio_name: str
 ) -> dict:
@@ -1,6 +1,7 @@
 import json
 
 from onshape_api.api.api_base import Api
+from onshape_api.api.async_api import AsyncApi
 from onshape_api.assertions import assert_instance_type, assert_workspace
 from onshape_api.paths.api_path import api_path
 from onshape_api.paths.instance_type import InstanceType
@@ -25,6 +26,20 @@ def evaluate_feature_script(
     result = api.post(
         api_path("partstudios", part_studio_path, ElementPath, "featurescript"),
         body={"script": script},
+        # Evaluating a script doesn't modify the part studio, so it's safe to retry
+        idempotent=True,
+    )
+    return json.loads(result["console"])
+
+
+async def evaluate_feature_script_async(
+    api: AsyncApi, part_studio_path: ElementPath, script: str
+) -> dict:
+    """An async version of evaluate_feature_script."""
+    result = await api.post(
+        api_path("partstudios", part_studio_path, ElementPath, "featurescript"),
+        body={"script": script},
+        idempotent=True,
     )
     return json.loads(result["console"])
 
@@ -1,6 +1,11 @@
+from concurrent import futures
 from enum import StrEnum
 import http
+import threading
+import time
+from typing import Iterable
 from onshape_api.api.api_base import Api
+from onshape_api.api.async_api import AsyncApi
 from onshape_api.exceptions import ApiError
 from onshape_api.paths.api_path import api_path
 from onshape_api.paths.paths import DocumentPath
@@ -20,24 +25,40 @@ class Permission(StrEnum):
 
 def get_permissions(api: Api, document_path: DocumentPath) -> list[Permission]:
     try:
-        permissions = api.get(
-            api_path(
-                "documents",
-                document_path,
-                DocumentPath,
-                "permissionset",
-                skip_document_d=True,
-            )
-        )
+        permissions = api.get(_permissions_path(document_path))
     except ApiError as error:
-        if error.status_code == http.HTTPStatus.FORBIDDEN:
-            # If a document isn't shared at all, get permissions can return a 403 Forbidden, so report no perms in that case
-            return []
-        else:
-            raise error
+        return _handle_permissions_error(error)
     return [Permission(permission) for permission in permissions]
 
 
+async def get_permissions_async(
+    api: AsyncApi, document_path: DocumentPath
+) -> list[Permission]:
+    """An async version of get_permissions."""
+    try:
+        permissions = await api.get(_permissions_path(document_path))
+    except ApiError as error:
+        return _handle_permissions_error(error)
+    return [Permission(permission) for permission in permissions]
+
+
+def _permissions_path(document_path: DocumentPath) -> str:
+    return api_path(
+        "documents",
+        document_path,
+        DocumentPath,
+        "permissionset",
+        skip_document_d=True,
+    )
+
+
+def _handle_permissions_error(error: ApiError) -> list[Permission]:
+    if error.status_code == http.HTTPStatus.FORBIDDEN:
+        # If a document isn't shared at all, get permissions can return a 403 Forbidden, so report no perms in that case
+        return []
+    raise error
+
+
 def has_permissions(
     api: Api, document_path: DocumentPath, *needed_permissions: Permission
 ) -> bool:
@@ -46,3 +67,70 @@ def has_permissions(
         if permission not in permissions:
             return False
     return True
+
+
+class PermissionCache:
+    """Caches the permissions of documents for a single user.
+
+    Each document's permission set is fetched once and used to answer every subsequent check.
+    A cache should never be shared between users.
+    """
+
+    def __init__(self, ttl: float | None = None, max_workers: int = 8) -> None:
+        """
+        Args:
+            ttl: The number of seconds permissions are cached for. If None, permissions never expire,
+                so the cache should only live for the duration of a single request.
+            max_workers: The max number of permission sets fetched concurrently by get_all_permissions.
+        """
+        self._ttl = ttl
+        self._max_workers = max_workers
+        self._permissions: dict[str, tuple[list[Permission], float]] = {}
+        self._lock = threading.Lock()
+
+    def _lookup(self, document_id: str) -> list[Permission] | None:
+        with self._lock:
+            entry = self._permissions.get(document_id)
+        if entry is None:
+            return None
+        permissions, fetched_at = entry
+        if self._ttl is not None and time.monotonic() - fetched_at > self._ttl:
+            return None
+        return permissions
+
+    def get_permissions(
+        self, api: Api, document_path: DocumentPath
+    ) -> list[Permission]:
+        permissions = self._lookup(document_path.document_id)
+        if permissions is None:
+            permissions = get_permissions(api, document_path)
+            with self._lock:
+                self._permissions[document_path.document_id] = (
+                    permissions,
+                    time.monotonic(),
+                )
+        return permissions
+
+    def get_all_permissions(
+        self, api: Api, document_paths: Iterable[DocumentPath]
+    ) -> dict[str, list[Permission]]:
+        """Returns a dict mapping the document id of each document_path to its permissions.
+
+        Permission sets which aren't cached are fetched concurrently.
+        """
+        # Paths to different instances of the same document share permissions
+        unique_paths = dict((path.document_id, path) for path in document_paths)
+        with futures.ThreadPoolExecutor(self._max_workers) as executor:
+            threads = dict(
+                (document_id, executor.submit(self.get_permissions, api, path))
+                for document_id, path in unique_paths.items()
+            )
+        return dict(
+            (document_id, thread.result()) for document_id, thread in threads.items()
+        )
+
+    def has_permissions(
+        self, api: Api, document_path: DocumentPath, *needed_permissions: Permission
+    ) -> bool:
+        permissions = self.get_permissions(api, document_path)
+        return all(permission in permissions for permission in needed_permissions)
@@ -1,29 +1,161 @@
+import json
+import logging
+import pathlib
 import re
+import threading
+import time
 from onshape_api.api.api_base import Api
-from onshape_api.endpoints.versions import get_latest_version, get_versions
+from onshape_api.endpoints.versions import get_versions
 from onshape_api.model.constants import STD_PATH
 
+DEFAULT_TTL = 600
+"""The number of seconds the list of std versions is used for before it is refreshed."""
+
+
+class StdVersionCache:
+    """Caches the list of versions of the Onshape std.
+
+    The std has thousands of versions and new ones are only ever appended, so after the first fetch
+    only the tail of the list starting at the last known version is requested.
+
+    Once the list is older than ttl, it is either refreshed in the background while the stale list is returned,
+    or refreshed before returning, depending on refresh_in_background.
+    """
+
+    def __init__(
+        self,
+        ttl: float = DEFAULT_TTL,
+        storage_path: pathlib.Path | None = None,
+        refresh_in_background: bool = True,
+    ) -> None:
+        """
+        Args:
+            ttl: The number of seconds before the list is considered stale.
+            storage_path: A json file to persist the list to, so it can be reused across runs.
+            refresh_in_background: Whether stale lists are returned while they are refreshed in the background.
+                Should be False in short lived processes, which may exit before the refresh finishes.
+        """
+        self._ttl = ttl
+        self._storage_path = storage_path
+        self._refresh_in_background = refresh_in_background
+
+        self._versions: list[dict] = []
+        self._fetched_at = 0.0
+        self._refreshing = False
+        self._lock = threading.Lock()
+        self._fetch_lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        if self._storage_path is None or not self._storage_path.is_file():
+            return
+        try:
+            data = json.loads(self._storage_path.read_text())
+            self._versions = data["versions"]
+            self._fetched_at = data["fetchedAt"]
+        except (OSError, ValueError, KeyError):
+            pass
+
+    def _save(self) -> None:
+        if self._storage_path is None:
+            return
+        data = {"versions": self._versions, "fetchedAt": self._fetched_at}
+        self._storage_path.write_text(json.dumps(data))
+
+    def _fetch(self, api: Api) -> None:
+        """Fetches any versions which have been created since the last fetch."""
+        with self._fetch_lock:
+            versions = self._versions
+            if versions:
+                tail = get_versions(api, STD_PATH, offset=len(versions) - 1)
+                if tail and tail[0]["id"] == versions[-1]["id"]:
+                    new_versions = tail[1:]
+                else:
+                    # The list was changed in some other way, so start over
+                    versions = []
+                    new_versions = get_versions(api, STD_PATH)
+            else:
+                new_versions = get_versions(api, STD_PATH)
+
+            # Only keep what's needed to keep the persisted list small
+            versions = versions + [
+                {"id": version["id"], "name": version["name"]}
+                for version in new_versions
+            ]
+            with self._lock:
+                self._versions = versions
+                self._fetched_at = time.time()
+                self._save()
+
+    def _background_refresh(self, api: Api) -> None:
+        try:
+            self._fetch(api)
+        except Exception as error:
+            logging.warning("Failed to refresh std versions: {}".format(error))
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def get_versions(self, api: Api) -> list[dict]:
+        """Returns the versions of the std, oldest first, fetching them if necessary.
+
+        Each version has an id and a name.
+        """
+        with self._lock:
+            stale = time.time() - self._fetched_at > self._ttl
+            start_refresh = (
+                stale
+                and len(self._versions) > 0
+                and self._refresh_in_background
+                and not self._refreshing
+            )
+            if start_refresh:
+                self._refreshing = True
+
+        if start_refresh:
+            threading.Thread(
+                target=self._background_refresh, args=(api,), daemon=True
+            ).start()
+        elif stale and not self._refreshing:
+            self._fetch(api)
+        return self._versions
+
+    def get_latest_std_version(self, api: Api) -> str:
+        """Returns the name of the latest version of the Onshape std."""
+        name = self.get_versions(api)[-1]["name"]
+        version_number = _extract_version_number(name)
+        if version_number == None:
+            raise ValueError("Failed to parse Onshape std version: " + name)
+        return version_number
+
+    def get_std_versions(self, api: Api) -> list[str]:
+        """Returns a list of the names of all versions of the Onshape std.
+
+        The versions are in chronological order, with the oldest version first.
+        """
+        # Omit "Start" version
+        version_numbers = map(
+            lambda version: _extract_version_number(version["name"]),
+            self.get_versions(api)[1:],
+        )
+        return [number for number in version_numbers if number != None]
+
+
+std_version_cache = StdVersionCache()
+"""A cache shared by every caller in the process."""
+
 
 def get_latest_std_version(api: Api) -> str:
     """Returns the name of the latest version of the Onshape std."""
-    response = get_latest_version(api, STD_PATH)
-    version_number = _extract_version_number(response["name"])
-    if version_number == None:
-        raise ValueError("Failed to parse Onshape std version: " + response["name"])
-    return version_number
+    return std_version_cache.get_latest_std_version(api)
 
 
 def get_std_versions(api: Api) -> list[str]:
     """Returns a list of the names of all versions of the Onshape std.
 
-    The versions are in reverse chronological order, with the oldest version first.
+    The versions are in chronological order, with the oldest version first.
     """
-    # Omit "Start" version
-    response = get_versions(api, STD_PATH)[1:]
-    version_numbers = map(
-        lambda version: _extract_version_number(version["name"]), response
-    )
-    return [number for number in version_numbers if number != None]
+    return std_version_cache.get_std_versions(api)
 
 
 def _extract_version_number(version_name: str) -> str | None:
@@ -15,11 +15,14 @@ def get_versions(
 
     Args:
         offset: A starting offset to apply. Does not support negative indexing.
-        limit: The max number of versions to return.
+        limit: The max number of versions to return. If 0, every version after offset is returned.
     """
+    query = {"offset": offset}
+    if limit > 0:
+        query["limit"] = limit
     return api.get(
         api_path("documents", document_path, DocumentPath, "versions"),
-        query={offset: offset, limit: limit},
+        query=query,
     )
 
 
@@ -3,6 +3,9 @@
 import re
 import json
 
+INDENT = "    "
+"""The string code is indented with."""
+
 
 def to_json(value: dict | list) -> str:
     """Converts a dict or list to a pretty print string."""
@@ -11,7 +14,7 @@ def to_json(value: dict | list) -> str:
 
 def indent(string: str) -> str:
     lines = string.splitlines(keepends=True)
-    return "".join(["    " + line for line in lines])
+    return "".join([INDENT + line for line in lines])
 
 
 def quote(string: str) -> str:
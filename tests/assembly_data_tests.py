@@ -0,0 +1,80 @@
+import unittest
+
+from backend.common.assembly_data import Assembly, AssemblyFeatures
+from onshape_api.model.assembly_features import (
+    fasten_mate,
+    feature_query,
+    part_studio_mate_connector_query,
+)
+from onshape_api.paths.paths import ElementPath
+
+ASSEMBLY_PATH = ElementPath("a", "w", "e")
+
+
+def make_part(part_id: str, element_id: str = "ps", version: str | None = None):
+    part = {"documentId": "d", "elementId": element_id, "partId": part_id}
+    if version is not None:
+        part["documentVersion"] = version
+    return part
+
+
+class TestAssembly(unittest.TestCase):
+    def setUp(self):
+        parts = [
+            make_part("A"),
+            make_part("B"),
+            make_part("A", version="v"),
+            make_part("C", element_id="other"),
+        ]
+        instances = [
+            dict(make_part("A"), id="1", type="Part"),
+            dict(make_part("A"), id="2", type="Part"),
+            dict(make_part("A", version="v"), id="3", type="Part"),
+            {"id": "4", "type": "Assembly", "documentId": "d", "elementId": "sub"},
+        ]
+        self.assembly = Assembly(
+            {"parts": parts, "rootAssembly": {"instances": instances}}, ASSEMBLY_PATH
+        )
+        self.parts = parts
+        self.instances = instances
+
+    def test_get_part_from_instance(self):
+        self.assertIs(
+            self.assembly.get_part_from_instance(self.instances[2]),
+            self.parts[2],
+        )
+        self.assertIs(
+            self.assembly.get_part_from_instance(self.instances[0]),
+            self.parts[0],
+        )
+
+    def test_part_studios(self):
+        self.assertEqual(
+            self.assembly.extract_unique_part_studios(),
+            {
+                ElementPath("d", "w", "ps"),
+                ElementPath("d", "v", "ps", "v"),
+                ElementPath("d", "w", "other"),
+            },
+        )
+
+    def test_paths_are_memoized(self):
+        self.assertIs(
+            self.assembly.resolve_part_path(self.parts[0]),
+            self.assembly.resolve_part_path(self.instances[1]),
+        )
+
+
+class TestAssemblyFeatures(unittest.TestCase):
+    def test_is_mate_connector_used(self):
+        mate = fasten_mate(
+            "Fasten",
+            [
+                part_studio_mate_connector_query("1", "M1"),
+                feature_query("M2"),
+            ],
+        )
+        assembly_features = AssemblyFeatures({"features": [mate]})
+        self.assertTrue(assembly_features.is_mate_connector_used({"id": "1"}, "M1"))
+        self.assertFalse(assembly_features.is_mate_connector_used({"id": "2"}, "M1"))
+        self.assertFalse(assembly_features.is_mate_connector_used({"id": "1"}, "M2"))
@@ -0,0 +1,93 @@
+import pathlib
+import tempfile
+import unittest
+
+from featurescript.build_cache import BuildCache, Fingerprinter, find_imports, hash_code
+
+
+class TestFingerprinter(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.root = pathlib.Path(self.directory.name)
+        self.write("lib/__init__.py", "from .nodes import *\n")
+        self.write("lib/nodes.py", "from lib import util\nimport os\n")
+        self.write("lib/util.py", "VALUE = 1\n")
+        self.write("other.py", "VALUE = 2\n")
+        self.write("gen/frame.py", "from lib import *\n")
+        self.write("gen/spacer.py", "import other\n")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, name: str, code: str) -> None:
+        path = self.root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(code)
+
+    def test_find_imports(self):
+        self.assertEqual(
+            find_imports(self.root / "lib/__init__.py", "lib"), {"lib.nodes"}
+        )
+        self.assertEqual(
+            find_imports(self.root / "lib/nodes.py", "lib.nodes"),
+            {"lib", "lib.util", "os"},
+        )
+
+    def test_dependencies(self):
+        fingerprinter = Fingerprinter(self.root)
+        dependencies = fingerprinter.get_dependencies(self.root / "gen/frame.py")
+        self.assertEqual(
+            [path.relative_to(self.root.resolve()).as_posix() for path in dependencies],
+            ["lib/__init__.py", "lib/nodes.py", "lib/util.py"],
+        )
+
+    def test_fingerprint_changes(self):
+        frame = self.root / "gen/frame.py"
+        spacer = self.root / "gen/spacer.py"
+        before = Fingerprinter(self.root)
+        frame_fingerprint = before.fingerprint(frame, "100")
+        spacer_fingerprint = before.fingerprint(spacer, "100")
+        self.assertNotEqual(frame_fingerprint, before.fingerprint(frame, "101"))
+
+        # Changing a transitive dependency only changes modules which import it
+        self.write("lib/util.py", "VALUE = 3\n")
+        after = Fingerprinter(self.root)
+        self.assertNotEqual(frame_fingerprint, after.fingerprint(frame, "100"))
+        self.assertEqual(spacer_fingerprint, after.fingerprint(spacer, "100"))
+
+    def test_reuses_files(self):
+        frame = self.root / "gen/frame.py"
+        files = {}
+        fingerprint = Fingerprinter(self.root, files).fingerprint(frame, "100")
+        self.assertEqual(len(files), 4)
+        self.assertEqual(
+            Fingerprinter(self.root, files).fingerprint(frame, "100"), fingerprint
+        )
+
+        self.write("lib/util.py", "VALUE = 10\n")
+        self.assertNotEqual(
+            Fingerprinter(self.root, files).fingerprint(frame, "100"), fingerprint
+        )
+
+
+class TestBuildCache(unittest.TestCase):
+    def test_round_trip(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = pathlib.Path(directory) / "build_cache.json"
+            cache = BuildCache(path)
+            self.assertIsNone(cache.get_studios("frame.py", "a"))
+            cache.set("frame.py", "a", [("frame.fs", "a"), ("frameUi.fs", "b")])
+            cache.save()
+
+            cache = BuildCache(path)
+            self.assertEqual(
+                cache.get_studios("frame.py", "a"),
+                {"frame.fs": hash_code("a"), "frameUi.fs": hash_code("b")},
+            )
+            self.assertIsNone(cache.get_studios("frame.py", "b"))
+
+    def test_invalid_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = pathlib.Path(directory) / "build_cache.json"
+            path.write_text("not json")
+            self.assertIsNone(BuildCache(path).get_studios("frame.py", "a"))
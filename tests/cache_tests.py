@@ -0,0 +1,72 @@
+import tempfile
+import unittest
+
+from onshape_api.api.cache import (
+    CacheEntry,
+    DiskStore,
+    MemoryStore,
+    ResponseCache,
+    is_immutable,
+)
+
+DOCUMENT_ID = "0123456789abcdef01234567"
+VERSION_ID = "89abcdef0123456789abcdef"
+BASE = "https://cad.onshape.com/api/v8/partstudios/d/" + DOCUMENT_ID
+VERSION_URL = BASE + "/v/" + VERSION_ID + "/e/1/features?a=1"
+WORKSPACE_URL = BASE + "/w/" + VERSION_ID + "/e/1/features?a=1"
+
+
+class TestResponseCache(unittest.TestCase):
+    def test_is_immutable(self):
+        self.assertTrue(is_immutable(VERSION_URL))
+        self.assertTrue(is_immutable(BASE + "/m/" + VERSION_ID))
+        self.assertFalse(is_immutable(WORKSPACE_URL))
+
+    def test_version_is_fresh(self):
+        cache = ResponseCache()
+        cache.store("GET", VERSION_URL, {}, b"{}")
+        self.assertEqual(
+            cache.lookup("GET", VERSION_URL), (CacheEntry(b"{}", {}), True)
+        )
+        # Different queries are cached separately
+        self.assertEqual(cache.lookup("GET", VERSION_URL + "&b=2"), (None, False))
+
+    def test_workspace_requires_etag(self):
+        cache = ResponseCache()
+        cache.store("GET", WORKSPACE_URL, {}, b"{}")
+        self.assertEqual(cache.lookup("GET", WORKSPACE_URL), (None, False))
+
+        cache.store("GET", WORKSPACE_URL, {"ETag": '"1"'}, b"{}")
+        entry, fresh = cache.lookup("GET", WORKSPACE_URL)
+        self.assertFalse(fresh)
+        assert entry is not None
+        self.assertEqual(entry.etag, '"1"')
+
+    def test_ignores_other_methods(self):
+        cache = ResponseCache()
+        cache.store("POST", VERSION_URL, {}, b"{}")
+        self.assertEqual(cache.lookup("GET", VERSION_URL), (None, False))
+
+    def test_memory_store_evicts(self):
+        store = MemoryStore(max_entries=2)
+        store.set("a", CacheEntry(b"a", {}))
+        store.set("b", CacheEntry(b"b", {}))
+        store.get("a")
+        store.set("c", CacheEntry(b"c", {}))
+        self.assertIsNone(store.get("b"))
+        self.assertIsNotNone(store.get("a"))
+
+    def test_disk_store(self):
+        with tempfile.TemporaryDirectory() as directory:
+            ResponseCache(DiskStore(directory)).store(
+                "GET", VERSION_URL, {"Content-Type": "application/json"}, b"{}"
+            )
+            memory = MemoryStore()
+            cache = ResponseCache(memory, DiskStore(directory))
+            entry, fresh = cache.lookup("GET", VERSION_URL)
+            self.assertTrue(fresh)
+            self.assertEqual(
+                entry, CacheEntry(b"{}", {"Content-Type": "application/json"})
+            )
+            # Entries found on disk are promoted to memory
+            self.assertIsNotNone(memory.get(ResponseCache.make_key("GET", VERSION_URL)))
@@ -0,0 +1,5 @@
+import os
+
+# Backend modules read these on import, but the tests never connect to Onshape
+for name in ["OAUTH_CLIENT_ID", "OAUTH_CLIENT_SECRET", "SESSION_SECRET"]:
+    os.environ.setdefault(name, "test")
@@ -0,0 +1,32 @@
+import unittest
+from unittest import mock
+
+from onshape_api.api.api_base import get_shared_api_args
+from onshape_api.api.key_api import KeyApi
+
+
+class TestSharedApiArgs(unittest.TestCase):
+    def test_apis_share_pool(self):
+        kwargs = get_shared_api_args()
+        first = KeyApi("a", "a", **kwargs)
+        second = KeyApi("b", "b", **kwargs)
+        self.assertIs(
+            first.session.get_adapter("https://cad.onshape.com"),
+            second.session.get_adapter("https://cad.onshape.com"),
+        )
+        # Throttling one request delays every other request too
+        self.assertIs(first._send_policy.token_bucket, second._send_policy.token_bucket)
+        self.assertIs(first.metrics, second.metrics)
+
+        # Closing an Api leaves the shared pool open for the others
+        with mock.patch.object(kwargs["pool"].adapter, "close") as close_mock:
+            first.close()
+        close_mock.assert_not_called()
+
+    def test_apis_own_pool(self):
+        first = KeyApi("a", "a")
+        second = KeyApi("b", "b")
+        self.assertIsNot(
+            first.session.get_adapter("https://cad.onshape.com"),
+            second.session.get_adapter("https://cad.onshape.com"),
+        )
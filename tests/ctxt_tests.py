@@ -0,0 +1,49 @@
+import unittest
+
+from featurescript.base import ctxt
+
+
+class TestContext(unittest.TestCase):
+    def test_restore(self):
+        context = ctxt.Context("2000")
+        context.save()
+        context.indent += 1
+        context.scope = ctxt.Scope.STATEMENT
+
+        context.save()
+        context.indent += 1
+        context.indent += 1
+        context.ui = True
+        self.assertEqual(context.indent, 3)
+
+        context.restore()
+        self.assertEqual(context.indent, 1)
+        self.assertEqual(context.scope, ctxt.Scope.STATEMENT)
+        self.assertFalse(context.ui)
+
+        context.restore()
+        self.assertEqual(
+            context.as_dict(),
+            {
+                "enum": False,
+                "ui": False,
+                "test_predicate": False,
+                "indent": 0,
+                "scope": ctxt.Scope.TOP,
+            },
+        )
+
+    def test_fields_outside_stack(self):
+        context = ctxt.Context("2000")
+        context.save()
+        context.std_version = "2001"
+        context.indent = 2
+        context.restore()
+        self.assertEqual(context.std_version, "2001")
+        self.assertEqual(context.indent, 0)
+
+    def test_set_without_save(self):
+        context = ctxt.Context("2000")
+        context.indent = 2
+        self.assertEqual(context.indent, 2)
+        self.assertEqual(context.stack, [])
@@ -0,0 +1,32 @@
+import unittest
+from unittest import mock
+
+from backend.common import evaluate
+from onshape_api.paths.paths import ElementPath
+
+
+class TestEvaluateTargets(unittest.TestCase):
+    def test_deduplicates_targets(self):
+        first = ElementPath("d", "w", "1")
+        second = ElementPath("d", "w", "2")
+        mates_to_targets = {
+            "A": first,
+            "B": ElementPath("d", "w", "1"),
+            "C": second,
+            "D": first,
+        }
+
+        def evaluate_target(api, part_studio_path: ElementPath):
+            return {"targetMateId": "T" + part_studio_path.element_id}
+
+        with mock.patch.object(
+            evaluate, "evalute_auto_assembly_target_part", side_effect=evaluate_target
+        ) as evaluate_mock:
+            result = evaluate.evaluate_targets(None, mates_to_targets)
+
+        self.assertEqual(evaluate_mock.call_count, 2)
+        self.assertEqual(
+            result.mates_to_target_mates, {"A": "T1", "B": "T1", "C": "T2", "D": "T1"}
+        )
+        self.assertEqual(result.evaluations, 2)
+        self.assertEqual(result.saved_evaluations, 2)
@@ -0,0 +1,93 @@
+import tempfile
+import unittest
+from unittest import mock
+
+from backend.common import evaluation_cache
+from backend.common.evaluation_cache import EvaluationCache
+from backend.common.scripts import Script
+from onshape_api.api.cache import CacheEntry, CacheStore, DiskStore, MemoryStore
+from onshape_api.paths.instance_type import InstanceType
+from onshape_api.paths.paths import ElementPath
+
+VERSION_PATH = ElementPath("d", "v", "e", InstanceType.VERSION)
+WORKSPACE_PATH = ElementPath("d", "w", "e")
+SCRIPT_A = Script.from_code("a", "function(context is Context, args) {}")
+SCRIPT_B = Script.from_code("b", "function(context is Context, args) { }")
+
+
+class FailingStore(CacheStore):
+    def get(self, key: str) -> CacheEntry | None:
+        raise ConnectionError("store unavailable")
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        raise ValueError("entry too large")
+
+
+class TestEvaluationCache(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(
+            evaluation_cache, "evaluate_feature_script", return_value={"valid": True}
+        )
+        self.evaluate_mock = patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(
+            evaluation_cache, "get_workspace_microversion_id", return_value="m1"
+        )
+        self.microversion_mock = patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(evaluation_cache, "get_permission_cache")
+        self.permissions_mock = patcher.start().return_value.has_permissions
+        self.permissions_mock.return_value = True
+        self.addCleanup(patcher.stop)
+
+    def test_version(self):
+        cache = EvaluationCache()
+        self.assertEqual(cache.evaluate(None, VERSION_PATH, SCRIPT_A), {"valid": True})
+        self.assertEqual(cache.evaluate(None, VERSION_PATH, SCRIPT_A), {"valid": True})
+        self.assertEqual(self.evaluate_mock.call_count, 1)
+        self.microversion_mock.assert_not_called()
+
+        # Different scripts are cached separately
+        cache.evaluate(None, VERSION_PATH, SCRIPT_B)
+        self.assertEqual(self.evaluate_mock.call_count, 2)
+
+    def test_hits_require_access(self):
+        cache = EvaluationCache()
+        cache.evaluate(None, VERSION_PATH, SCRIPT_A)
+        self.permissions_mock.assert_not_called()
+
+        self.permissions_mock.return_value = False
+        self.evaluate_mock.side_effect = RuntimeError("no access")
+        with self.assertRaises(RuntimeError):
+            cache.evaluate(None, VERSION_PATH, SCRIPT_A)
+        self.permissions_mock.assert_called_once()
+
+    def test_workspace_microversion(self):
+        cache = EvaluationCache()
+        cache.evaluate(None, WORKSPACE_PATH, SCRIPT_A)
+        cache.evaluate(None, WORKSPACE_PATH, SCRIPT_A)
+        self.assertEqual(self.evaluate_mock.call_count, 1)
+
+        self.microversion_mock.return_value = "m2"
+        cache.evaluate(None, WORKSPACE_PATH, SCRIPT_A)
+        self.assertEqual(self.evaluate_mock.call_count, 2)
+
+    def test_disk_store(self):
+        with tempfile.TemporaryDirectory() as directory:
+            EvaluationCache(DiskStore(directory)).evaluate(None, VERSION_PATH, SCRIPT_A)
+            cache = EvaluationCache(MemoryStore(), DiskStore(directory))
+            self.assertEqual(
+                cache.evaluate(None, VERSION_PATH, SCRIPT_A), {"valid": True}
+            )
+            self.assertEqual(self.evaluate_mock.call_count, 1)
+
+    def test_failing_store(self):
+        memory = MemoryStore()
+        cache = EvaluationCache(FailingStore(), memory)
+        with self.assertLogs(level="WARNING"):
+            self.assertEqual(
+                cache.evaluate(None, VERSION_PATH, SCRIPT_A), {"valid": True}
+            )
+        # The result is still written to the stores which work
+        self.assertIsNotNone(memory.get(cache.make_key(None, VERSION_PATH, SCRIPT_A)))
+        self.assertEqual(self.evaluate_mock.call_count, 1)
@@ -0,0 +1,146 @@
+import threading
+import time
+import unittest
+
+from backend.common import progress
+from backend.common.jobs import Job, JobQueue, JobStatus, MemoryJobStore
+from onshape_api.exceptions import ApiError
+
+
+class TestJobQueue(unittest.TestCase):
+    def setUp(self):
+        self.queue = JobQueue(MemoryJobStore())
+
+    def tearDown(self):
+        self.queue.shutdown()
+
+    def wait(self, job: Job) -> Job:
+        self.queue.shutdown()
+        result = self.queue.get(job.id)
+        assert result is not None
+        return result
+
+    def test_succeeded(self):
+        started = threading.Event()
+        finish = threading.Event()
+
+        def run(report: progress.Reporter) -> dict:
+            report(progress.ProgressEvent("versionCreated", {"documentId": "a"}))
+            started.set()
+            finish.wait()
+            return {"updatedReferences": 2}
+
+        job = self.queue.submit("push-version", run, owner="session")
+        started.wait()
+        running = self.queue.get(job.id)
+        assert running is not None
+        self.assertEqual(running.status, JobStatus.RUNNING)
+        self.assertEqual(
+            running.events, [{"type": "versionCreated", "documentId": "a"}]
+        )
+
+        finish.set()
+        job = self.wait(job)
+        self.assertEqual(job.status, JobStatus.SUCCEEDED)
+        self.assertEqual(job.owner, "session")
+        self.assertEqual(job.result, {"updatedReferences": 2})
+        self.assertIsNone(job.error)
+
+    def test_failed(self):
+        def run(report: progress.Reporter) -> dict:
+            raise ApiError("Not found", 404)
+
+        job = self.wait(self.queue.submit("copy-design", run))
+        self.assertEqual(job.status, JobStatus.FAILED)
+        self.assertTrue(job.done)
+        assert job.error is not None
+        self.assertEqual(job.error["type"], "API_EXCEPTION")
+
+    def test_concurrent_events(self):
+        def run(report: progress.Reporter) -> dict:
+            threads = [
+                threading.Thread(
+                    target=report, args=(progress.ProgressEvent("step", {"i": i}),)
+                )
+                for i in range(50)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            return {}
+
+        job = self.wait(self.queue.submit("update-references", run))
+        self.assertEqual(len(job.events), 50)
+
+    def test_follow(self):
+        finish = threading.Event()
+
+        def run(report: progress.Reporter) -> dict:
+            report(progress.ProgressEvent("studioPulled", {"elementId": "a"}))
+            finish.wait()
+            report(progress.ProgressEvent("studioPushed", {"elementId": "a"}))
+            return {"updatedStudios": 1}
+
+        job = self.queue.submit("update-featurescript-version", run)
+        events = self.queue.follow(job.id, poll_interval=0.01)
+        self.assertEqual(next(events).type, "studioPulled")
+        finish.set()
+        self.assertEqual(
+            [event.to_dict() for event in events],
+            [
+                {"type": "studioPushed", "elementId": "a"},
+                {"type": "result", "updatedStudios": 1},
+            ],
+        )
+        # Resuming after the last event yields nothing
+        self.assertEqual(list(self.queue.follow(job.id, start=3)), [])
+        self.assertEqual(
+            [event.type for event in self.queue.follow(job.id, start=1)],
+            ["studioPushed", "result"],
+        )
+
+    def test_stale_job(self):
+        store = MemoryJobStore()
+        queue = JobQueue(store, stale_timeout=60)
+        self.addCleanup(queue.shutdown)
+        # A job left running by an instance which was shut down
+        store.set(Job("lost", "push-version", status=JobStatus.RUNNING))
+        job = queue.get("lost")
+        assert job is not None
+        self.assertEqual(job.status, JobStatus.RUNNING)
+
+        store.update("lost", {"updated_at": time.time() - 120})
+        job = queue.get("lost")
+        assert job is not None
+        self.assertEqual(job.status, JobStatus.FAILED)
+        self.assertEqual(
+            [event.type for event in queue.follow("lost", poll_interval=0.01)],
+            ["error"],
+        )
+
+    def test_missing_job(self):
+        self.assertIsNone(self.queue.get("missing"))
+
+
+class TestMemoryJobStore(unittest.TestCase):
+    def test_evicts_oldest(self):
+        store = MemoryJobStore(max_jobs=2)
+        for i in range(3):
+            store.set(Job(str(i), "job"))
+        self.assertIsNone(store.get("0"))
+        self.assertIsNotNone(store.get("2"))
+
+    def test_events_from_start(self):
+        store = MemoryJobStore()
+        store.set(Job("id", "job"))
+        for i in range(3):
+            store.add_event("id", i, {"type": "step", "i": i}, time.time())
+        job = store.get("id", start=1)
+        assert job is not None
+        self.assertEqual([event["i"] for event in job.events], [1, 2])
+        self.assertEqual(job.event_count, 3)
+
+    def test_record_round_trip(self):
+        job = Job("id", "job", "owner", JobStatus.FAILED, [{"type": "a"}])
+        self.assertEqual(Job.from_record(job.to_record()), job)
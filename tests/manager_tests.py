@@ -0,0 +1,117 @@
+import pathlib
+import tempfile
+import threading
+import unittest
+
+from featurescript import build_cache, conf
+from featurescript.manager import CommandLineManager, build_modules
+
+MODULE = """from featurescript import *
+
+studio = Studio("{name}.fs")
+"""
+
+DOCUMENT_URL = "https://cad.onshape.com/documents/d1/w/w1"
+
+
+class TestBuildModules(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        root = pathlib.Path(self.directory.name)
+        self.paths = []
+        for name in ["c", "a", "failing", "b"]:
+            path = root / "{}.py".format(name)
+            if name == "failing":
+                path.write_text("raise ValueError('Invalid studio')\n")
+            else:
+                path.write_text(MODULE.format(name=name))
+            self.paths.append(path)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def check(self, jobs: int) -> None:
+        results = list(build_modules(self.paths, "2000", jobs))
+        self.assertEqual([result.path for result in results], self.paths)
+        self.assertEqual(
+            [result.studio_names for result in results],
+            [["c.fs"], ["a.fs"], [], ["b.fs"]],
+        )
+        self.assertTrue(results[0].studios[0][1].startswith("FeatureScript 2000;"))
+        error = results[2].error
+        assert error is not None
+        self.assertIn("Invalid studio", error)
+
+    def test_serial(self):
+        self.check(jobs=1)
+
+    def test_parallel(self):
+        self.check(jobs=3)
+
+    def test_parallel_matches_serial(self):
+        self.assertEqual(
+            list(build_modules(self.paths, "2000", 1)),
+            list(build_modules(self.paths, "2000", 4)),
+        )
+
+
+class FakeApi:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.listings = 0
+        self.created: list[str] = []
+
+    def get(self, path: str, query: dict = {}) -> list[dict]:
+        with self.lock:
+            self.listings += 1
+        return [{"name": "a.fs", "id": "e1", "microversionId": "m1"}]
+
+    def post(self, path: str, body: dict = {}) -> dict:
+        with self.lock:
+            self.created.append(body["name"])
+        return {"name": body["name"], "id": body["name"], "microversionId": "m2"}
+
+
+class TestBuildStudios(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        root = pathlib.Path(self.directory.name)
+        self.config = conf.Config.__new__(conf.Config)
+        self.config._parse_config(
+            {
+                "storage_path": str(root / "storage"),
+                "code_path": str(root / "code"),
+                "code_gen_path": str(root / "gen"),
+                "documents": {"generated": DOCUMENT_URL},
+                "build_document": "generated",
+            }
+        )
+        self.api = FakeApi()
+        self.manager = CommandLineManager(self.config, self.api)  # type: ignore
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_get_build_studios(self):
+        studios = self.manager._get_build_studios(["a.fs", "b.fs", "c.fs", "b.fs"])
+        assert studios is not None
+        self.assertEqual(self.api.listings, 1)
+        self.assertEqual(sorted(self.api.created), ["b.fs", "c.fs"])
+        self.assertEqual(sorted(studios), ["a.fs", "b.fs", "c.fs"])
+        self.assertEqual(studios["b.fs"].path.document_id, "d1")
+        self.assertTrue(studios["b.fs"].created)
+        self.assertFalse(studios["a.fs"].created)
+
+    def test_missing_build_document(self):
+        self.config.build_document = "missing"
+        self.assertIsNone(self.manager._get_build_studios(["a.fs"]))
+        self.assertEqual(self.api.listings, 0)
+
+    def test_is_built(self):
+        digest = build_cache.hash_code("built")
+        self.assertFalse(self.manager._is_built("a.fs", digest))
+        self.config.write_file("a.fs", "built")
+        self.assertTrue(self.manager._is_built("a.fs", digest))
+        # E.g. pulled from Onshape since it was built
+        self.config.write_file("a.fs", "pulled")
+        self.assertFalse(self.manager._is_built("a.fs", digest))
@@ -0,0 +1,59 @@
+import unittest
+
+from featurescript.base import ctxt, node
+from onshape_api.utils import str_utils
+
+
+class Text(node.Node):
+    def __init__(self, text: str) -> None:
+        self.text = text
+
+    def build(self, context: ctxt.Context) -> str:
+        return self.text
+
+
+class Block(node.ParentNode):
+    def write(self, writer: node.Writer, context: ctxt.Context) -> None:
+        writer.write("{\n")
+        self.write_children(writer, context, sep="\n", indent=True)
+        writer.write("}\n")
+
+
+class TestWriter(unittest.TestCase):
+    def test_matches_indent(self):
+        for string in ["", "a", "a\n", "a\nb", "a\n\nb\n", "\n"]:
+            writer = node.Writer()
+            writer.indent()
+            writer.indent()
+            writer.write(string)
+            self.assertEqual(
+                writer.getvalue(), str_utils.indent(str_utils.indent(string))
+            )
+
+    def test_nested_blocks(self):
+        writer = node.Writer()
+        writer.write("start(")
+        writer.indent()
+        # Blocks which begin mid line indent their first line, like str_utils.indent
+        writer.write("a\nb")
+        writer.indent()
+        writer.write("c\n")
+        writer.dedent()
+        writer.write("d\n")
+        writer.dedent()
+        writer.write(")\n")
+        expected = (
+            "start("
+            + str_utils.indent("a\nb" + str_utils.indent("c\n") + "d\n")
+            + ")\n"
+        )
+        self.assertEqual(writer.getvalue(), expected)
+
+    def test_build_adapter(self):
+        block = Block().add(Text("x;\n"), Block().add(Text("y;\n")))
+        expected = "{\n    x;\n    \n    {\n        y;\n    }\n}\n"
+        self.assertEqual(block.run_build(ctxt.Context("2000")), expected)
+        self.assertEqual(
+            node.build_nodes([block, Text("z;\n")], ctxt.Context("2000")),
+            expected + "z;\n",
+        )
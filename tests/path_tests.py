@@ -1,6 +1,6 @@
 import unittest
 
-from onshape_api.paths.paths import DocumentPath, ElementPath, InstancePath
+from onshape_api.paths.paths import DocumentPath, ElementPath, InstancePath, PartPath
 
 inst_path = InstancePath("1", "2")
 same_path = InstancePath("1", "2")
@@ -42,3 +42,15 @@ class TestPathMethods(unittest.TestCase):
         self.assertFalse(doc_path in {inst_path})
         self.assertFalse(inst_path in [element_path])
         self.assertFalse(inst_path in {element_path})
+
+    def test_element_eq(self):
+        self.assertTrue(element_path == ElementPath("1", "2", "5"))
+        self.assertFalse(element_path == ElementPath("1", "2", "6"))
+        self.assertTrue(element_path in {ElementPath("1", "2", "5")})
+
+    def test_part_eq(self):
+        part_path = PartPath("1", "2", "5", "JHD")
+        self.assertTrue(part_path == PartPath("1", "2", "5", "JHD"))
+        self.assertFalse(part_path == PartPath("1", "2", "5", "JHH"))
+        self.assertFalse(part_path == element_path)
+        self.assertTrue(part_path in {PartPath("1", "2", "5", "JHD")})
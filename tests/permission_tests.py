@@ -0,0 +1,49 @@
+import threading
+import unittest
+
+from onshape_api.endpoints.permissions import Permission, PermissionCache
+from onshape_api.paths.paths import DocumentPath, InstancePath
+
+
+class FakeApi:
+    def __init__(self):
+        self.paths = []
+        self._lock = threading.Lock()
+
+    def get(self, path: str):
+        with self._lock:
+            self.paths.append(path)
+        return ["READ", "LINK"]
+
+
+class TestPermissionCache(unittest.TestCase):
+    def test_fetches_once(self):
+        api = FakeApi()
+        cache = PermissionCache()
+        path = InstancePath("1" * 24, "2" * 24)
+        self.assertTrue(cache.has_permissions(api, path, Permission.READ))
+        self.assertTrue(cache.has_permissions(api, path, Permission.LINK))
+        self.assertFalse(cache.has_permissions(api, path, Permission.WRITE))
+        self.assertEqual(len(api.paths), 1)
+
+    def test_get_all_permissions(self):
+        api = FakeApi()
+        cache = PermissionCache()
+        paths = [
+            InstancePath("1" * 24, "2" * 24),
+            InstancePath("1" * 24, "3" * 24),
+            DocumentPath("4" * 24),
+        ]
+        result = cache.get_all_permissions(api, paths)
+        self.assertEqual(list(result.keys()), ["1" * 24, "4" * 24])
+        self.assertEqual(len(api.paths), 2)
+        cache.get_permissions(api, paths[2])
+        self.assertEqual(len(api.paths), 2)
+
+    def test_expires(self):
+        api = FakeApi()
+        cache = PermissionCache(ttl=-1)
+        path = DocumentPath("1" * 24)
+        cache.get_permissions(api, path)
+        cache.get_permissions(api, path)
+        self.assertEqual(len(api.paths), 2)
@@ -0,0 +1,57 @@
+import json
+import unittest
+
+import flask
+
+from backend.common import progress
+from onshape_api.exceptions import ApiError
+
+
+class TestProgress(unittest.TestCase):
+    def test_run_with_events(self):
+        def run(report: progress.Reporter) -> dict:
+            report(progress.ProgressEvent("versionCreated", {"documentId": "a"}))
+            return {"updatedReferences": 1}
+
+        events = [event.to_dict() for event in progress.run_with_events(run)]
+        self.assertEqual(
+            events,
+            [
+                {"type": "versionCreated", "documentId": "a"},
+                {"type": "result", "updatedReferences": 1},
+            ],
+        )
+
+    def test_run_with_events_error(self):
+        def run(report: progress.Reporter) -> dict:
+            report(progress.ProgressEvent("started"))
+            raise ApiError("Not found", 404)
+
+        events = list(progress.run_with_events(run))
+        self.assertEqual([event.type for event in events], ["started", "error"])
+        self.assertEqual(events[-1].data["error"]["type"], "API_EXCEPTION")
+
+    def test_stream_progress(self):
+        app = flask.Flask(__name__)
+
+        @app.post("/run")
+        def run_route():
+            def run(report: progress.Reporter) -> dict:
+                report(progress.ProgressEvent("step", {"index": 0}))
+                return {"done": True}
+
+            if progress.is_stream_requested():
+                return progress.stream_progress(run)
+            return run(progress.ignore_progress)
+
+        client = app.test_client()
+        self.assertEqual(client.post("/run").get_json(), {"done": True})
+
+        response = client.post("/run", headers={"Accept": "text/event-stream"})
+        self.assertEqual(response.mimetype, progress.EVENT_STREAM_MIMETYPE)
+        messages = response.get_data(as_text=True).strip().split("\n\n")
+        self.assertEqual(
+            messages[0],
+            "id: 0\nevent: step\ndata: {}".format(json.dumps({"index": 0})),
+        )
+        self.assertEqual(messages[-1], 'id: 1\nevent: result\ndata: {"done": true}')
@@ -0,0 +1,118 @@
+import asyncio
+import itertools
+import unittest
+
+from backend.common.push_scheduler import (
+    AdaptivePushScheduler,
+    PushVerificationError,
+    StudioPush,
+)
+from onshape_api.exceptions import ApiError
+from onshape_api.paths.paths import ElementPath
+
+
+def make_pushes(count: int) -> list[StudioPush]:
+    return [
+        StudioPush(ElementPath("0" * 24, "1" * 24, "{:024}".format(i)), str(i))
+        for i in range(count)
+    ]
+
+
+class FakeOnshape:
+    """Accepts pushes, overlapping any which exceed limit concurrent pushes."""
+
+    def __init__(self, limit: int, fail_with: Exception | None = None) -> None:
+        self.limit = limit
+        self.fail_with = fail_with
+        self.in_flight = 0
+        self.microversions = itertools.count()
+        self.microversion = "start"
+        self.pushed: dict[str, str] = {}
+
+    async def push(self, studio_path: ElementPath, code: str) -> dict:
+        self.in_flight += 1
+        try:
+            await asyncio.sleep(0.001)
+            if self.fail_with is not None:
+                raise self.fail_with
+            if self.in_flight > self.limit:
+                # An overlapped push is lost, leaving the document at the latest microversion
+                return {"contents": code, "sourceMicroversion": self.microversion}
+            self.pushed[studio_path.element_id] = code
+            self.microversion = str(next(self.microversions))
+            return {"contents": code, "sourceMicroversion": self.microversion}
+        finally:
+            self.in_flight -= 1
+
+
+class TestAdaptivePushScheduler(unittest.TestCase):
+    def run_scheduler(self, onshape: FakeOnshape, count: int, max_concurrency: int):
+        pushes = make_pushes(count)
+        pushed = []
+        report = asyncio.run(
+            AdaptivePushScheduler(onshape.push, max_concurrency).run(
+                pushes, on_pushed=pushed.append
+            )
+        )
+        return pushes, pushed, report
+
+    def test_grows_concurrency(self):
+        onshape = FakeOnshape(limit=100)
+        pushes, pushed, report = self.run_scheduler(onshape, 40, max_concurrency=8)
+        self.assertEqual(report.pushed, 40)
+        self.assertEqual(report.max_concurrency, 8)
+        self.assertEqual(report.retries, 0)
+        self.assertFalse(report.serial)
+        self.assertCountEqual(pushed, pushes)
+        self.assertEqual(len(set(report.microversions)), 40)
+
+    def test_backs_off_on_conflicts(self):
+        onshape = FakeOnshape(limit=3)
+        pushes, pushed, report = self.run_scheduler(onshape, 40, max_concurrency=8)
+        self.assertEqual(report.pushed, 40)
+        self.assertGreater(report.retries, 0)
+        self.assertEqual(len(set(report.microversions)), 40)
+        self.assertCountEqual(pushed, pushes)
+        # Every studio ends up with its code
+        self.assertEqual(
+            onshape.pushed,
+            {push.studio_path.element_id: push.code for push in pushes},
+        )
+
+    def test_serial_fallback(self):
+        onshape = FakeOnshape(limit=1)
+        _, _, report = self.run_scheduler(onshape, 20, max_concurrency=8)
+        self.assertEqual(report.pushed, 20)
+        self.assertTrue(report.serial)
+
+    def test_serial(self):
+        onshape = FakeOnshape(limit=1)
+        _, _, report = self.run_scheduler(onshape, 5, max_concurrency=1)
+        self.assertEqual(report.max_concurrency, 1)
+        self.assertEqual(report.retries, 0)
+        self.assertTrue(report.serial)
+
+    def test_serial_failure_raises(self):
+        onshape = FakeOnshape(limit=100, fail_with=ApiError("Forbidden", 403))
+        with self.assertRaises(ApiError):
+            self.run_scheduler(onshape, 5, max_concurrency=8)
+
+    def test_verifies_contents(self):
+        async def push(studio_path: ElementPath, code: str) -> dict:
+            return {"contents": "", "sourceMicroversion": "a"}
+
+        with self.assertRaises(PushVerificationError):
+            asyncio.run(AdaptivePushScheduler(push).run(make_pushes(3)))
+
+    def test_accepts_normalized_contents(self):
+        async def push(studio_path: ElementPath, code: str) -> dict:
+            # Onshape may save code with different line endings and trailing whitespace
+            contents = code.replace("\n", "\r\n") + "\r\n"
+            return {"contents": contents, "sourceMicroversion": studio_path.element_id}
+
+        pushes = [
+            StudioPush(push.studio_path, "a\nb" + push.code) for push in make_pushes(3)
+        ]
+        report = asyncio.run(AdaptivePushScheduler(push).run(pushes))
+        self.assertEqual(report.pushed, 3)
+        self.assertEqual(report.retries, 0)
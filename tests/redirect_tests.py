@@ -0,0 +1,49 @@
+import unittest
+
+from onshape_api.api.redirects import RedirectMap, get_document_id
+
+DOCUMENT_ID = "0123456789abcdef01234567"
+BASE = "https://cad.onshape.com/api/v8"
+
+
+class TestRedirectMap(unittest.TestCase):
+    def test_get_document_id(self):
+        self.assertEqual(
+            get_document_id(BASE + "/featurestudios/d/" + DOCUMENT_ID + "/w/1/e/2"),
+            DOCUMENT_ID,
+        )
+        self.assertEqual(
+            get_document_id(BASE + "/documents/" + DOCUMENT_ID + "?query=1"),
+            DOCUMENT_ID,
+        )
+        self.assertIsNone(get_document_id(BASE + "/users/sessioninfo"))
+
+    def test_record(self):
+        redirects = RedirectMap()
+        url = (
+            BASE + "/documents/d/" + DOCUMENT_ID + "/w/1/elements?withThumbnails=False"
+        )
+        location = "https://regional.onshape.com/api/v8/documents/d/{}/w/1/elements?withThumbnails=False".format(
+            DOCUMENT_ID
+        )
+        self.assertEqual(redirects.record(url, location), location)
+
+        other_url = BASE + "/partstudios/d/" + DOCUMENT_ID + "/w/1/e/2"
+        self.assertEqual(
+            redirects.resolve(other_url),
+            other_url.replace("cad.onshape.com", "regional.onshape.com"),
+        )
+
+    def test_resolve_unknown(self):
+        redirects = RedirectMap()
+        url = BASE + "/documents/d/" + DOCUMENT_ID
+        self.assertEqual(redirects.resolve(url), url)
+
+    def test_relative_location(self):
+        redirects = RedirectMap()
+        url = BASE + "/documents/d/" + DOCUMENT_ID
+        self.assertEqual(
+            redirects.record(url, "/api/v8/documents/" + DOCUMENT_ID),
+            BASE + "/documents/" + DOCUMENT_ID,
+        )
+        self.assertEqual(redirects.resolve(url), url)
@@ -0,0 +1,70 @@
+import http
+import unittest
+
+from onshape_api.api.retry import (
+    RetryMetrics,
+    RetryPolicy,
+    TokenBucket,
+    parse_retry_after,
+)
+
+
+class TestRetryPolicy(unittest.TestCase):
+    def test_idempotent_methods(self):
+        policy = RetryPolicy()
+        self.assertTrue(policy.is_retryable(http.HTTPMethod.GET, 0))
+        self.assertFalse(policy.is_retryable(http.HTTPMethod.POST, 0))
+        self.assertTrue(policy.is_retryable(http.HTTPMethod.POST, 0, idempotent=True))
+        self.assertFalse(policy.is_retryable(http.HTTPMethod.GET, 0, idempotent=False))
+
+    def test_max_retries(self):
+        policy = RetryPolicy(max_retries=2)
+        self.assertTrue(policy.is_retryable(http.HTTPMethod.GET, 1))
+        self.assertFalse(policy.is_retryable(http.HTTPMethod.GET, 2))
+
+    def test_retry_after(self):
+        policy = RetryPolicy(backoff_max=10)
+        self.assertEqual(policy.get_delay(0, "3"), 3)
+        self.assertEqual(policy.get_delay(0, "120"), 10)
+
+    def test_backoff(self):
+        policy = RetryPolicy(backoff_base=1, backoff_max=5)
+        for attempt in range(6):
+            delay = policy.get_delay(attempt, "invalid")
+            self.assertGreaterEqual(delay, 0)
+            self.assertLessEqual(delay, min(5, 2**attempt))
+
+    def test_parse_retry_after(self):
+        self.assertEqual(parse_retry_after("2"), 2)
+        self.assertEqual(parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT"), 0)
+        self.assertIsNone(parse_retry_after("soon"))
+
+
+class TestTokenBucket(unittest.TestCase):
+    def test_unlimited(self):
+        bucket = TokenBucket()
+        self.assertEqual(bucket.reserve(), 0)
+
+    def test_rate(self):
+        bucket = TokenBucket(rate=10, capacity=1)
+        self.assertEqual(bucket.reserve(), 0)
+        self.assertAlmostEqual(bucket.reserve(), 0.1, places=2)
+        self.assertAlmostEqual(bucket.reserve(), 0.2, places=2)
+
+    def test_pause(self):
+        bucket = TokenBucket()
+        bucket.pause(5)
+        self.assertGreater(bucket.reserve(), 4)
+
+
+class TestRetryMetrics(unittest.TestCase):
+    def test_to_dict(self):
+        metrics = RetryMetrics()
+        metrics.record_request(0.5)
+        metrics.record_retry(429, 1)
+        metrics.record_retry(429, 1)
+        metrics.record_retry(503, 1)
+        result = metrics.to_dict()
+        self.assertEqual(result["retries"], 3)
+        self.assertEqual(result["retriesByStatus"], {429: 2, 503: 1})
+        self.assertEqual(result["throttledSeconds"], 3.5)
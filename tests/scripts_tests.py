@@ -0,0 +1,29 @@
+import pathlib
+import tempfile
+import unittest
+
+from backend.common import evaluate
+from backend.common.scripts import ScriptRegistry
+
+
+class TestScriptRegistry(unittest.TestCase):
+    def test_load_required_scripts(self):
+        registry = ScriptRegistry()
+        registry.load(evaluate.REQUIRED_SCRIPTS, evaluate.OPTIONAL_SCRIPTS)
+        script = registry.get(evaluate.AUTO_ASSEMBLY_SCRIPT)
+        self.assertTrue(script.code.startswith("function"))
+        self.assertEqual(len(script.hash), 64)
+
+    def test_missing_script(self):
+        with tempfile.TemporaryDirectory() as directory:
+            registry = ScriptRegistry(pathlib.Path(directory))
+            with self.assertRaises(FileNotFoundError):
+                registry.load(["missing"])
+            # Optional scripts may be missing
+            registry.load([], ["missing"])
+
+    def test_invalid_script(self):
+        with tempfile.TemporaryDirectory() as directory:
+            (pathlib.Path(directory) / "invalid.fs").write_text("println(1);")
+            with self.assertRaises(ValueError):
+                ScriptRegistry(pathlib.Path(directory)).load(["invalid"])
@@ -0,0 +1,61 @@
+import http
+import unittest
+
+from onshape_api.api.cache import ResponseCache
+from onshape_api.api.retry import RetryPolicy
+from onshape_api.api.send_policy import Action, SendPolicy
+
+DOCUMENT_ID = "0123456789abcdef01234567"
+VERSION_ID = "89abcdef0123456789abcdef"
+BASE = "https://cad.onshape.com/api/v8/partstudios/d/" + DOCUMENT_ID
+VERSION_URL = BASE + "/v/" + VERSION_ID + "/e/1/features"
+WORKSPACE_URL = BASE + "/w/" + VERSION_ID + "/e/1/features"
+
+
+class TestSendPolicy(unittest.TestCase):
+    def test_redirect(self):
+        policy = SendPolicy()
+        state = policy.start(http.HTTPMethod.GET, WORKSPACE_URL, {})
+        action = state.on_response(
+            http.HTTPStatus.TEMPORARY_REDIRECT,
+            {"Location": "https://other.onshape.com/api/v8/x"},
+            b"",
+        )
+        self.assertEqual(action, Action.REDIRECT)
+        self.assertEqual(state.url, "https://other.onshape.com/api/v8/x")
+        # Later requests for the document go straight to the new host
+        state = policy.start(http.HTTPMethod.GET, WORKSPACE_URL, {})
+        self.assertTrue(state.url.startswith("https://other.onshape.com/"))
+
+    def test_retry(self):
+        policy = SendPolicy(RetryPolicy(max_retries=1))
+        state = policy.start(http.HTTPMethod.GET, WORKSPACE_URL, {})
+        unavailable = http.HTTPStatus.SERVICE_UNAVAILABLE
+        self.assertEqual(
+            state.on_response(unavailable, {"Retry-After": "2"}, b""), Action.RETRY
+        )
+        self.assertEqual(state.delay, 2)
+        self.assertEqual(state.on_response(unavailable, {}, b""), Action.RETURN)
+        self.assertEqual(policy.metrics.total_retries(), 1)
+
+    def test_post_isnt_retried(self):
+        state = SendPolicy().start(http.HTTPMethod.POST, WORKSPACE_URL, {})
+        action = state.on_response(http.HTTPStatus.SERVICE_UNAVAILABLE, {}, b"")
+        self.assertEqual(action, Action.RETURN)
+        with self.assertRaises(ConnectionError):
+            state.on_connection_error(ConnectionError())
+
+    def test_cache(self):
+        policy = SendPolicy(cache=ResponseCache())
+        state = policy.start(http.HTTPMethod.GET, WORKSPACE_URL, {})
+        state.on_response(http.HTTPStatus.OK, {"ETag": '"a"'}, b"{}")
+
+        state = policy.start(http.HTTPMethod.GET, WORKSPACE_URL, {})
+        self.assertFalse(state.fresh)
+        self.assertEqual(state.headers["If-None-Match"], '"a"')
+        action = state.on_response(http.HTTPStatus.NOT_MODIFIED, {}, b"")
+        self.assertEqual(action, Action.USE_CACHED)
+
+        state = policy.start(http.HTTPMethod.GET, VERSION_URL, {})
+        state.on_response(http.HTTPStatus.OK, {}, b"{}")
+        self.assertTrue(policy.start(http.HTTPMethod.GET, VERSION_URL, {}).fresh)
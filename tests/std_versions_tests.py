@@ -0,0 +1,47 @@
+import pathlib
+import tempfile
+import unittest
+
+from onshape_api.endpoints.std_versions import StdVersionCache
+
+
+class FakeApi:
+    """Serves a version list, honoring offset and limit like Onshape."""
+
+    def __init__(self, names: list[str]):
+        self.versions = [{"id": str(i), "name": name} for i, name in enumerate(names)]
+        self.queries = []
+
+    def get(self, path: str, query: dict):
+        self.queries.append(query)
+        offset = query.get("offset", 0)
+        limit = query.get("limit", len(self.versions))
+        return self.versions[offset : offset + limit]
+
+
+class TestStdVersionCache(unittest.TestCase):
+    def test_fetches_tail(self):
+        api = FakeApi(["Start", "100.0", "101.0"])
+        cache = StdVersionCache(ttl=-1, refresh_in_background=False)
+        self.assertEqual(cache.get_latest_std_version(api), "101")
+
+        api.versions.append({"id": "3", "name": "102.0"})
+        self.assertEqual(cache.get_latest_std_version(api), "102")
+        self.assertEqual(api.queries, [{"offset": 0}, {"offset": 2}])
+        self.assertEqual(cache.get_std_versions(api), ["100", "101", "102"])
+
+    def test_uses_cached_list(self):
+        api = FakeApi(["Start", "100.0"])
+        cache = StdVersionCache(refresh_in_background=False)
+        cache.get_latest_std_version(api)
+        cache.get_latest_std_version(api)
+        self.assertEqual(len(api.queries), 1)
+
+    def test_persists(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = pathlib.Path(directory) / "std_versions.json"
+            api = FakeApi(["Start", "100.0"])
+            StdVersionCache(storage_path=path).get_latest_std_version(api)
+            cache = StdVersionCache(storage_path=path)
+            self.assertEqual(cache.get_latest_std_version(api), "100")
+            self.assertEqual(len(api.queries), 1)